@@ -1,6 +1,90 @@
-from .api import AioQuiqy
-from .const import FiatCurrencies, CryptoCurrencies, PaymentStatus
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from .api import AioQuiqy
+    from .const import FiatCurrencies, CryptoCurrencies, PaymentStatus
+    from .cache import PaymentCache, QuoteCache
+    from .deadline import request_deadline
+    from .dispatch import DispatchConfig
+    from .hedge import HedgePolicy
+    from .journal import CallbackJournal
+    from .ledger import PaymentLedger
+    from .metrics import Metrics
+    from .ratelimit import Priority, RateLimiter, request_priority
+    from .retry import RetryPolicy, CircuitBreakerPolicy
+    from .signature import SignatureConfig
+    from .sync import SyncQuiqy
+    from .tenants import ClientPool
+    from .transport import TransportConfig
+    from .watcher import PaymentWatcher, WatchPolicy
 
 __version__ = "0.2.0"
 
-__all__ = ["AioQuiqy", "FiatCurrencies", "CryptoCurrencies", "PaymentStatus"]
+# Public name -> module, imported on first attribute access,
+# so `import aioquiqy` doesn't load aiohttp, pydantic and the webhook machinery
+_LAZY: Dict[str, str] = {
+    "AioQuiqy": ".api",
+    "FiatCurrencies": ".const",
+    "CryptoCurrencies": ".const",
+    "PaymentStatus": ".const",
+    "TransportConfig": ".transport",
+    "RetryPolicy": ".retry",
+    "CircuitBreakerPolicy": ".retry",
+    "PaymentCache": ".cache",
+    "QuoteCache": ".cache",
+    "DispatchConfig": ".dispatch",
+    "PaymentWatcher": ".watcher",
+    "WatchPolicy": ".watcher",
+    "RateLimiter": ".ratelimit",
+    "Priority": ".ratelimit",
+    "request_priority": ".ratelimit",
+    "Metrics": ".metrics",
+    "SyncQuiqy": ".sync",
+    "ClientPool": ".tenants",
+    "SignatureConfig": ".signature",
+    "CallbackJournal": ".journal",
+    "HedgePolicy": ".hedge",
+    "request_deadline": ".deadline",
+    "PaymentLedger": ".ledger",
+}
+
+__all__ = [
+    "AioQuiqy",
+    "FiatCurrencies",
+    "CryptoCurrencies",
+    "PaymentStatus",
+    "TransportConfig",
+    "RetryPolicy",
+    "CircuitBreakerPolicy",
+    "PaymentCache",
+    "QuoteCache",
+    "DispatchConfig",
+    "PaymentWatcher",
+    "WatchPolicy",
+    "RateLimiter",
+    "Priority",
+    "request_priority",
+    "Metrics",
+    "SyncQuiqy",
+    "ClientPool",
+    "SignatureConfig",
+    "CallbackJournal",
+    "HedgePolicy",
+    "request_deadline",
+    "PaymentLedger",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # next lookups skip __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
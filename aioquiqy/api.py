@@ -1,8 +1,24 @@
-from .base import BaseClient
+from .base import BaseClient, SessionManager
+from .bulk import BulkResult, bounded_map
+from .cache import PaymentCache, QuoteCache, TTLCache
+from .codec import JSONCodec
 from .const import (
+    Endpoints,
     HTTPMethods,
     Networks,
+    PaymentStatus,
 )
+from .dedup import DedupStore, callback_key
+from .dispatch import CallbackQueue, DispatchConfig, run_handlers
+from .hedge import HedgePolicy
+from .ledger import PaymentLedger
+from .metrics import Metrics
+from .ratelimit import Priority, RateLimiter, with_priority
+from .retry import CircuitBreakerPolicy, RetryPolicy
+from .routing import CallbackPredicate, HandlerRouter
+from .signature import SignatureConfig, SignatureVerifier
+from .singleflight import SingleFlight
+from .transport import TransportConfig
 
 from .models.payment import (
     CreatePaymentRequest,
@@ -14,9 +30,25 @@ from .models.payment import (
     CallbackRequest,
 )
 
-from typing import Union, List, Callable, Any, Coroutine
-from aiohttp.web import Response  # type: ignore[import]
-from aiohttp.web_request import Request  # type: ignore[import]
+from typing import (
+    TYPE_CHECKING,
+    Union,
+    Callable,
+    Any,
+    Coroutine,
+    Optional,
+    Iterable,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+)
+
+if TYPE_CHECKING:
+    # aiohttp.web is imported on the first callback, outbound-only users never load it
+    from aiohttp.web import Response  # type: ignore[import]
+    from aiohttp.web_request import Request  # type: ignore[import]
+
+    from .journal import CallbackJournal
 
 
 class AioQuiqy(BaseClient):
@@ -27,25 +59,85 @@ class AioQuiqy(BaseClient):
     """
 
     API_DOCS = "https://external-api.quiqy.io/docs/doc.json"
+    # Payments created by `create_payments`, kept to skip resubmitted orders
+    CREATED_PAYMENTS_SIZE = 100000
+    CREATED_PAYMENTS_TTL = 24 * 3600.0
 
     def __init__(
-        self, api_key: str, network: Union[str, Networks] = Networks.MAIN_NET
+        self,
+        api_key: str,
+        network: Union[str, Networks] = Networks.MAIN_NET,
+        transport: Optional[TransportConfig] = None,
+        retry: Optional[RetryPolicy] = RetryPolicy(),
+        circuit_breaker: Optional[CircuitBreakerPolicy] = CircuitBreakerPolicy(),
+        payment_cache: Optional[PaymentCache] = None,
+        quote_cache: Optional[QuoteCache] = None,
+        json_codec: Optional[JSONCodec] = None,
+        dispatch: Optional[DispatchConfig] = None,
+        dedup_store: Optional[DedupStore] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
+        sessions: Optional[SessionManager] = None,
+        signature: Optional[SignatureConfig] = None,
+        journal: Optional["CallbackJournal"] = None,
+        timeout: Optional[float] = None,
+        hedge: Optional[HedgePolicy] = None,
+        ledger: Optional[PaymentLedger] = None,
     ) -> None:
-        super().__init__()
+        super().__init__(
+            transport=transport,
+            retry=retry,
+            circuit_breaker=circuit_breaker,
+            json_codec=json_codec,
+            rate_limiter=rate_limiter,
+            metrics=metrics,
+            sessions=sessions,
+            timeout=timeout,
+            hedge=hedge,
+        )
         """
         Init Quiqy API client
             :param api_key: Your API key from Quiqy settings
             :param network: Network address (default: main net)
+            :param transport: Connection pool, TLS and timeout settings
+            :param retry: Retry policy for transient failures (None - no retries)
+            :param circuit_breaker: Per-endpoint circuit breaker (None - disabled)
+            :param payment_cache: Cache of `get_payment` responses (None - disabled)
+            :param quote_cache: Cache of `pre_calculate_payment` (None - disabled)
+            :param json_codec: JSON loads/dumps, e.g. `orjson_codec()` (default: stdlib)
+            :param dispatch: How callback handlers are run (default: one by one)
+            :param dedup_store: Skip redelivered callbacks seen before (None - disabled)
+            :param rate_limiter: Token buckets, may be shared by clients (None - off)
+            :param metrics: Request, pool and handler metrics (None - disabled)
+            :param sessions: Sessions shared with other clients (default: own)
+            :param signature: HMAC check of webhook callbacks (None - disabled)
+            :param journal: Append received callbacks to it (None - disabled)
+            :param timeout: Deadline of every API call in seconds, retries included
+            :param hedge: Hedged `get_payment`/`pre_calculate_payment` (None - off)
+            :param ledger: Open payments updated from responses and callbacks
         """
         self.__api_key = api_key
         self.network = network
         self.__headers = {"Api-Key": api_key}
-        self._handlers: List[
-            Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]]
-        ] = []
+        self.payment_cache = payment_cache
+        self.quote_cache = quote_cache
+        self._quote_calls = SingleFlight()
+        self._create_calls = SingleFlight()
+        self.created_payments = TTLCache(self.CREATED_PAYMENTS_SIZE)
+        self._router = HandlerRouter()
+        self.dedup_store = dedup_store
+        self._dispatch = dispatch or DispatchConfig()
+        self._callback_queue = CallbackQueue(
+            self._process_callback,
+            workers=self._dispatch.workers,
+            maxsize=self._dispatch.queue_size,
+        )
+        self._verifier = SignatureVerifier(signature) if signature else None
+        self.journal = journal
+        self.ledger = ledger
 
     async def create_payment(
-        self, payment_data: CreatePaymentRequest
+        self, payment_data: CreatePaymentRequest, timeout: Optional[float] = None
     ) -> CreatePaymentResponse:
         """
         Create payment in detailing state.
@@ -53,6 +145,7 @@ class AioQuiqy(BaseClient):
 
         Args:
             payment_data: Payment creation data
+            timeout: Deadline in seconds, retries included (default: client timeout)
 
         Returns:
             CreatePaymentResponse: Created payment details
@@ -60,64 +153,217 @@ class AioQuiqy(BaseClient):
         method = HTTPMethods.POST
         url = f"{self.network}/payment"
 
-        response = await self._make_request(
+        payment = await self._request_model(
+            CreatePaymentResponse,
             method=method,
             url=url,
+            endpoint=Endpoints.CREATE,
+            timeout=timeout,
             json=payment_data.model_dump(),
             headers=self.__headers,
         )
-        return CreatePaymentResponse(**response)
+        if self.ledger is not None:
+            self.ledger.apply_payment(payment)
+        return payment
+
+    async def create_payments(
+        self,
+        payments: Union[
+            Iterable[CreatePaymentRequest], AsyncIterable[CreatePaymentRequest]
+        ],
+        concurrency: int = 10,
+        priority: Optional[Callable[[CreatePaymentRequest], Priority]] = None,
+        lookahead: int = 100,
+    ) -> AsyncIterator[BulkResult]:
+        """
+        Create many payments with bounded concurrency, deduplicated by order.
+            Requests are consumed lazily and results are yielded as they complete.
+            A `client_order_id` already created by this client (see
+            `CREATED_PAYMENTS_TTL`) or in flight in any pipeline gets the same
+            response, so retried batches never create a second payment.
+            Failed creations aren't remembered and may be retried.
+
+        Args:
+            payments: Iterable or async iterable of payment creation data
+            concurrency: Max number of requests in flight
+            priority: Priority of a request, the most urgent of the `lookahead`
+                requests read ahead starts first (default: all bulk)
+            lookahead: Max requests read ahead to pick by priority
+
+        Yields:
+            BulkResult: request as `key` and either
+                CreatePaymentResponse as `result` or exception as `error`
+        """
+
+        async def create(payment_data: CreatePaymentRequest) -> Any:
+            order_id = payment_data.client_order_id
+            created = self.created_payments.get(order_id)
+            if created is not None:
+                return created
+
+            return await with_priority(
+                priority(payment_data) if priority is not None else Priority.BULK,
+                self._create_calls.do(
+                    order_id, lambda: self._create_payment_once(payment_data)
+                ),
+            )
+
+        async for item in bounded_map(
+            create,
+            payments,
+            concurrency=concurrency,
+            priority=priority,
+            lookahead=lookahead,
+        ):
+            yield item
+
+    async def _create_payment_once(
+        self, payment_data: CreatePaymentRequest
+    ) -> CreatePaymentResponse:
+        response = await self.create_payment(payment_data)
+        self.created_payments.set(
+            payment_data.client_order_id, response, self.CREATED_PAYMENTS_TTL
+        )
+        return response
 
-    async def get_payment(self, payment_id: str) -> GetPaymentResponse:
+    async def get_payment(
+        self,
+        payment_id: str,
+        use_cache: bool = True,
+        timeout: Optional[float] = None,
+    ) -> GetPaymentResponse:
         """
         Get full information about a certain payment.
         https://external-api.quiqy.io/docs/doc.json#operation/getPayment
+            Hedged if the client has a hedge policy.
 
         Args:
             payment_id: Payment ID in Quiqy service
+            use_cache: Serve from payment cache if configured
+            timeout: Deadline in seconds, retries included (default: client timeout)
 
         Returns:
             GetPaymentResponse: Payment details with available crypto currencies
         """
+        version = 0
+        if self.payment_cache is not None:
+            version = self.payment_cache.version
+            if use_cache:
+                cached = self.payment_cache.get(payment_id)
+                if cached is not None:
+                    return cached
+
         method = HTTPMethods.GET
         url = f"{self.network}/payment/{payment_id}"
 
-        response = await self._make_request(
+        payment = await self._request_model(
+            GetPaymentResponse,
             method=method,
             url=url,
+            endpoint=Endpoints.GET,
+            timeout=timeout,
+            hedged=True,
             headers=self.__headers,
         )
-        return GetPaymentResponse(**response)
+        if self.payment_cache is not None:
+            self.payment_cache.put(payment, version)
+        if self.ledger is not None:
+            self.ledger.apply_payment(payment.payment)
+        return payment
+
+    async def get_payments(
+        self,
+        payment_ids: Union[Iterable[str], AsyncIterable[str]],
+        concurrency: int = 10,
+        ordered: bool = False,
+    ) -> AsyncIterator[BulkResult]:
+        """
+        Get many payments with bounded concurrency.
+            IDs are consumed lazily and results are yielded as they complete,
+            so any number of payments can be swept with flat memory.
+            Requests have bulk priority in the rate limiter.
+
+        Args:
+            payment_ids: Iterable or async iterable of payment IDs
+            concurrency: Max number of requests in flight
+            ordered: Yield results in the order of `payment_ids`
+
+        Yields:
+            BulkResult: payment ID as `key` and either
+                GetPaymentResponse as `result` or exception as `error`
+        """
+
+        def get_payment(payment_id: str) -> Awaitable[GetPaymentResponse]:
+            return with_priority(Priority.BULK, self.get_payment(payment_id))
+
+        async for item in bounded_map(
+            get_payment, payment_ids, concurrency=concurrency, ordered=ordered
+        ):
+            yield item
 
     async def pre_calculate_payment(
-        self, payment_id: str, crypto_currency_id: int
+        self,
+        payment_id: str,
+        crypto_currency_id: int,
+        timeout: Optional[float] = None,
     ) -> PreCalculatePaymentResponse:
         """
         Calculate payer amount by rate between selected crypto currency and fiat currency.
         https://external-api.quiqy.io/docs/doc.json#operation/preCalculatePayment
+            Concurrent calls for the same pair share one request and one result,
+            bound by the deadline of the first call.
+            Hedged if the client has a hedge policy.
 
         Args:
             payment_id: Payment ID in Quiqy service
             crypto_currency_id: ID of the selected crypto currency
+            timeout: Deadline in seconds, retries included (default: client timeout)
 
         Returns:
             PreCalculatePaymentResponse: Calculated payment details
         """
+        if self.quote_cache is not None:
+            cached = self.quote_cache.get(payment_id, crypto_currency_id)
+            if cached is not None:
+                return cached
+
+        return await self._quote_calls.do(  # type: ignore[no-any-return]
+            (payment_id, crypto_currency_id),
+            lambda: self._pre_calculate_payment(
+                payment_id, crypto_currency_id, timeout
+            ),
+        )
+
+    async def _pre_calculate_payment(
+        self,
+        payment_id: str,
+        crypto_currency_id: int,
+        timeout: Optional[float] = None,
+    ) -> PreCalculatePaymentResponse:
         method = HTTPMethods.GET
         url = f"{self.network}/payment/{payment_id}/calculation"
 
         params = {"to_crypto_currency_id": crypto_currency_id}
 
-        response = await self._make_request(
+        quote = await self._request_model(
+            PreCalculatePaymentResponse,
             method=method,
             url=url,
+            endpoint=Endpoints.CALCULATION,
+            timeout=timeout,
+            hedged=True,
             params=params,
             headers=self.__headers,
         )
-        return PreCalculatePaymentResponse(**response)
+        if self.quote_cache is not None:
+            self.quote_cache.put(payment_id, crypto_currency_id, quote)
+        return quote
 
     async def detail_payment(
-        self, payment_id: str, detail_data: DetailPaymentRequest
+        self,
+        payment_id: str,
+        detail_data: DetailPaymentRequest,
+        timeout: Optional[float] = None,
     ) -> DetailPaymentResponse:
         """
         Change payment status to pending by selecting crypto currency.
@@ -126,6 +372,7 @@ class AioQuiqy(BaseClient):
         Args:
             payment_id: Payment ID in Quiqy service
             detail_data: Crypto currency selection data
+            timeout: Deadline in seconds, retries included (default: client timeout)
 
         Returns:
             DetailPaymentResponse: Updated payment details
@@ -133,31 +380,40 @@ class AioQuiqy(BaseClient):
         method = HTTPMethods.POST
         url = f"{self.network}/payment/{payment_id}/detail"
 
-        response = await self._make_request(
+        detailed = await self._request_model(
+            DetailPaymentResponse,
             method=method,
             url=url,
+            endpoint=Endpoints.DETAIL,
+            timeout=timeout,
             json=detail_data.model_dump(),
             headers=self.__headers,
         )
-        return DetailPaymentResponse(**response)
+        if self.ledger is not None:
+            self.ledger.apply_payment(detailed.payment)
+        return detailed
 
-    def check_callback_signature(self, body_text: str, signature: str) -> bool:
+    def check_callback_signature(
+        self, body: Union[bytes, str], signature: Optional[str]
+    ) -> bool:
         """
-        Verify callback signature (if implemented by Quiqy).
-        Note: This method is a placeholder as Quiqy API documentation doesn't specify signature verification.
+        Verify HMAC signature of a raw callback body.
 
         Args:
-            body_text: Callback request body
-            signature: Signature header (if any)
+            body: Callback request body exactly as received
+            signature: Value of the signature header (if any)
 
         Returns:
-            bool: Whether signature is valid
+            bool: Whether signature is valid, always True if `signature`
+                config wasn't passed to the client
         """
-        # Placeholder implementation - Quiqy API doesn't specify signature verification
-        # You may need to implement this based on actual Quiqy requirements
-        return True
+        if self._verifier is None:
+            return True
+        if isinstance(body, str):
+            body = body.encode()
+        return self._verifier.verify(body, signature)
 
-    async def handle_callback(self, request: Request) -> Response:
+    async def handle_callback(self, request: "Request") -> "Response":
         """
         Webhook callback handler for payment status updates.
 
@@ -165,46 +421,184 @@ class AioQuiqy(BaseClient):
             request: Webhook request
 
         Returns:
-            Response: 200 status code for Quiqy API
+            Response: 200 status code for Quiqy API,
+                503 if fast-ack queue is full (Quiqy redelivers the callback),
+                413 or 401 if the body is too large or its signature is invalid
         """
-        body = await request.json()
-        # body_text = await request.text()
+        from aiohttp.web import Response
+
+        verifier = self._verifier
+        if verifier is None:
+            raw_body = await request.read()
+        else:
+            # Junk is rejected before reading a large body and before parsing
+            length = request.content_length
+            if length is not None and length > verifier.max_body_size:
+                self._count_invalid_callback("too_large")
+                return Response(text="Payload Too Large", status=413)
+
+            raw_body = await request.read()
+            if len(raw_body) > verifier.max_body_size:
+                self._count_invalid_callback("too_large")
+                return Response(text="Payload Too Large", status=413)
+            if not verifier.verify(raw_body, request.headers.get(verifier.header)):
+                self._count_invalid_callback("signature")
+                return Response(text="Invalid signature", status=401)
 
         # Parse callback data
-        callback_data = CallbackRequest(**body)
+        callback_data = CallbackRequest.model_validate_json(raw_body)
 
-        # Process callback with registered handlers
-        for handler in self._handlers:
-            await handler(callback_data, request.app)
+        if self.journal is not None:
+            self.journal.append(raw_body, callback_data)
+            if self.journal.durable_ack:
+                await self.journal.commit()
+
+        if not await self.dispatch_callback(callback_data, request.app):
+            return Response(text="Busy", status=503)
 
         return Response(text="OK", status=200)
 
+    async def dispatch_callback(
+        self, callback: CallbackRequest, app: Any = None
+    ) -> bool:
+        """
+        Pass a callback through deduplication, cache, ledger and registered handlers.
+            Used by `handle_callback` and by status watchers.
+
+        Args:
+            callback: Payment status update
+            app: Application passed to handlers
+
+        Returns:
+            bool: False if fast-ack queue is full and the callback was rejected
+        """
+        # Redelivered callback, handlers already ran for it
+        if self.dedup_store is not None and await self.dedup_store.seen(
+            callback_key(callback)
+        ):
+            self._count_callback(callback, "duplicate")
+            return True
+
+        if self.payment_cache is not None:
+            self.payment_cache.apply_callback(callback)
+        if self.ledger is not None:
+            self.ledger.apply_callback(callback)
+
+        if self._dispatch.fast_ack:
+            if self._callback_queue.submit(callback, app):
+                self._count_callback(callback, "queued")
+                return True
+            if self.dedup_store is not None:
+                await self.dedup_store.forget(callback_key(callback))
+            self._count_callback(callback, "rejected")
+            return False
+
+        # Process callback with registered handlers
+        self._count_callback(callback, "processed")
+        await self._process_callback(callback, app)
+        return True
+
+    def _count_callback(self, callback: CallbackRequest, result: str) -> None:
+        if self.metrics is not None:
+            self.metrics.inc(
+                "aioquiqy_callbacks_total",
+                payment_status=callback.payment_status,
+                result=result,
+            )
+
+    def _count_invalid_callback(self, reason: str) -> None:
+        if self.metrics is not None:
+            self.metrics.inc("aioquiqy_callbacks_invalid_total", reason=reason)
+
+    async def _process_callback(self, callback: CallbackRequest, app: Any) -> None:
+        """Run registered handlers for the callback"""
+        try:
+            await self.run_callback_handlers(callback, app)
+        except BaseException:
+            # Let the redelivery run handlers again
+            if self.dedup_store is not None:
+                await self.dedup_store.forget(callback_key(callback))
+            raise
+
+    async def run_callback_handlers(
+        self, callback: CallbackRequest, app: Any = None
+    ) -> None:
+        """
+        Run handlers registered for the callback and nothing else.
+            Deduplication, payment cache, ledger and fast-ack queue are skipped,
+            e.g. to replay journaled callbacks.
+        """
+        await run_handlers(
+            self._router.match(callback),
+            callback,
+            app,
+            concurrent=self._dispatch.concurrent,
+            metrics=self.metrics,
+        )
+
+    async def drain_callbacks(self) -> None:
+        """Finish callbacks accepted in fast-ack mode (up to `drain_timeout`)."""
+        await self._callback_queue.drain(self._dispatch.drain_timeout)
+
     def register_callback_handler(
-        self, func: Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]]
+        self,
+        func: Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]],
+        statuses: Optional[Iterable[Union[str, PaymentStatus]]] = None,
+        crypto_currencies: Optional[Iterable[Optional[int]]] = None,
+        predicate: Optional[CallbackPredicate] = None,
     ) -> None:
         """
         Register handler for payment status callbacks.
 
         Args:
             func: Handler function that receives CallbackRequest and app
+            statuses: Payment statuses to handle (default: any)
+            crypto_currencies: Crypto currency IDs to handle (default: any)
+            predicate: Extra filter called with CallbackRequest
         """
-        self._handlers.append(func)
+        self._router.add(func, statuses, crypto_currencies, predicate)
 
     def callback_handler(
         self,
-        func: Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]],
-    ) -> Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]]:
+        func: Optional[
+            Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]]
+        ] = None,
+        *,
+        statuses: Optional[Iterable[Union[str, PaymentStatus]]] = None,
+        crypto_currencies: Optional[Iterable[Optional[int]]] = None,
+        predicate: Optional[CallbackPredicate] = None,
+    ) -> Any:
         """
         Decorator for registering callback handlers.
+            Use as `@client.callback_handler`
+            or `@client.callback_handler(statuses=[PaymentStatus.CONFIRMED])`.
 
         Args:
             func: Handler function
+            statuses: Payment statuses to handle (default: any)
+            crypto_currencies: Crypto currency IDs to handle (default: any)
+            predicate: Extra filter called with CallbackRequest
 
         Returns:
-            Decorated function
+            Decorated function (or decorator if called with filters only)
         """
-        self._handlers.append(func)
-        return func
+
+        def decorator(
+            handler: Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]]
+        ) -> Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]]:
+            self.register_callback_handler(
+                handler, statuses, crypto_currencies, predicate
+            )
+            return handler
+
+        if func is None:
+            return decorator
+        return decorator(func)
+
+    async def close(self) -> None:
+        """Drain accepted callbacks and close the session graceful."""
+        await self.drain_callbacks()
+        await super().close()
 
     async def __aenter__(self) -> "AioQuiqy":
         return self
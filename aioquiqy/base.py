@@ -1,71 +1,484 @@
 import asyncio
-import ssl
-from typing import Optional, Any, Dict
+import threading
+import time
+from typing import (
+    Optional,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
-import certifi
-from aiohttp import ClientSession, TCPConnector
+from aiohttp import ClientConnectionError, ClientSession
 from aiohttp.typedefs import StrOrURL
+from pydantic import BaseModel
 
-from .exceptions import QuiqyAPIError
+from .codec import STDLIB_CODEC, JSONCodec
+from .const import HTTPMethods
+from .deadline import resolve_deadline
+from .exceptions import DeadlineExceededError, QuiqyAPIError
+from .hedge import HedgePolicy, HedgeTracker
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+from .retry import (
+    CircuitBreaker,
+    CircuitBreakerPolicy,
+    RetryPolicy,
+    parse_retry_after,
+)
+from .transport import TransportConfig
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class SessionManager:
+    """
+    aiohttp sessions built from one transport config, one per event loop.
+        Sessions are created on the first request in every loop
+        and reused by later requests in the same loop.
+        Sessions of closed loops (e.g. of a finished `asyncio.run`)
+        are released when the next session is created or on `close`.
+        Clients sharing a manager share its sessions and connection pools.
+    """
+
+    def __init__(
+        self,
+        transport: Optional[TransportConfig] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> None:
+        """
+        :param transport: connection pool and timeout settings
+        :param metrics: tracing and pool metrics (None - off)
+        """
+        self.transport = transport or TransportConfig()
+        self.metrics = metrics
+        # event loop -> its session. A session references its loop,
+        # so entries of closed loops are released explicitly, not by weak keys
+        self._sessions: Dict[asyncio.AbstractEventLoop, ClientSession] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get_session(self, **kwargs: Any) -> ClientSession:
+        """
+        Get cached session of the running event loop. One session per loop.
+            A connector shared through TransportConfig is bound to its loop,
+            use it from that loop only.
+        """
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is not None and not session.closed:
+            return session
+
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is not None and not session.closed:
+                return session
+
+            self._release_closed()
+            if self.metrics is not None:
+                kwargs.setdefault("trace_configs", [self.metrics.trace_config()])
+
+            session = ClientSession(
+                connector=self.transport.get_connector(),
+                connector_owner=self.transport.connector_owner,
+                timeout=self.transport.build_timeout(),
+                **kwargs,
+            )
+            self._sessions[loop] = session
+
+        if self.metrics is not None and session.connector is not None:
+            self.metrics.watch_connector(session.connector)
+        return session
+
+    async def close(self) -> None:
+        """
+        Close sessions graceful.
+            Sessions of other running loops are closed in their loops,
+            sessions of stopped loops are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._release_closed()
+            sessions = list(self._sessions.items())
+            self._sessions.clear()
+
+        closing: List["asyncio.Future[None]"] = []
+        for session_loop, session in sessions:
+            if session.closed:
+                continue
+            if session_loop is loop:
+                closing.append(asyncio.ensure_future(session.close()))
+            elif session_loop.is_running():
+                closing.append(
+                    asyncio.wrap_future(
+                        asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+                    )
+                )
+        await asyncio.gather(*closing)
+
+    def _release_closed(self) -> None:
+        """
+        Drop sessions of closed loops, they can't be closed gracefully anymore.
+            The session is detached and its own connector dropped synchronously,
+            so nothing keeps the loop, the pool and its sockets alive.
+        """
+        for loop in [loop for loop in self._sessions if loop.is_closed()]:
+            session = self._sessions.pop(loop)
+            connector = session.connector
+            session.detach()
+            if connector is not None and self.transport.connector_owner:
+                connector._close()
 
 
 class BaseClient:
     """Base aiohttp client"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        transport: Optional[TransportConfig] = None,
+        retry: Optional[RetryPolicy] = RetryPolicy(),
+        circuit_breaker: Optional[CircuitBreakerPolicy] = CircuitBreakerPolicy(),
+        json_codec: Optional[JSONCodec] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
+        sessions: Optional[SessionManager] = None,
+        timeout: Optional[float] = None,
+        hedge: Optional[HedgePolicy] = None,
+    ) -> None:
         """
         Set defaults on object init.
-            By default `self._session` is None.
-            It will be created on a first API request.
-            The second request will use the same `self._session`.
+            Sessions are created on the first API request in every event loop
+            and reused by later requests in the same loop,
+            so the client may be created outside of a loop and used from several.
+            :param transport: connection pool and timeout settings
+            :param retry: retry policy (None - single attempt)
+            :param circuit_breaker: per-endpoint breaker policy (None - disabled)
+            :param json_codec: JSON loads/dumps (default: stdlib json)
+            :param rate_limiter: per-endpoint token buckets (None - unlimited)
+            :param metrics: request latency, pool and tracing metrics (None - off)
+            :param sessions: sessions shared with other clients, `transport` is
+                ignored then and the client doesn't close them (default: own)
+            :param timeout: deadline of every call in seconds, retries included
+                (None - only transport timeouts)
+            :param hedge: hedged requests of idempotent reads (None - disabled)
         """
-        self._loop = asyncio.get_event_loop()
-        self._session: Optional[ClientSession] = None
+        self._owns_sessions = sessions is None
+        if sessions is None:
+            sessions = SessionManager(transport, metrics)
+        self._sessions = sessions
+        self._transport = self._sessions.transport
+        self._retry = retry or RetryPolicy(max_attempts=1)
+        self._breaker_policy = circuit_breaker
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._json = json_codec or STDLIB_CODEC
+        self._rate_limiter = rate_limiter
+        self.metrics = metrics
+        self.timeout = timeout
+        self._hedge = HedgeTracker(hedge) if hedge is not None else None
 
     def get_session(self, **kwargs: Any) -> ClientSession:
-        """Get cached session. One session per instance."""
-        if isinstance(self._session, ClientSession) and not self._session.closed:
-            return self._session
+        """Get cached session of the running event loop. One session per loop."""
+        return self._sessions.get_session(**kwargs)
 
-        ssl_context = ssl.create_default_context(cafile=certifi.where())
-        connector = TCPConnector(ssl=ssl_context)
+    def get_breaker(self, endpoint: str) -> Optional[CircuitBreaker]:
+        """Get circuit breaker of the endpoint (None if disabled)."""
+        if self._breaker_policy is None:
+            return None
 
-        self._session = ClientSession(connector=connector, **kwargs)
-        return self._session
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(endpoint, self._breaker_policy)
+            self._breakers[endpoint] = breaker
+        return breaker
 
     async def _make_request(
-        self, method: str, url: StrOrURL, **kwargs: Any
+        self,
+        method: str,
+        url: StrOrURL,
+        endpoint: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
     ) -> Dict[str, Any]:
         """
-        Make a request.
+        Make a request and decode JSON result.
             :param method: HTTP Method
             :param url: endpoint link
+            :param endpoint: endpoint name for circuit breaker (default: method)
+            :param idempotent: safe to retry (default: GET requests only)
             :param kwargs: data, params, json and other...
             :return: status and result or exception
         """
+        body = await self._request_raw(method, url, endpoint, idempotent, **kwargs)
+        return self._json.loads(body)  # type: ignore[no-any-return]
+
+    async def _request_model(
+        self,
+        model: Type[ModelT],
+        method: str,
+        url: StrOrURL,
+        endpoint: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> ModelT:
+        """
+        Make a request and validate result into `model` straight from bytes.
+            Skips the intermediate dict and keyword unpacking,
+            pydantic parses and validates the raw body in one pass.
+        """
+        body = await self._request_raw(method, url, endpoint, idempotent, **kwargs)
+        return model.model_validate_json(body)
+
+    async def _request_raw(
+        self,
+        method: str,
+        url: StrOrURL,
+        endpoint: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        hedged: bool = False,
+        **kwargs: Any,
+    ) -> bytes:
+        """
+        Make a request, retry transient failures according to the policy.
+            :param timeout: deadline of the call in seconds, retries included
+                (default: client timeout), a shorter context deadline wins
+            :param hedged: hedge the call if the client has a hedge policy,
+                idempotent requests only
+            :return: raw body of a successful response
+        """
+        if idempotent is None:
+            idempotent = method == HTTPMethods.GET
+        endpoint = endpoint or method
+
+        if "json" in kwargs:
+            kwargs["data"] = self._json.dumps(kwargs.pop("json"))
+            kwargs["headers"] = {
+                **(kwargs.get("headers") or {}),
+                "Content-Type": "application/json",
+            }
+
+        started = time.monotonic()
+        deadline = resolve_deadline(self.timeout if timeout is None else timeout)
+
+        def attempts() -> Awaitable[bytes]:
+            return self._request_attempts(
+                method, url, endpoint, idempotent, deadline, **kwargs
+            )
+
+        if hedged and idempotent and self._hedge is not None:
+            call = self._hedged(endpoint, attempts)
+        else:
+            call = attempts()
+        if deadline is None:
+            return await call
+
+        try:
+            return await asyncio.wait_for(call, deadline - started)
+        except asyncio.TimeoutError:
+            if time.monotonic() < deadline:
+                raise  # the last attempt timed out on its own
+            raise DeadlineExceededError(endpoint, deadline - started) from None
+
+    async def _request_attempts(
+        self,
+        method: str,
+        url: StrOrURL,
+        endpoint: str,
+        idempotent: bool,
+        deadline: Optional[float],
+        **kwargs: Any,
+    ) -> bytes:
+        """
+        Make attempts until success or a final failure.
+            Retries that can't start before the deadline aren't made,
+            the last failure is raised instead.
+        """
+        breaker = self.get_breaker(endpoint)
+        attempt = 0
+        while True:
+            attempt += 1
+            if breaker is not None:
+                breaker.before_call()
+            if self._rate_limiter is not None:
+                try:
+                    await self._rate_limiter.acquire(endpoint)
+                except BaseException:
+                    if breaker is not None:
+                        breaker.release()
+                    raise
+
+            try:
+                status, retry_after, body = await self._send(
+                    method, url, endpoint, **kwargs
+                )
+            except (ClientConnectionError, asyncio.TimeoutError):
+                if breaker is not None:
+                    breaker.record_failure()
+                if not self._retry.can_retry(attempt, idempotent):
+                    raise
+                delay = self._get_retry_delay(attempt, deadline)
+                if delay is None:
+                    raise
+                self._count_retry(endpoint)
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                if breaker is not None:
+                    breaker.release()
+                raise
+
+            if breaker is not None:
+                if status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+
+            if self._rate_limiter is not None:
+                if status == 429:
+                    self._rate_limiter.on_throttled(
+                        endpoint, parse_retry_after(retry_after or "")
+                    )
+                elif status < 400:
+                    self._rate_limiter.on_success(endpoint)
+
+            if status < 400:
+                return body
+
+            if status in self._retry.retry_statuses and self._retry.can_retry(
+                attempt, idempotent
+            ):
+                delay = self._get_retry_delay(attempt, deadline, retry_after)
+                if delay is not None:
+                    self._count_retry(endpoint)
+                    await asyncio.sleep(delay)
+                    continue
+
+            self._handle_error(status, self._decode_error(body))
+
+    def _get_retry_delay(
+        self,
+        attempt: int,
+        deadline: Optional[float],
+        retry_after: Optional[str] = None,
+    ) -> Optional[float]:
+        """Delay before the next attempt, None if it would start past the deadline"""
+        delay = self._retry.get_delay(attempt, retry_after)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    async def _hedged(
+        self, endpoint: str, call: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """
+        Make the call, make it again if the first one is slower than the hedge delay.
+            The first success wins and the other call is cancelled.
+            If both fail, the error of the first call is raised.
+        """
+        tracker = self._hedge
+        assert tracker is not None
+        started = time.monotonic()
+        first = asyncio.ensure_future(call())
+        pending: Set["asyncio.Future[bytes]"] = {first}
+        try:
+            done, pending = await asyncio.wait(
+                pending, timeout=tracker.get_delay(endpoint)
+            )
+            if pending:
+                self._count_hedge(endpoint)
+                pending.add(asyncio.ensure_future(call()))
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+
+            error: Optional[BaseException] = None
+            while True:
+                for task in done:
+                    exc = task.exception()
+                    if exc is None:
+                        tracker.observe(endpoint, time.monotonic() - started)
+                        return task.result()
+                    if error is None or task is first:
+                        error = exc
+                if not pending:
+                    assert error is not None
+                    raise error
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _send(
+        self, method: str, url: StrOrURL, endpoint: str, **kwargs: Any
+    ) -> Tuple[int, Optional[str], bytes]:
+        """
+        Make a single attempt, the body is read once as bytes.
+            :return: status, `Retry-After` header and raw body
+        """
         session = self.get_session()
+        metrics = self.metrics
+        if metrics is None:
+            async with session.request(method, url, **kwargs) as response:
+                body = await response.read()
+            return response.status, response.headers.get("Retry-After"), body
+
+        # Failed attempts are labeled with the exception name instead of status
+        status = "error"
+        started = time.perf_counter()
+        metrics.add_gauge("aioquiqy_requests_in_flight", 1, endpoint=endpoint)
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                body = await response.read()
+            status = str(response.status)
+        except BaseException as exc:
+            status = type(exc).__name__
+            raise
+        finally:
+            metrics.add_gauge("aioquiqy_requests_in_flight", -1, endpoint=endpoint)
+            metrics.observe(
+                "aioquiqy_request_duration_seconds",
+                time.perf_counter() - started,
+                endpoint=endpoint,
+                status=status,
+            )
+        return response.status, response.headers.get("Retry-After"), body
+
+    def _count_retry(self, endpoint: str) -> None:
+        if self.metrics is not None:
+            self.metrics.inc("aioquiqy_request_retries_total", endpoint=endpoint)
 
-        async with session.request(method, url, **kwargs) as response:
-            if response.status >= 400:
-                error_data: Dict[str, Any] = await response.json()
-                self._handle_error(response.status, error_data)
+    def _count_hedge(self, endpoint: str) -> None:
+        if self.metrics is not None:
+            self.metrics.inc("aioquiqy_request_hedges_total", endpoint=endpoint)
 
-            response_data = await response.json(content_type="application/json")
-        return response_data  # type: ignore
+    def _decode_error(self, body: bytes) -> Dict[str, Any]:
+        """Decode error body, non-JSON bodies become the error message"""
+        try:
+            error_data = self._json.loads(body) if body else {}
+        except ValueError:
+            error_data = None
+
+        if isinstance(error_data, dict):
+            return error_data
+        return {"msg": body.decode(errors="replace").strip() or "Unknown error"}
 
     @staticmethod
     def _handle_error(status_code: int, error_data: Dict[str, Any]) -> None:
         """Handle API errors"""
         hint = error_data.get("hint")
         msg = error_data.get("msg", "Unknown error")
-        raise QuiqyAPIError(status_code, msg, hint or "")
+        raise QuiqyAPIError.exception_to_raise(status_code, msg, hint or "")
 
     async def close(self) -> None:
-        """Close the session graceful."""
-        if not isinstance(self._session, ClientSession):
-            return
-
-        if self._session.closed:
-            return
-
-        await self._session.close()
+        """Close own sessions graceful, shared ones are closed by their owner."""
+        if self._owns_sessions:
+            await self._sessions.close()
@@ -0,0 +1,124 @@
+import asyncio
+import heapq
+import itertools
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+
+class BulkResult(NamedTuple):
+    """Result of one item of a bulk operation"""
+
+    key: Any
+    result: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def aiter_items(
+    items: Union[Iterable[Any], AsyncIterable[Any]]
+) -> AsyncIterator[Any]:
+    """Iterate over a sync or async iterable in the same way."""
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def _run(func: Callable[[Any], Awaitable[Any]], key: Any) -> BulkResult:
+    try:
+        return BulkResult(key, await func(key))
+    except Exception as e:
+        return BulkResult(key, error=e)
+
+
+async def bounded_map(
+    func: Callable[[Any], Awaitable[Any]],
+    items: Union[Iterable[Any], AsyncIterable[Any]],
+    concurrency: int = 10,
+    ordered: bool = False,
+    priority: Optional[Callable[[Any], Any]] = None,
+    lookahead: int = 100,
+) -> AsyncIterator[BulkResult]:
+    """
+    Apply coroutine function to items with at most `concurrency` calls in flight.
+        Items are pulled lazily and results are yielded as soon as possible,
+        so memory stays flat for any number of items.
+        Errors don't stop the run, they are returned in `BulkResult.error`.
+        :param func: coroutine function called with every item
+        :param items: iterable or async iterable of items
+        :param concurrency: max number of calls in flight
+        :param ordered: yield results in the order of items
+        :param priority: sort key of items, the lowest among the read ones
+            starts first (None - in the order of items)
+        :param lookahead: max items read ahead and waiting to start (priority only)
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if ordered and priority is not None:
+        raise ValueError("ordered results can't be combined with priority")
+
+    source = aiter_items(items).__aiter__()
+    exhausted = False
+    limit = concurrency + (lookahead if priority is not None else 0)
+    pending: Set["asyncio.Task[BulkResult]"] = set()
+    queue: Deque["asyncio.Task[BulkResult]"] = deque()
+    # read items waiting to start: (priority, sequence number, item)
+    waiting: List[Tuple[Any, int, Any]] = []
+    sequence = itertools.count()
+
+    async def fill() -> None:
+        nonlocal exhausted
+        while not exhausted and len(pending) + len(waiting) < limit:
+            try:
+                item = await source.__anext__()
+            except StopAsyncIteration:
+                exhausted = True
+                break
+            key = priority(item) if priority is not None else 0
+            heapq.heappush(waiting, (key, next(sequence), item))
+
+        while waiting and len(pending) < concurrency:
+            item = heapq.heappop(waiting)[2]
+            task = asyncio.ensure_future(_run(func, item))
+            pending.add(task)
+            if ordered:
+                queue.append(task)
+
+    try:
+        await fill()
+        while pending:
+            if ordered:
+                head = queue.popleft()
+                await asyncio.wait({head})
+                done = {head}
+            else:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+            pending.difference_update(done)
+
+            for task in done:
+                yield task.result()
+            await fill()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,247 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+from .const import PaymentStatus
+from .models.payment import (
+    CallbackRequest,
+    GetPaymentResponse,
+    PreCalculatePaymentResponse,
+)
+
+
+@dataclass
+class CacheStats:
+    """Cache counters"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class TTLCache:
+    """
+    LRU cache with per-entry TTL.
+        The least recently used entry is evicted when `maxsize` is reached,
+        expired entries are dropped lazily on access.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        on_remove: Optional[Callable[[Hashable, Any], None]] = None,
+    ) -> None:
+        """
+        :param maxsize: max number of entries
+        :param on_remove: called with key and value of every removed entry
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self._on_remove = on_remove
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get value and mark it as recently used (None if missing or expired)."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            self._remove(key)
+            return None
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """Store value for `ttl` seconds, evict LRU entries if full."""
+        if ttl <= 0:
+            self.pop(key)
+            return
+
+        if key in self._data:
+            self._data.move_to_end(key)
+        self._data[key] = (time.monotonic() + ttl, value)
+
+        while len(self._data) > self.maxsize:
+            oldest = next(iter(self._data))
+            self.stats.evictions += 1
+            self._remove(oldest)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove entry, return its value (None if missing)."""
+        if key not in self._data:
+            return None
+        self.stats.invalidations += 1
+        return self._remove(key)
+
+    def clear(self) -> None:
+        for key in list(self._data):
+            self._remove(key)
+
+    def _remove(self, key: Hashable) -> Any:
+        _, value = self._data.pop(key)
+        if self._on_remove is not None:
+            self._on_remove(key, value)
+        return value
+
+
+class PaymentCache:
+    """
+    Cache of `get_payment` responses keyed by payment ID.
+        TTL depends on payment status: terminal statuses never change,
+        so they are kept long, in-progress ones only for a few seconds.
+        Callbacks invalidate the entry of the payment they refer to.
+        A response requested before such a callback isn't stored:
+        pass `version` read before the request to `put`.
+    """
+
+    DEFAULT_TTLS: Mapping[str, float] = {
+        PaymentStatus.DETAILING: 5.0,
+        PaymentStatus.PENDING: 5.0,
+        PaymentStatus.DETECTED: 10.0,
+        PaymentStatus.CONFIRMED: 3600.0,
+        PaymentStatus.UNDETAILED: 3600.0,
+        PaymentStatus.UNDETECTED: 3600.0,
+        PaymentStatus.UNCONFIRMED: 3600.0,
+    }
+
+    def __init__(
+        self, maxsize: int = 10000, ttls: Optional[Mapping[str, float]] = None
+    ) -> None:
+        """
+        :param maxsize: max number of cached payments
+        :param ttls: TTL in seconds per payment status, merged with DEFAULT_TTLS
+        """
+        self.ttls: Dict[str, float] = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self._cache = TTLCache(maxsize, on_remove=self._forget_order)
+        # Callbacks carry client_order_id only, map it back to payment ID
+        self._order_index: Dict[str, str] = {}
+        # Bumped by every callback. Order -> version of its last callback,
+        # oldest first, versions below `_floor` are forgotten
+        self.version = 0
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._invalidated_size = maxsize
+        self._floor = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, payment_id: str) -> Optional[GetPaymentResponse]:
+        return self._cache.get(payment_id)  # type: ignore[no-any-return]
+
+    def put(self, response: GetPaymentResponse, version: Optional[int] = None) -> None:
+        """
+        Store response with TTL of its payment status.
+            :param version: `version` read before the request, the response
+                is dropped if a callback of the payment came in meanwhile
+        """
+        payment = response.payment
+        if version is not None and self._invalidated_since(
+            payment.client_order_id, version
+        ):
+            return
+
+        ttl = self.ttls.get(payment.status, 0.0)
+        if ttl <= 0:
+            self.invalidate(payment.id)
+            return
+
+        self._order_index[payment.client_order_id] = payment.id
+        self._cache.set(payment.id, response, ttl)
+
+    def invalidate(self, payment_id: str) -> None:
+        self._cache.pop(payment_id)
+
+    def apply_callback(self, callback: CallbackRequest) -> None:
+        """Invalidate the payment the callback refers to."""
+        order_id = callback.client_order_id
+        self.version += 1
+        self._invalidated.pop(order_id, None)
+        self._invalidated[order_id] = self.version
+        if len(self._invalidated) > self._invalidated_size:
+            _, self._floor = self._invalidated.popitem(last=False)
+
+        payment_id = self._order_index.get(order_id)
+        if payment_id is not None:
+            self.invalidate(payment_id)
+
+    def _invalidated_since(self, client_order_id: str, version: int) -> bool:
+        """Whether a callback of the order may have come in after `version`."""
+        if version < self._floor:
+            return True  # its callback may have been forgotten, don't risk it
+        return self._invalidated.get(client_order_id, 0) > version
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _forget_order(self, payment_id: Hashable, response: Any) -> None:
+        order_id = response.payment.client_order_id
+        if self._order_index.get(order_id) == payment_id:
+            del self._order_index[order_id]
+
+
+class QuoteCache:
+    """
+    Short-lived cache of `pre_calculate_payment` quotes.
+        Keyed by payment ID and crypto currency ID,
+        quotes follow the exchange rate, so keep TTL within a few seconds.
+    """
+
+    def __init__(self, ttl: float = 2.0, maxsize: int = 10000) -> None:
+        """
+        :param ttl: seconds to keep a quote
+        :param maxsize: max number of cached quotes
+        """
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(
+        self, payment_id: str, crypto_currency_id: int
+    ) -> Optional[PreCalculatePaymentResponse]:
+        return self._cache.get(  # type: ignore[no-any-return]
+            (payment_id, crypto_currency_id)
+        )
+
+    def put(
+        self,
+        payment_id: str,
+        crypto_currency_id: int,
+        quote: PreCalculatePaymentResponse,
+    ) -> None:
+        self._cache.set((payment_id, crypto_currency_id), quote, self.ttl)
+
+    def invalidate(self, payment_id: str, crypto_currency_id: int) -> None:
+        self._cache.pop((payment_id, crypto_currency_id))
+
+    def clear(self) -> None:
+        self._cache.clear()
@@ -0,0 +1,51 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Union
+
+
+@dataclass(frozen=True)
+class JSONCodec:
+    """
+    JSON encoder/decoder used for requests, responses and callbacks.
+        :param loads: decode `bytes` or `str` into Python objects
+        :param dumps: encode Python objects into `bytes`
+        :param name: codec name for logs and metrics
+    """
+
+    loads: Callable[[Union[bytes, str]], Any]
+    dumps: Callable[[Any], bytes]
+    name: str = "json"
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+STDLIB_CODEC = JSONCodec(loads=json.loads, dumps=_json_dumps, name="json")
+
+
+def orjson_codec() -> JSONCodec:
+    """Codec backed by `orjson` (pip install orjson)."""
+    import orjson  # type: ignore[import]
+
+    return JSONCodec(loads=orjson.loads, dumps=orjson.dumps, name="orjson")
+
+
+def ujson_codec() -> JSONCodec:
+    """Codec backed by `ujson` (pip install ujson)."""
+    import ujson  # type: ignore[import]
+
+    def dumps(obj: Any) -> bytes:
+        return ujson.dumps(obj).encode()  # type: ignore[no-any-return]
+
+    return JSONCodec(loads=ujson.loads, dumps=dumps, name="ujson")
+
+
+def fastest_codec() -> JSONCodec:
+    """The fastest installed codec: orjson, ujson, then stdlib json."""
+    for factory in (orjson_codec, ujson_codec):
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return STDLIB_CODEC
@@ -1,5 +1,5 @@
 from strenum import StrEnum
-from typing import List
+from typing import FrozenSet, List
 
 
 class HTTPMethods(StrEnum):
@@ -9,6 +9,15 @@ class HTTPMethods(StrEnum):
     GET = "GET"
 
 
+class Endpoints(StrEnum):
+    """Quiqy API endpoints, used as keys for per-endpoint settings"""
+
+    CREATE = "create"
+    GET = "get"
+    CALCULATION = "calculation"
+    DETAIL = "detail"
+
+
 class Networks(StrEnum):
     """Quiqy networks"""
 
@@ -65,6 +74,17 @@ class PaymentStatus(StrEnum):
     UNCONFIRMED = "unconfirmed"
 
 
+# Statuses a payment never leaves
+TERMINAL_STATUSES: FrozenSet[str] = frozenset(
+    {
+        PaymentStatus.CONFIRMED,
+        PaymentStatus.UNDETAILED,
+        PaymentStatus.UNDETECTED,
+        PaymentStatus.UNCONFIRMED,
+    }
+)
+
+
 class PaymentType(StrEnum):
     """Payment type"""
 
@@ -0,0 +1,46 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Iterator, Optional
+
+# Monotonic time all requests of the current context must finish by
+_deadline: ContextVar[Optional[float]] = ContextVar("aioquiqy_deadline", default=None)
+
+
+def get_deadline() -> Optional[float]:
+    """Deadline of requests made in the current context (None - no deadline)."""
+    return _deadline.get()
+
+
+def resolve_deadline(timeout: Optional[float]) -> Optional[float]:
+    """Earliest of the context deadline and `timeout` seconds from now."""
+    deadline = _deadline.get()
+    if timeout is None:
+        return deadline
+
+    until = time.monotonic() + timeout
+    if deadline is None or until < deadline:
+        return until
+    return deadline
+
+
+@contextmanager
+def request_deadline(timeout: Optional[float]) -> Iterator[None]:
+    """
+    Make requests inside the block finish within `timeout` seconds, retries included.
+        Nested blocks can only shorten the deadline.
+        with request_deadline(2.0):
+            payment = await client.get_payment(payment_id)
+            quote = await client.pre_calculate_payment(payment_id, currency_id)
+    """
+    token = _deadline.set(resolve_deadline(timeout))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+async def with_deadline(timeout: Optional[float], awaitable: Awaitable[Any]) -> Any:
+    """Await with requests bound by the given deadline."""
+    with request_deadline(timeout):
+        return await awaitable
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from .models.payment import CallbackRequest
+
+
+def callback_key(callback: CallbackRequest) -> str:
+    """Idempotency key of a callback delivery."""
+    updated_at = callback.payment_status_updated_at
+    return "|".join(
+        (
+            callback.client_order_id,
+            callback.payment_status,
+            updated_at.isoformat() if updated_at is not None else "",
+        )
+    )
+
+
+class DedupStore:
+    """
+    Base class of callback deduplication stores.
+        `seen` must check and mark a key in one atomic step,
+        so two concurrent deliveries can't both pass.
+    """
+
+    async def seen(self, key: str) -> bool:
+        """Mark key as seen, return whether it had been seen already."""
+        raise NotImplementedError
+
+    async def forget(self, key: str) -> None:
+        """Unmark key, so the next delivery is processed again."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryDedupStore(DedupStore):
+    """Bounded in-process LRU of seen keys."""
+
+    def __init__(self, maxsize: int = 100000, ttl: Optional[float] = None) -> None:
+        """
+        :param maxsize: max number of remembered keys
+        :param ttl: seconds to remember a key (None - until evicted)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._keys: "OrderedDict[str, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    async def seen(self, key: str) -> bool:
+        now = time.monotonic()
+        seen_at = self._keys.get(key)
+        if seen_at is not None and (self.ttl is None or now - seen_at < self.ttl):
+            self._keys.move_to_end(key)
+            return True
+
+        self._keys[key] = now
+        self._keys.move_to_end(key)
+        while len(self._keys) > self.maxsize:
+            self._keys.popitem(last=False)
+        return False
+
+    async def forget(self, key: str) -> None:
+        self._keys.pop(key, None)
+
+
+class SQLiteDedupStore(DedupStore):
+    """
+    Seen keys in a local SQLite file, shared by several processes.
+        Queries run in the default executor to keep the event loop free.
+    """
+
+    PURGE_EVERY = 1000
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600) -> None:
+        """
+        :param path: database file path
+        :param ttl: seconds to remember a key, older keys are purged
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._inserts = 0
+
+        import sqlite3  # only stores on disk need it
+
+        self._db = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS callback_dedup "
+            "(key TEXT PRIMARY KEY, seen_at REAL NOT NULL)"
+        )
+
+    async def seen(self, key: str) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._seen, key
+        )
+
+    async def forget(self, key: str) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self._forget, key)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _seen(self, key: str) -> bool:
+        now = time.time()
+        with self._lock:
+            # Insert a new key or refresh an expired one, nothing changes for a dup
+            changed = self._db.execute(
+                "INSERT INTO callback_dedup (key, seen_at) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET seen_at = excluded.seen_at "
+                "WHERE callback_dedup.seen_at < ?",
+                (key, now, now - self.ttl),
+            ).rowcount
+
+            self._inserts += 1
+            if self._inserts % self.PURGE_EVERY == 0:
+                self._db.execute(
+                    "DELETE FROM callback_dedup WHERE seen_at < ?", (now - self.ttl,)
+                )
+        return changed == 0
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM callback_dedup WHERE key = ?", (key,))
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from .metrics import Metrics, handler_name
+from .models.payment import CallbackRequest
+
+logger = logging.getLogger(__name__)
+
+CallbackHandler = Callable[[CallbackRequest, Any], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class DispatchConfig:
+    """
+    How `handle_callback` runs registered handlers.
+        :param concurrent: run handlers of one callback concurrently
+        :param fast_ack: answer 200 right after validation,
+            run handlers in background workers
+        :param workers: number of background workers (fast_ack only)
+        :param queue_size: max callbacks waiting for a worker,
+            Quiqy gets 503 and redelivers when the queue is full (fast_ack only)
+        :param drain_timeout: seconds to finish queued callbacks on close
+    """
+
+    concurrent: bool = False
+    fast_ack: bool = False
+    workers: int = 4
+    queue_size: int = 1000
+    drain_timeout: Optional[float] = 30.0
+
+
+async def run_handlers(
+    handlers: Sequence[CallbackHandler],
+    callback: CallbackRequest,
+    app: Any,
+    concurrent: bool = False,
+    metrics: Optional[Metrics] = None,
+) -> None:
+    """
+    Run handlers for one callback.
+        Concurrent handlers all run to completion,
+        then the first error (if any) is raised.
+        With `metrics` the run time of every handler is recorded.
+    """
+    if metrics is not None:
+        handlers = [_timed(handler, metrics) for handler in handlers]
+
+    if not concurrent or len(handlers) < 2:
+        for handler in handlers:
+            await handler(callback, app)
+        return
+
+    results = await asyncio.gather(
+        *(handler(callback, app) for handler in handlers), return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+def _timed(handler: CallbackHandler, metrics: Metrics) -> CallbackHandler:
+    name = handler_name(handler)
+
+    async def timed(callback: CallbackRequest, app: Any) -> Any:
+        result = "error"
+        started = time.perf_counter()
+        try:
+            value = await handler(callback, app)
+            result = "ok"
+            return value
+        finally:
+            metrics.observe(
+                "aioquiqy_callback_handler_duration_seconds",
+                time.perf_counter() - started,
+                handler=name,
+                result=result,
+            )
+
+    return timed
+
+
+class CallbackQueue:
+    """
+    Bounded queue of accepted callbacks processed by a worker pool.
+        Workers start on the first submitted callback.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[CallbackRequest, Any], Awaitable[Any]],
+        workers: int = 4,
+        maxsize: int = 1000,
+    ) -> None:
+        """
+        :param process: coroutine function processing one callback
+        :param workers: number of workers
+        :param maxsize: max number of waiting callbacks
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self._process = process
+        self._workers_count = workers
+        self._maxsize = maxsize
+        self._queue: "Optional[asyncio.Queue[Tuple[CallbackRequest, Any]]]" = None
+        self._workers: List["asyncio.Task[None]"] = []
+        self._closing = False
+
+    def __len__(self) -> int:
+        return 0 if self._queue is None else self._queue.qsize()
+
+    def submit(self, callback: CallbackRequest, app: Any) -> bool:
+        """Enqueue callback, False if the queue is full or closing."""
+        if self._closing:
+            return False
+
+        if self._queue is None:
+            self._queue = asyncio.Queue(self._maxsize)
+        if not self._workers:
+            self._workers = [
+                asyncio.ensure_future(self._worker())
+                for _ in range(self._workers_count)
+            ]
+
+        try:
+            self._queue.put_nowait((callback, app))
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting callbacks, wait for queued ones and stop workers.
+            Callbacks still queued after `timeout` are dropped.
+        """
+        self._closing = True
+        try:
+            if self._queue is not None:
+                await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Dropped %d queued callbacks on drain", len(self))
+        finally:
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+            self._queue = None
+            self._closing = False
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            callback, app = await queue.get()
+            try:
+                await self._process(callback, app)
+            except Exception:
+                logger.exception(
+                    "Callback handler failed for order %s", callback.client_order_id
+                )
+            finally:
+                queue.task_done()
@@ -1,8 +1,14 @@
 from .factory import QuiqyAPIError
+from .client import QuiqyClientError, CircuitOpenError, DeadlineExceededError
 
 
 """
 Quiqy API Exception handling
 """
 
-__all__ = ["QuiqyAPIError"]
\ No newline at end of file
+__all__ = [
+    "QuiqyAPIError",
+    "QuiqyClientError",
+    "CircuitOpenError",
+    "DeadlineExceededError",
+]
@@ -0,0 +1,32 @@
+import asyncio
+
+
+class QuiqyClientError(Exception):
+    """Client side error, the request didn't get a Quiqy API answer"""
+
+
+class CircuitOpenError(QuiqyClientError):
+    """Endpoint is considered unhealthy, the call failed fast"""
+
+    def __init__(self, endpoint: str, retry_after: float) -> None:
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        super().__init__(endpoint, retry_after)
+
+    def __str__(self) -> str:
+        return (
+            f"Circuit for '{self.endpoint}' is open, "
+            f"retry in {self.retry_after:.1f}s"
+        )
+
+
+class DeadlineExceededError(QuiqyClientError, asyncio.TimeoutError):
+    """The call didn't finish before its deadline, retries included"""
+
+    def __init__(self, endpoint: str, timeout: float) -> None:
+        self.endpoint = endpoint
+        self.timeout = timeout
+        super().__init__(endpoint, timeout)
+
+    def __str__(self) -> str:
+        return f"Call to '{self.endpoint}' exceeded its deadline of {self.timeout:.3f}s"
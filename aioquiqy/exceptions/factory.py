@@ -1,9 +1,39 @@
-import gc
-from typing import Optional, Type, Union
+import threading
+from typing import Any, Dict, Optional, Tuple, Type
 
 
-class QuiqyAPIError(Exception):
-    """Quiqy API Exception"""
+# (base class, HTTP status code) -> exception class of this code
+_EXCEPTION_REGISTRY: Dict[Tuple[type, int], Type["QuiqyAPIError"]] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+class QuiqyAPIErrorMeta(type):
+    """
+    Makes `QuiqyAPIError(code)` return the exception class of the code,
+    so `except QuiqyAPIError(404)` catches exactly what is raised for 404.
+    """
+
+    def __call__(  # type: ignore[override]
+        cls,
+        code: Optional[int] = None,
+        name: Optional[str] = None,
+        hint: Optional[str] = None,
+    ) -> Any:
+        if code is None or cls.status_code is not None:  # type: ignore[attr-defined]
+            return super().__call__(code, name, hint)
+        if name is None and hint is None:
+            return cls.exception_to_handle(code)  # type: ignore[attr-defined]
+        return cls.exception_to_raise(code, name, hint)  # type: ignore[attr-defined]
+
+
+class QuiqyAPIError(Exception, metaclass=QuiqyAPIErrorMeta):
+    """
+    Quiqy API Exception
+        QuiqyAPIError(404) - exception class for 404 errors, use it in `except`
+        QuiqyAPIError(404, name, hint) - exception instance to raise
+    """
+
+    status_code: Optional[int] = None
 
     def __init__(
         self,
@@ -16,43 +46,62 @@ class QuiqyAPIError(Exception):
         self.hint = hint
         super().__init__(self.code)
 
-    @classmethod
-    def __call__(
-        cls,
-        code: Optional[int] = None,
-        name: Optional[str] = None,
-        hint: Optional[str] = None,
-    ) -> Union["QuiqyAPIError", Type["QuiqyAPIError"]]:
-        if name and code is not None:
-            return cls.exception_to_raise(code, str(name), hint)
-        return cls.exception_to_handle(code)
-
     @classmethod
     def exception_to_handle(cls, code: Optional[int] = None) -> Type["QuiqyAPIError"]:
+        """Returns the exception class of the error code (one class per code)"""
         if code is None:
             return cls
 
-        catch_exc_classname = cls.generate_exc_classname(code)
-
-        for obj in gc.get_objects():
-            if obj.__class__.__name__ == catch_exc_classname:
-                return obj.__class__  # type: ignore[return-value,no-any-return]
+        code = int(code)
+        exception_type = _EXCEPTION_REGISTRY.get((cls, code))
+        if exception_type is not None:
+            return exception_type
 
-        return type(catch_exc_classname, (cls,), {})  # type: ignore[return-value]
+        with _REGISTRY_LOCK:
+            exception_type = _EXCEPTION_REGISTRY.get((cls, code))
+            if exception_type is None:
+                classname = cls.generate_exc_classname(code)
+                exception_type = type(cls)(
+                    classname,
+                    (cls,),
+                    {
+                        "status_code": code,
+                        "__module__": cls.__module__,
+                        "__qualname__": classname,
+                    },
+                )
+                _EXCEPTION_REGISTRY[(cls, code)] = exception_type
+        return exception_type
 
     @classmethod
     def exception_to_raise(
         cls, code: int, name: str, hint: Optional[str] = None
     ) -> "QuiqyAPIError":
         """Returns an error with error code and error_name"""
-        exception_type = type(cls.generate_exc_classname(code), (cls,), {})  # type: ignore
-        return exception_type(code, name, hint)  # type: ignore
+        exception_type = cls.exception_to_handle(code)
+        return exception_type(code, name, hint)
 
     @classmethod
     def generate_exc_classname(cls, code: Optional[int]) -> str:
         """Generates unique exception classname based on error code"""
         return f"{cls.__name__}_{code}"
 
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        base = type(self) if self.status_code is None else type(self).__base__
+        return _rebuild_exception, (base, self.code, self.name, self.hint)
+
     def __str__(self) -> str:
         hint_text = f" - {self.hint}" if self.hint else ""
         return f"[{self.code}] {self.name}{hint_text}\n"
+
+
+def _rebuild_exception(
+    base: Type[QuiqyAPIError],
+    code: Optional[int],
+    name: Optional[str],
+    hint: Optional[str],
+) -> QuiqyAPIError:
+    """Unpickle an error into the registered class of its code"""
+    if code is None:
+        return base(None, name, hint)
+    return base.exception_to_raise(code, name or "", hint)
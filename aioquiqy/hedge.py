@@ -0,0 +1,93 @@
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """
+    Hedged requests of idempotent reads (`get_payment`, `pre_calculate_payment`).
+        If a read isn't answered within the hedge delay, a second request is sent,
+        the first successful reply wins and the other request is cancelled.
+        With the delay at a high latency percentile only the slowest calls
+        are duplicated, so the extra load stays around `1 - percentile`.
+        :param delay: fixed hedge delay in seconds (None - observed percentile)
+        :param percentile: latency percentile of the endpoint used as delay
+        :param window: recent latencies kept per endpoint
+        :param min_samples: latencies needed before the percentile is trusted,
+            `max_delay` is used until then
+        :param min_delay: lower bound of the observed delay in seconds
+        :param max_delay: upper bound of the observed delay in seconds
+    """
+
+    delay: Optional[float] = None
+    percentile: float = 0.95
+    window: int = 256
+    min_samples: int = 20
+    min_delay: float = 0.005
+    max_delay: float = 1.0
+
+    def __post_init__(self) -> None:
+        if not 0 < self.percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        if self.window < 1:
+            raise ValueError("window must be at least 1")
+
+
+class LatencyWindow:
+    """
+    Latencies of the last successful calls of one endpoint.
+        Percentiles are cached and recomputed after every `size // 8`
+        new samples, so calls don't sort the window every time.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.samples: Deque[float] = deque(maxlen=size)
+        self._refresh_every = max(1, size // 8)
+        self._pending = 0
+        self._cached: Dict[float, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def observe(self, latency: float) -> None:
+        self.samples.append(latency)
+        self._pending += 1
+        if self._pending >= self._refresh_every:
+            self._pending = 0
+            self._cached.clear()
+
+    def percentile(self, q: float) -> float:
+        value = self._cached.get(q)
+        if value is None:
+            ordered = sorted(self.samples)
+            value = ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+            self._cached[q] = value
+        return value
+
+
+class HedgeTracker:
+    """Latency windows of all endpoints and the hedge delay derived from them."""
+
+    def __init__(self, policy: HedgePolicy) -> None:
+        self.policy = policy
+        self._windows: Dict[str, LatencyWindow] = {}
+
+    def observe(self, endpoint: str, latency: float) -> None:
+        window = self._windows.get(endpoint)
+        if window is None:
+            window = self._windows[endpoint] = LatencyWindow(self.policy.window)
+        window.observe(latency)
+
+    def get_delay(self, endpoint: str) -> float:
+        """Seconds to wait for the first request before hedging it."""
+        policy = self.policy
+        if policy.delay is not None:
+            return policy.delay
+
+        window = self._windows.get(endpoint)
+        if window is None or len(window) < policy.min_samples:
+            return policy.max_delay
+        delay = window.percentile(policy.percentile)
+        return min(policy.max_delay, max(policy.min_delay, delay))
@@ -0,0 +1,496 @@
+"""
+Append-only journal of received callbacks.
+
+    python -m aioquiqy.journal PATH [--since T] [--until T]
+        [--status S ...] [--order ID ...] [--client module:attribute]
+
+Prints matching callbacks as JSON lines, or with `--client` replays them
+through the handlers registered on that AioQuiqy client.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from importlib import import_module
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Collection,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .models.payment import CallbackRequest
+
+if TYPE_CHECKING:
+    from .api import AioQuiqy
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_MAGIC = b"QJ01"
+SEGMENT_SUFFIX = ".qjournal"
+# body length, crc32 of body, received at, status length, client_order_id length
+RECORD_HEADER = struct.Struct("<IIdBH")
+
+
+class JournalRecord(NamedTuple):
+    """Journaled callback, `body` is the raw request body"""
+
+    received_at: float
+    payment_status: str
+    client_order_id: str
+    body: bytes
+
+    def parse(self) -> CallbackRequest:
+        return CallbackRequest.model_validate_json(self.body)
+
+
+class ReplayResult(NamedTuple):
+    """Number of replayed callbacks and of those whose handlers failed"""
+
+    replayed: int
+    failed: int
+
+
+def encode_record(
+    body: bytes, payment_status: str, client_order_id: str, received_at: float
+) -> bytes:
+    status = payment_status.encode()
+    order_id = client_order_id.encode()
+    header = RECORD_HEADER.pack(
+        len(body), zlib.crc32(body), received_at, len(status), len(order_id)
+    )
+    return b"".join((header, status, order_id, body))
+
+
+class CallbackJournal:
+    """
+    Raw callback bodies in segmented append-only files.
+        Records are group-committed: appends only queue the bytes,
+        one writer thread writes and fsyncs everything queued meanwhile
+        in a single batch, so journaling adds no per-request latency.
+        Every opened journal starts a new segment, segments are named
+        by the time of their first record.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        segment_size: int = 64 * 1024 * 1024,
+        fsync: bool = True,
+        durable_ack: bool = False,
+    ) -> None:
+        """
+        :param path: directory of segment files, created if missing
+        :param segment_size: bytes after which a new segment is started
+        :param fsync: fsync every batch (False - leave it to the OS)
+        :param durable_ack: `handle_callback` answers only after the callback
+            is written (default: right away, a crash may lose the last batch)
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self.durable_ack = durable_ack
+        self.written = 0
+        self._pending: List[Tuple[float, bytes]] = []
+        self._pending_done: "Optional[asyncio.Future[None]]" = None
+        self._inflight_done: "Optional[asyncio.Future[None]]" = None
+        self._flushing = False
+        self._flusher: "Optional[asyncio.Task[None]]" = None
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="aioquiqy-journal")
+        # owned by the writer thread
+        self._file: Optional[BinaryIO] = None
+        self._size = 0
+        self._closed = False
+
+    def append(
+        self,
+        body: bytes,
+        callback: CallbackRequest,
+        received_at: Optional[float] = None,
+    ) -> None:
+        """Queue raw body of a validated callback, written by the next batch."""
+        if self._closed:
+            raise RuntimeError("Journal is closed")
+
+        received_at = time.time() if received_at is None else received_at
+        record = encode_record(
+            body, callback.payment_status, callback.client_order_id, received_at
+        )
+        self._pending.append((received_at, record))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.ensure_future(self._flush())
+
+    async def commit(self) -> None:
+        """Wait until the callbacks appended so far are written."""
+        loop = asyncio.get_running_loop()
+        if self._pending:
+            if self._pending_done is None:
+                self._pending_done = loop.create_future()
+            waiter = self._pending_done
+        elif self._flushing:
+            if self._inflight_done is None:
+                self._inflight_done = loop.create_future()
+            waiter = self._inflight_done
+        else:
+            return
+        await asyncio.shield(waiter)
+
+    async def close(self) -> None:
+        """Write queued callbacks and close the current segment."""
+        self._closed = True
+        if self._flusher is not None:
+            await asyncio.shield(self._flusher)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close_segment)
+        self._executor.shutdown(wait=False)
+
+    async def _flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            batch, self._pending = self._pending, []
+            self._inflight_done, self._pending_done = self._pending_done, None
+            self._flushing = True
+            try:
+                await loop.run_in_executor(self._executor, self._write, batch)
+            except BaseException as exc:
+                self._finish_batch(exc)
+                if not isinstance(exc, Exception):
+                    raise
+                logger.exception("Failed to journal %d callbacks", len(batch))
+            else:
+                self._finish_batch(None)
+
+    def _finish_batch(self, error: Optional[BaseException]) -> None:
+        self._flushing = False
+        done, self._inflight_done = self._inflight_done, None
+        if done is None or done.done():
+            return
+        if error is None:
+            done.set_result(None)
+        elif isinstance(error, asyncio.CancelledError):
+            done.cancel()
+        else:
+            done.set_exception(error)
+
+    def _write(self, batch: List[Tuple[float, bytes]]) -> None:
+        """Write one batch in the writer thread."""
+        data = b"".join(record for _, record in batch)
+        if self._file is None or (
+            self._size > len(SEGMENT_MAGIC)
+            and self._size + len(data) > self.segment_size
+        ):
+            self._open_segment(batch[0][0])
+        assert self._file is not None
+
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._size += len(data)
+        self.written += len(batch)
+
+    def _open_segment(self, started_at: float) -> None:
+        self._close_segment()
+        stamp = int(started_at * 1e6)
+        while True:
+            path = self.path / f"{stamp:020d}{SEGMENT_SUFFIX}"
+            try:
+                self._file = open(path, "xb")
+                break
+            except FileExistsError:
+                stamp += 1
+
+        self._file.write(SEGMENT_MAGIC)
+        self._size = len(SEGMENT_MAGIC)
+        if self.fsync:
+            _fsync_directory(self.path)
+
+    def _close_segment(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _fsync_directory(path: Path) -> None:
+    """Make a new segment survive a crash, not supported on Windows."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def segment_paths(path: Union[str, Path]) -> List[Path]:
+    """Segment files of the journal, oldest first."""
+    return sorted(Path(path).glob(f"*{SEGMENT_SUFFIX}"))
+
+
+def read_segment(
+    data: bytes,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    statuses: Optional[Collection[str]] = None,
+    client_order_ids: Optional[Collection[str]] = None,
+    name: str = "segment",
+) -> Iterator[JournalRecord]:
+    """
+    Records of one segment matching the filters.
+        Filters are checked on the record headers, bodies aren't parsed.
+        Reading stops at a torn or corrupted tail.
+    """
+    if not data.startswith(SEGMENT_MAGIC):
+        logger.warning("%s is not a callback journal segment", name)
+        return
+
+    status_filter = None if statuses is None else {s.encode() for s in statuses}
+    order_filter = (
+        None if client_order_ids is None else {o.encode() for o in client_order_ids}
+    )
+    unpack = RECORD_HEADER.unpack_from
+    header_size = RECORD_HEADER.size
+    offset = len(SEGMENT_MAGIC)
+    end = len(data)
+    while offset < end:
+        if offset + header_size > end:
+            logger.warning("%s is truncated at %d", name, offset)
+            return
+        length, crc, received_at, status_len, order_len = unpack(data, offset)
+        start = offset + header_size
+        body_start = start + status_len + order_len
+        offset = body_start + length
+        if offset > end:
+            logger.warning("%s is truncated at %d", name, start - header_size)
+            return
+
+        if (since is not None and received_at < since) or (
+            until is not None and received_at >= until
+        ):
+            continue
+        status = data[start : start + status_len]
+        if status_filter is not None and status not in status_filter:
+            continue
+        order_id = data[start + status_len : body_start]
+        if order_filter is not None and order_id not in order_filter:
+            continue
+
+        body = data[body_start:offset]
+        if zlib.crc32(body) != crc:
+            logger.warning("%s is corrupted at %d", name, start - header_size)
+            return
+        yield JournalRecord(received_at, status.decode(), order_id.decode(), body)
+
+
+def _segment_starts(paths: List[Path]) -> List[float]:
+    return [int(path.name[: -len(SEGMENT_SUFFIX)]) / 1e6 for path in paths]
+
+
+def _select_segments(
+    path: Union[str, Path], since: Optional[float], until: Optional[float]
+) -> List[Path]:
+    """Skip segments entirely before `since` or after `until`."""
+    paths = segment_paths(path)
+    starts = _segment_starts(paths)
+    selected = []
+    for index, segment in enumerate(paths):
+        if until is not None and starts[index] >= until:
+            break
+        next_start = starts[index + 1] if index + 1 < len(starts) else None
+        if since is not None and next_start is not None and next_start <= since:
+            continue
+        selected.append(segment)
+    return selected
+
+
+def read_journal(
+    path: Union[str, Path],
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    statuses: Optional[Collection[str]] = None,
+    client_order_ids: Optional[Collection[str]] = None,
+) -> Iterator[JournalRecord]:
+    """
+    Journaled callbacks in the order received, one segment in memory at a time.
+        :param since: first receive time, unix seconds (inclusive)
+        :param until: last receive time, unix seconds (exclusive)
+        :param statuses: payment statuses to keep (None - any)
+        :param client_order_ids: orders to keep (None - any)
+    """
+    for segment in _select_segments(path, since, until):
+        yield from read_segment(
+            segment.read_bytes(),
+            since,
+            until,
+            statuses,
+            client_order_ids,
+            name=str(segment),
+        )
+
+
+async def replay(
+    client: "AioQuiqy",
+    path: Union[str, Path],
+    app: Any = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    statuses: Optional[Collection[str]] = None,
+    client_order_ids: Optional[Collection[str]] = None,
+    concurrency: int = 1,
+) -> ReplayResult:
+    """
+    Run journaled callbacks through the handlers registered on the client.
+        Deduplication, payment cache and fast-ack queue are skipped.
+        Segments are read in the default executor. With `concurrency` > 1
+        callbacks of one order still run one by one, in the order received.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    loop = asyncio.get_running_loop()
+    queues: "List[asyncio.Queue[Optional[JournalRecord]]]" = [
+        asyncio.Queue(1000) for _ in range(concurrency)
+    ]
+    counts = [0, 0]
+
+    async def worker(queue: "asyncio.Queue[Optional[JournalRecord]]") -> None:
+        while True:
+            record = await queue.get()
+            if record is None:
+                return
+            counts[0] += 1
+            try:
+                await client.run_callback_handlers(record.parse(), app)
+            except Exception:
+                counts[1] += 1
+                logger.exception(
+                    "Replayed callback failed for order %s", record.client_order_id
+                )
+
+    workers = [asyncio.ensure_future(worker(queue)) for queue in queues]
+    try:
+        for segment in _select_segments(path, since, until):
+            data = await loop.run_in_executor(None, segment.read_bytes)
+            for record in read_segment(
+                data, since, until, statuses, client_order_ids, name=str(segment)
+            ):
+                queue = queues[hash(record.client_order_id) % concurrency]
+                await queue.put(record)
+        for queue in queues:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    return ReplayResult(*counts)
+
+
+def parse_time(value: str) -> float:
+    """Unix seconds or ISO 8601 date-time (UTC if no offset)."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def load_client(spec: str) -> "AioQuiqy":
+    """Import `module:attribute`, the attribute may be a client or a factory."""
+    module_name, _, attribute = spec.partition(":")
+    value = getattr(import_module(module_name), attribute or "client")
+    if not hasattr(value, "run_callback_handlers"):
+        value = value()
+    return value  # type: ignore[no-any-return]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m aioquiqy.journal",
+        description=__doc__.strip().splitlines()[0] if __doc__ else None,
+    )
+    parser.add_argument("path", help="journal directory")
+    parser.add_argument("--since", type=parse_time, help="unix time or ISO 8601")
+    parser.add_argument("--until", type=parse_time, help="unix time or ISO 8601")
+    parser.add_argument("--status", action="append", help="repeat for several")
+    parser.add_argument(
+        "--order", action="append", help="client_order_id, repeat for several"
+    )
+    parser.add_argument(
+        "--client", help="replay through handlers of module:attribute client"
+    )
+    parser.add_argument("--concurrency", type=int, default=1)
+    return parser.parse_args(argv)
+
+
+async def run_replay(args: argparse.Namespace) -> ReplayResult:
+    client = load_client(args.client)
+    try:
+        return await replay(
+            client,
+            args.path,
+            since=args.since,
+            until=args.until,
+            statuses=args.status,
+            client_order_ids=args.order,
+            concurrency=args.concurrency,
+        )
+    finally:
+        await client.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    if args.client:
+        started = time.perf_counter()
+        result = asyncio.run(run_replay(args))
+        elapsed = time.perf_counter() - started
+        print(
+            f"replayed {result.replayed} callbacks in {elapsed:.2f} s "
+            f"({result.replayed / max(elapsed, 1e-9):.0f}/s), failed {result.failed}",
+            file=sys.stderr,
+        )
+        if result.failed:
+            sys.exit(1)
+        return
+
+    out = sys.stdout
+    for record in read_journal(
+        args.path, args.since, args.until, args.status, args.order
+    ):
+        out.write(
+            json.dumps(
+                {
+                    "received_at": record.received_at,
+                    "payment_status": record.payment_status,
+                    "client_order_id": record.client_order_id,
+                    "callback": json.loads(record.body),
+                }
+            )
+            + "\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+import math
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+from typing import (
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Union,
+)
+
+from .cache import TTLCache
+from .const import TERMINAL_STATUSES, PaymentStatus
+from .models.payment import CallbackRequest, CreatePaymentResponse, PaymentResponse
+
+# Status value -> the shared enum member, records never hold their own string copies
+_STATUSES: Dict[str, PaymentStatus] = {status.value: status for status in PaymentStatus}
+
+
+def intern_status(status: str) -> PaymentStatus:
+    """Shared PaymentStatus member of the status value."""
+    return _STATUSES[status]
+
+
+def utc_timestamp(moment: datetime) -> float:
+    """POSIX seconds of the datetime, naive ones are UTC like in the API."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class PaymentRecord:
+    """
+    Compact state of one open payment.
+        Holds the fields needed to track a payment, without URLs, addresses
+        and datetimes: timestamps are POSIX seconds, the status is the shared
+        PaymentStatus member and small currency IDs are cached ints,
+        so a record costs ~100 bytes plus its two ID strings.
+        `id` is None until a payment response is seen, callbacks carry
+        `client_order_id` only.
+    """
+
+    __slots__ = (
+        "id",
+        "client_order_id",
+        "status",
+        "amount_fiat",
+        "fiat_currency_id",
+        "amount_crypto",
+        "crypto_currency_id",
+        "expires_at",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        id: Optional[str],
+        client_order_id: str,
+        status: PaymentStatus,
+        amount_fiat: float,
+        fiat_currency_id: int,
+        amount_crypto: Optional[float],
+        crypto_currency_id: Optional[int],
+        expires_at: float,
+        updated_at: float,
+    ) -> None:
+        self.id = id
+        self.client_order_id = client_order_id
+        self.status = status
+        self.amount_fiat = amount_fiat
+        self.fiat_currency_id = fiat_currency_id
+        self.amount_crypto = amount_crypto
+        self.crypto_currency_id = crypto_currency_id
+        self.expires_at = expires_at
+        self.updated_at = updated_at
+
+    def __repr__(self) -> str:
+        return (
+            f"PaymentRecord(id={self.id!r}, client_order_id={self.client_order_id!r}, "
+            f"status={self.status.value!r}, expires_at={self.expires_at})"
+        )
+
+    def expires_in(self, now: Optional[float] = None) -> float:
+        """Seconds until planned expiration, negative once expired."""
+        return self.expires_at - (time.time() if now is None else now)
+
+
+class PaymentLedger:
+    """
+    In-memory state of open payments, updated from callbacks and API responses.
+        Payments are found by ID and by `client_order_id` in O(1),
+        by status through a per-status index and by expiry time through
+        buckets of `resolution` seconds with a sorted list of bucket keys,
+        so "pending payments expiring within 60s" reads only the buckets
+        of the next minute instead of every payment.
+        Payments reaching a terminal status leave the ledger, late updates
+        of them are ignored for `closed_ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        resolution: float = 1.0,
+        closed_size: int = 100000,
+        closed_ttl: float = 3600.0,
+    ) -> None:
+        """
+        :param resolution: width of expiry buckets in seconds
+        :param closed_size: max number of remembered closed payments
+        :param closed_ttl: seconds to ignore updates of a closed payment
+        """
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+
+        self.resolution = resolution
+        self.closed_ttl = closed_ttl
+        self._by_id: Dict[str, PaymentRecord] = {}
+        self._by_order: Dict[str, PaymentRecord] = {}
+        self._by_status: Dict[PaymentStatus, Set[PaymentRecord]] = {}
+        # expiry bucket -> its records, and the sorted bucket keys
+        self._expiry: Dict[int, Set[PaymentRecord]] = {}
+        self._expiry_slots: List[int] = []
+        # client_order_id of closed payments
+        self._closed = TTLCache(closed_size)
+
+    def __len__(self) -> int:
+        return len(self._by_order)
+
+    def __contains__(self, client_order_id: object) -> bool:
+        return client_order_id in self._by_order
+
+    def __iter__(self) -> Iterator[PaymentRecord]:
+        return iter(list(self._by_order.values()))
+
+    def get(self, payment_id: str) -> Optional[PaymentRecord]:
+        return self._by_id.get(payment_id)
+
+    def get_by_order(self, client_order_id: str) -> Optional[PaymentRecord]:
+        return self._by_order.get(client_order_id)
+
+    def count(self, status: str) -> int:
+        """Number of open payments in the status."""
+        return len(self._by_status.get(intern_status(status), ()))
+
+    def with_status(self, *statuses: str) -> List[PaymentRecord]:
+        """Open payments in any of the statuses."""
+        records: List[PaymentRecord] = []
+        for status in statuses:
+            records.extend(self._by_status.get(intern_status(status), ()))
+        return records
+
+    def expiring(
+        self,
+        within: float,
+        statuses: Optional[Collection[str]] = None,
+        now: Optional[float] = None,
+    ) -> List[PaymentRecord]:
+        """
+        Open payments expiring within `within` seconds, soonest first.
+            :param statuses: only payments in these statuses (None - any)
+            :param now: POSIX time to count from (default: current time)
+        """
+        if now is None:
+            now = time.time()
+        return self._between(now, now + within, statuses)
+
+    def expired(
+        self,
+        statuses: Optional[Collection[str]] = None,
+        now: Optional[float] = None,
+    ) -> List[PaymentRecord]:
+        """Open payments past their planned expiration, oldest first."""
+        return self._between(-math.inf, time.time() if now is None else now, statuses)
+
+    def apply_payment(
+        self, payment: Union[PaymentResponse, CreatePaymentResponse]
+    ) -> Optional[PaymentRecord]:
+        """
+        Update the ledger from a payment of `get_payment`, `create_payment`
+        or `detail_payment` response.
+            :return: record of the payment, None if it is closed
+        """
+        record = self._by_id.get(payment.id)
+        if record is None:
+            record = self._by_order.get(payment.client_order_id)
+        created_at = utc_timestamp(payment.created_at)
+        return self._apply(
+            record,
+            payment.id,
+            payment.client_order_id,
+            payment.status,
+            payment.amount_fiat,
+            payment.fiat_currency_id,
+            payment.amount_crypto,
+            payment.crypto_currency_id,
+            created_at + payment.ttl,
+            utc_timestamp(payment.updated_at),
+        )
+
+    def apply_callback(self, callback: CallbackRequest) -> Optional[PaymentRecord]:
+        """
+        Update the ledger from a webhook callback.
+            :return: record of the payment, None if it is closed
+        """
+        updated_at = callback.payment_status_updated_at or callback.payment_created_at
+        return self._apply(
+            self._by_order.get(callback.client_order_id),
+            None,
+            callback.client_order_id,
+            callback.payment_status,
+            callback.amount_fiat,
+            callback.fiat_currency_id,
+            callback.amount_crypto,
+            callback.crypto_currency_id,
+            utc_timestamp(callback.planned_expiration_at),
+            utc_timestamp(updated_at),
+        )
+
+    def remove(self, client_order_id: str) -> Optional[PaymentRecord]:
+        """Drop the payment from the ledger, e.g. once it is handled."""
+        record = self._by_order.get(client_order_id)
+        if record is not None:
+            self._unindex(record)
+        return record
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._by_order.clear()
+        self._by_status.clear()
+        self._expiry.clear()
+        self._expiry_slots.clear()
+        self._closed.clear()
+
+    def _apply(
+        self,
+        record: Optional[PaymentRecord],
+        payment_id: Optional[str],
+        client_order_id: str,
+        status: str,
+        amount_fiat: float,
+        fiat_currency_id: int,
+        amount_crypto: Optional[float],
+        crypto_currency_id: Optional[int],
+        expires_at: float,
+        updated_at: float,
+    ) -> Optional[PaymentRecord]:
+        if client_order_id in self._closed:
+            return None
+        if record is not None and updated_at < record.updated_at:
+            return record  # delivered out of order, the record is newer
+
+        status = intern_status(status)
+        if status in TERMINAL_STATUSES:
+            if record is not None:
+                self._unindex(record)
+            self._closed.set(client_order_id, True, self.closed_ttl)
+            return None
+
+        if record is None:
+            record = PaymentRecord(
+                payment_id,
+                client_order_id,
+                status,
+                amount_fiat,
+                fiat_currency_id,
+                amount_crypto,
+                crypto_currency_id,
+                expires_at,
+                updated_at,
+            )
+            self._by_order[client_order_id] = record
+            if payment_id is not None:
+                self._by_id[payment_id] = record
+            self._by_status.setdefault(status, set()).add(record)
+            self._index_expiry(record)
+            return record
+
+        if payment_id is not None and record.id is None:
+            record.id = payment_id
+            self._by_id[payment_id] = record
+        if status is not record.status:
+            self._discard_status(record)
+            record.status = status
+            self._by_status.setdefault(status, set()).add(record)
+        if expires_at != record.expires_at:
+            self._unindex_expiry(record)
+            record.expires_at = expires_at
+            self._index_expiry(record)
+        record.amount_fiat = amount_fiat
+        record.fiat_currency_id = fiat_currency_id
+        if amount_crypto is not None:
+            record.amount_crypto = amount_crypto
+        if crypto_currency_id is not None:
+            record.crypto_currency_id = crypto_currency_id
+        record.updated_at = updated_at
+        return record
+
+    def _unindex(self, record: PaymentRecord) -> None:
+        del self._by_order[record.client_order_id]
+        if record.id is not None:
+            self._by_id.pop(record.id, None)
+        self._discard_status(record)
+        self._unindex_expiry(record)
+
+    def _discard_status(self, record: PaymentRecord) -> None:
+        records = self._by_status[record.status]
+        records.discard(record)
+        if not records:
+            del self._by_status[record.status]
+
+    def _slot(self, expires_at: float) -> int:
+        return math.floor(expires_at / self.resolution)
+
+    def _index_expiry(self, record: PaymentRecord) -> None:
+        slot = self._slot(record.expires_at)
+        records = self._expiry.get(slot)
+        if records is None:
+            records = self._expiry[slot] = set()
+            insort(self._expiry_slots, slot)
+        records.add(record)
+
+    def _unindex_expiry(self, record: PaymentRecord) -> None:
+        slot = self._slot(record.expires_at)
+        records = self._expiry[slot]
+        records.discard(record)
+        if not records:
+            del self._expiry[slot]
+            del self._expiry_slots[bisect_left(self._expiry_slots, slot)]
+
+    def _between(
+        self,
+        start: float,
+        end: float,
+        statuses: Optional[Collection[str]],
+    ) -> List[PaymentRecord]:
+        """Records expiring in [start, end), soonest first."""
+        slots = self._expiry_slots
+        first = 0 if start == -math.inf else bisect_left(slots, self._slot(start))
+        last = bisect_right(slots, self._slot(end))
+        wanted = None
+        if statuses is not None:
+            wanted = {intern_status(status) for status in statuses}
+
+        records = [
+            record
+            for slot in slots[first:last]
+            for record in self._expiry[slot]
+            if start <= record.expires_at < end
+            and (wanted is None or record.status in wanted)
+        ]
+        records.sort(key=lambda record: record.expires_at)
+        return records
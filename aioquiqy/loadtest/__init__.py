@@ -0,0 +1,11 @@
+from .runner import LatencyRecorder, LoadConfig, run_load, start_webhook
+from .server import FakeQuiqyServer, FakeServerConfig
+
+__all__ = [
+    "FakeQuiqyServer",
+    "FakeServerConfig",
+    "LatencyRecorder",
+    "LoadConfig",
+    "run_load",
+    "start_webhook",
+]
@@ -0,0 +1,237 @@
+"""
+Load test of AioQuiqy against a local fake Quiqy API.
+
+    python -m aioquiqy.loadtest --rate 200 --duration 60 --flow full
+    python -m aioquiqy.loadtest --serve --port 8080   # the fake server only
+    python -m aioquiqy.loadtest --network http://host:8080 --webhook-host 10.0.0.5
+
+Checkouts start at `--rate` per second no matter how fast the previous
+ones complete (open loop). The fake server moves payments through
+their statuses and posts callbacks to the client webhook. The report has
+throughput and p50/p95/p99 latency of every API call, of whole checkouts
+(`flow`), of callback handling (`callback`) and of callback delivery
+from the fake server (`callback_delivery`).
+"""
+import argparse
+import asyncio
+import json
+import logging
+from collections import Counter
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from ..api import AioQuiqy
+from ..codec import fastest_codec
+from ..dispatch import DispatchConfig
+from ..retry import RetryPolicy
+from ..signature import SignatureConfig
+from ..transport import TransportConfig
+from .runner import (
+    FLOWS,
+    LatencyRecorder,
+    LoadConfig,
+    count_callbacks,
+    run_load,
+    start_webhook,
+)
+from .server import FakeQuiqyServer, FakeServerConfig
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m aioquiqy.loadtest",
+        description=__doc__.splitlines()[1],
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    load = parser.add_argument_group("load")
+    load.add_argument("--rate", type=float, default=50.0, help="checkouts per second")
+    load.add_argument("--duration", type=float, default=30.0, help="seconds")
+    load.add_argument("--flow", choices=FLOWS, default="checkout")
+    load.add_argument(
+        "--uniform", action="store_true", help="fixed inter-arrival time, not Poisson"
+    )
+    load.add_argument("--max-in-flight", type=int, default=10000)
+    load.add_argument("--drain-timeout", type=float, default=60.0)
+    load.add_argument(
+        "--settle",
+        type=float,
+        help="seconds to wait for callbacks after checkouts "
+        "(default: detect + confirm time)",
+    )
+    load.add_argument("--seed", type=int)
+
+    client = parser.add_argument_group("client")
+    client.add_argument("--network", help="drive this API instead of a local fake")
+    client.add_argument("--connections", type=int, default=100, help="pool limit")
+    client.add_argument("--attempts", type=int, default=3, help="retry attempts")
+    client.add_argument("--fast-ack", action="store_true")
+    client.add_argument("--workers", type=int, default=4, help="fast-ack workers")
+    client.add_argument(
+        "--handler-delay", type=float, default=0.0, help="seconds of handler work"
+    )
+    client.add_argument(
+        "--callback-secret", help="sign callbacks and verify them in the webhook"
+    )
+    client.add_argument("--webhook-host", default="127.0.0.1")
+    client.add_argument("--webhook-port", type=int, default=0)
+
+    fake = parser.add_argument_group("fake server")
+    fake.add_argument("--serve", action="store_true", help="run the fake server only")
+    fake.add_argument("--host", default="127.0.0.1")
+    fake.add_argument("--port", type=int, default=0)
+    fake.add_argument("--latency", type=float, default=0.02, help="seconds")
+    fake.add_argument("--jitter", type=float, default=0.01, help="seconds")
+    fake.add_argument("--error-rate", type=float, default=0.0)
+    fake.add_argument("--throttle-rate", type=float, default=0.0)
+    fake.add_argument("--detect-after", type=float, default=1.0, help="seconds")
+    fake.add_argument("--confirm-after", type=float, default=1.0, help="seconds")
+    fake.add_argument("--abandon-rate", type=float, default=0.1)
+
+    parser.add_argument("--json", dest="json_path", help="write the report as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    return parser.parse_args()
+
+
+def build_signature(args: argparse.Namespace) -> Optional[SignatureConfig]:
+    return SignatureConfig(args.callback_secret) if args.callback_secret else None
+
+
+def build_server(args: argparse.Namespace) -> FakeQuiqyServer:
+    return FakeQuiqyServer(
+        FakeServerConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+            detect_after=args.detect_after,
+            confirm_after=args.confirm_after,
+            abandon_rate=args.abandon_rate,
+            callback_signature=build_signature(args),
+            seed=args.seed,
+        )
+    )
+
+
+async def serve(args: argparse.Namespace) -> None:
+    server = build_server(args)
+    url = await server.start(args.host, args.port)
+    print(f"Fake Quiqy API at {url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    server = None
+    network = args.network
+    if network is None:
+        server = build_server(args)
+        network = await server.start()
+
+    client = AioQuiqy(
+        "loadtest",
+        network=network,
+        transport=TransportConfig(limit=args.connections),
+        retry=RetryPolicy(max_attempts=args.attempts, backoff_base=0.05),
+        json_codec=fastest_codec(),
+        dispatch=DispatchConfig(fast_ack=args.fast_ack, workers=args.workers),
+        signature=build_signature(args),
+    )
+    statuses: Counter = Counter()
+    count_callbacks(client, statuses, args.handler_delay)
+
+    recorder = LatencyRecorder()
+    webhook = await start_webhook(
+        client, recorder, args.webhook_host, args.webhook_port
+    )
+    host, port = webhook.addresses[0][:2]
+    callback_url = f"http://{host}:{port}/callback"
+
+    config = LoadConfig(
+        rate=args.rate,
+        duration=args.duration,
+        flow=args.flow,
+        poisson=not args.uniform,
+        max_in_flight=args.max_in_flight,
+        drain_timeout=args.drain_timeout,
+        seed=args.seed,
+    )
+    try:
+        arrivals = await run_load(client, config, callback_url, recorder)
+
+        settle = args.settle
+        if settle is None:
+            settle = args.detect_after + args.confirm_after + 1.0
+        if args.flow != "create":
+            await asyncio.sleep(settle)
+        if server is not None:
+            await server.wait_callbacks()
+        await client.drain_callbacks()
+    finally:
+        await webhook.cleanup()
+        await client.close()
+        if server is not None:
+            await server.stop()
+
+    report: Dict[str, Any] = {
+        "config": asdict(config),
+        "arrivals": arrivals,
+        "operations": recorder.summary(),
+        "callback_statuses": dict(statuses),
+    }
+    if server is not None:
+        report["server"] = {
+            "requests": server.requests,
+            "injected_errors": server.injected_errors,
+            "callbacks_sent": server.callbacks_sent,
+            "callbacks_failed": server.callbacks_failed,
+        }
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    arrivals = report["arrivals"]
+    print(
+        f"\narrivals {arrivals['arrivals']} ({arrivals['arrival_rate']:.1f}/s), "
+        f"dropped {arrivals['dropped']}, unfinished {arrivals['unfinished']}, "
+        f"max lag {arrivals['max_lag_ms']:.1f} ms\n"
+    )
+    print(
+        f"{'operation':<24} {'count':>8} {'errors':>7} {'per sec':>9} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    )
+    for name, stats in report["operations"].items():
+        print(
+            f"{name:<24} {stats['count']:>8} {stats['errors']:>7} "
+            f"{stats['throughput']:>9.1f} {stats['p50_ms']:>9.2f} "
+            f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f}"
+        )
+        if stats["error_types"]:
+            print(f"{'':<24} {stats['error_types']}")
+
+    print(f"\ncallbacks by status: {report['callback_statuses']}")
+    if "server" in report:
+        print(f"fake server: {report['server']}")
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    if args.serve:
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
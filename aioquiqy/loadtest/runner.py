@@ -0,0 +1,240 @@
+import asyncio
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, List, Optional, Set, TypeVar
+
+from aiohttp import web
+
+from ..api import AioQuiqy
+from ..const import CryptoCurrencies, FiatCurrencies
+from ..models.payment import CallbackRequest, CreatePaymentRequest, DetailPaymentRequest
+
+T = TypeVar("T")
+
+FLOWS = ("create", "checkout", "full")
+
+
+@dataclass(frozen=True)
+class LoadConfig:
+    """
+    Load shape of a run.
+        :param rate: new checkouts per second (open loop, independent of latency)
+        :param duration: seconds to generate arrivals
+        :param flow: calls of one checkout:
+            create - create_payment,
+            checkout - create_payment, pre_calculate_payment, detail_payment,
+            full - checkout and get_payment
+        :param poisson: exponential inter-arrival times instead of a fixed step
+        :param max_in_flight: arrivals over this number of running checkouts
+            are dropped and counted
+        :param drain_timeout: seconds to wait for running checkouts after arrivals
+        :param seed: random seed for reproducible arrivals
+    """
+
+    rate: float = 50.0
+    duration: float = 30.0
+    flow: str = "checkout"
+    poisson: bool = True
+    max_in_flight: int = 10000
+    drain_timeout: float = 60.0
+    seed: Optional[int] = None
+
+
+class LatencyRecorder:
+    """Latency samples and errors per operation"""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Counter] = {}
+        self._finished: Dict[str, float] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        self.samples.setdefault(name, []).append(seconds)
+        self._finished[name] = time.perf_counter()
+
+    def error(self, name: str, exc: BaseException) -> None:
+        self.errors.setdefault(name, Counter())[type(exc).__name__] += 1
+        self._finished[name] = time.perf_counter()
+
+    async def timed(self, name: str, awaitable: Awaitable[T]) -> T:
+        started = time.perf_counter()
+        try:
+            result = await awaitable
+        except Exception as exc:
+            self.error(name, exc)
+            raise
+        self.record(name, time.perf_counter() - started)
+        return result
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Count, errors, throughput (per second) and latency percentiles (ms)."""
+        result = {}
+        for name in sorted(set(self.samples) | set(self.errors)):
+            samples = sorted(self.samples.get(name, ()))
+            errors = self.errors.get(name, Counter())
+            elapsed = self._finished[name] - self.started
+            result[name] = {
+                "count": len(samples),
+                "errors": sum(errors.values()),
+                "error_types": dict(errors),
+                "throughput": len(samples) / elapsed if elapsed > 0 else 0.0,
+                "p50_ms": percentile(samples, 0.50) * 1000,
+                "p95_ms": percentile(samples, 0.95) * 1000,
+                "p99_ms": percentile(samples, 0.99) * 1000,
+                "max_ms": (samples[-1] if samples else 0.0) * 1000,
+            }
+        return result
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, max(0, math.ceil(q * len(samples)) - 1))]
+
+
+async def start_webhook(
+    client: AioQuiqy, recorder: LatencyRecorder, host: str = "127.0.0.1", port: int = 0
+) -> web.AppRunner:
+    """
+    Serve `client.handle_callback` at /callback.
+        Records handling time as `callback` and, for callbacks of the fake
+        server, the time since sending as `callback_delivery`.
+    """
+
+    @web.middleware
+    async def timing(request: web.Request, handler: Any) -> web.StreamResponse:
+        sent_at = request.headers.get("X-Sent-At")
+        response = await recorder.timed("callback", handler(request))
+        if sent_at is not None:
+            recorder.record("callback_delivery", time.time() - float(sent_at))
+        return response  # type: ignore[no-any-return]
+
+    app = web.Application(middlewares=[timing])
+    app.router.add_post("/callback", client.handle_callback)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+async def run_load(
+    client: AioQuiqy,
+    config: LoadConfig,
+    callback_url: str,
+    recorder: LatencyRecorder,
+) -> Dict[str, Any]:
+    """
+    Start checkouts at the configured arrival rate through `client`.
+        Arrivals never wait for running checkouts, so a slow service
+        shows up as growing latency instead of a lower request rate.
+        :return: arrival statistics
+    """
+    if config.flow not in FLOWS:
+        raise ValueError(f"flow must be one of: {', '.join(FLOWS)}")
+
+    rng = random.Random(config.seed)
+    loop = asyncio.get_running_loop()
+    running: Set["asyncio.Task[None]"] = set()
+    started = dropped = 0
+    max_lag = 0.0
+
+    async def checkout(number: int, scheduled_at: float) -> None:
+        try:
+            await _checkout(client, config.flow, number, callback_url, rng, recorder)
+        except Exception:
+            return  # already counted by the recorder
+        # Includes waiting for the event loop, unlike the single calls
+        recorder.record("flow", loop.time() - scheduled_at)
+
+    begin = loop.time()
+    next_at = begin
+    end = begin + config.duration
+    while True:
+        next_at += rng.expovariate(config.rate) if config.poisson else 1 / config.rate
+        if next_at >= end:
+            break
+
+        delay = next_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            max_lag = max(max_lag, -delay)
+
+        if len(running) >= config.max_in_flight:
+            dropped += 1
+            continue
+        started += 1
+        task = asyncio.ensure_future(checkout(started, next_at))
+        running.add(task)
+        task.add_done_callback(running.discard)
+
+    arrivals_elapsed = loop.time() - begin
+    unfinished = 0
+    if running:
+        _, pending = await asyncio.wait(running, timeout=config.drain_timeout)
+        unfinished = len(pending)
+        for task in pending:
+            task.cancel()
+
+    return {
+        "arrivals": started,
+        "dropped": dropped,
+        "unfinished": unfinished,
+        "arrival_rate": started / arrivals_elapsed if arrivals_elapsed else 0.0,
+        "max_lag_ms": max_lag * 1000,
+    }
+
+
+async def _checkout(
+    client: AioQuiqy,
+    flow: str,
+    number: int,
+    callback_url: str,
+    rng: random.Random,
+    recorder: LatencyRecorder,
+) -> None:
+    payment = await recorder.timed(
+        "create_payment",
+        client.create_payment(
+            CreatePaymentRequest(
+                amount_fiat=round(rng.uniform(5, 500), 2),
+                callback_url=callback_url,
+                client_order_id=f"load-{number}-{rng.getrandbits(32):08x}",
+                fiat_currency_id=FiatCurrencies.USD,
+            )
+        ),
+    )
+    if flow == "create":
+        return
+
+    crypto_currency_id = rng.choice(CryptoCurrencies.payment_supported())
+    await recorder.timed(
+        "pre_calculate_payment",
+        client.pre_calculate_payment(payment.id, crypto_currency_id),
+    )
+    await recorder.timed(
+        "detail_payment",
+        client.detail_payment(
+            payment.id, DetailPaymentRequest(crypto_currency_id=crypto_currency_id)
+        ),
+    )
+    if flow == "full":
+        await recorder.timed(
+            "get_payment", client.get_payment(payment.id, use_cache=False)
+        )
+
+
+def count_callbacks(client: AioQuiqy, counter: Counter, delay: float = 0.0) -> None:
+    """Register a handler counting callbacks by status, `delay` simulates work."""
+
+    async def handler(callback: CallbackRequest, app: Any) -> None:
+        counter[str(callback.payment_status)] += 1
+        if delay:
+            await asyncio.sleep(delay)
+
+    client.register_callback_handler(handler)
@@ -0,0 +1,347 @@
+import asyncio
+import json
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set
+
+from aiohttp import ClientError, ClientSession, ClientTimeout, web
+
+from ..const import (
+    TERMINAL_STATUSES,
+    CryptoCurrencies,
+    FeeToggle,
+    PaymentStatus,
+    PaymentType,
+)
+from ..signature import SignatureConfig, SignatureVerifier
+
+logger = logging.getLogger(__name__)
+
+# Fake exchange rates, crypto units per one fiat unit
+RATES: Dict[int, float] = {
+    CryptoCurrencies.TRX: 8.0,
+    CryptoCurrencies.USDT_TRC20: 1.0,
+    CryptoCurrencies.ETH: 0.0003,
+    CryptoCurrencies.USDT_ERC20: 1.0,
+    CryptoCurrencies.BTC: 0.000015,
+}
+FEE_RATE = 0.01
+
+
+@dataclass(frozen=True)
+class FakeServerConfig:
+    """
+    Behaviour of the fake Quiqy API.
+        :param latency: mean response delay in seconds
+        :param jitter: uniform random part added to the delay in seconds
+        :param error_rate: share of requests answered with 500
+        :param throttle_rate: share of requests answered with 429
+        :param ttl: payment time to live in seconds,
+            detailing and pending payments expire after it
+        :param detect_after: seconds from detail to the transaction detection
+        :param confirm_after: seconds from detection to confirmation
+        :param abandon_rate: share of detailed payments never paid (undetected)
+        :param unconfirm_rate: share of detected payments failing confirmation
+        :param callback_url: send all callbacks here instead of payment callback_url
+        :param callback_attempts: deliveries of one callback until 200
+        :param callback_timeout: seconds to wait for a webhook answer
+        :param callback_signature: sign callbacks like Quiqy would (None - unsigned)
+        :param seed: random seed for reproducible runs
+    """
+
+    latency: float = 0.02
+    jitter: float = 0.01
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    ttl: int = 900
+    detect_after: float = 1.0
+    confirm_after: float = 1.0
+    abandon_rate: float = 0.1
+    unconfirm_rate: float = 0.01
+    callback_url: Optional[str] = None
+    callback_attempts: int = 3
+    callback_timeout: float = 10.0
+    callback_signature: Optional[SignatureConfig] = None
+    seed: Optional[int] = None
+
+
+class FakeQuiqyServer:
+    """
+    Local stand-in of the Quiqy API for load tests.
+        Payments follow the Quiqy status flow:
+        detailing -> pending -> detected -> confirmed,
+        detailing and pending expire into undetailed and undetected,
+        detected may end as unconfirmed.
+        Every status change is sent as a callback to the webhook.
+    """
+
+    def __init__(self, config: Optional[FakeServerConfig] = None) -> None:
+        self.config = config or FakeServerConfig()
+        self.payments: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+        self.injected_errors = 0
+        self.callbacks_sent = 0
+        self.callbacks_failed = 0
+        self._random = random.Random(self.config.seed)
+        signature = self.config.callback_signature
+        self._signer = SignatureVerifier(signature) if signature else None
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._deliveries: Set["asyncio.Task[None]"] = set()
+        self._session: Optional[ClientSession] = None
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._inject])
+        app.router.add_post("/payment", self.create_payment)
+        app.router.add_get("/payment/{payment_id}", self.get_payment)
+        app.router.add_get("/payment/{payment_id}/calculation", self.calculate)
+        app.router.add_post("/payment/{payment_id}/detail", self.detail_payment)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving, return the base URL."""
+        self._session = ClientSession(
+            timeout=ClientTimeout(total=self.config.callback_timeout)
+        )
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop status timers and callbacks in flight, then the server."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for delivery in self._deliveries:
+            delivery.cancel()
+        await asyncio.gather(*self._deliveries, return_exceptions=True)
+        if self._runner is not None:
+            await self._runner.cleanup()
+        if self._session is not None:
+            await self._session.close()
+
+    async def wait_callbacks(self) -> None:
+        """Wait for callbacks being delivered."""
+        while self._deliveries:
+            await asyncio.gather(*self._deliveries, return_exceptions=True)
+
+    @property
+    def open_payments(self) -> int:
+        return len(self._timers)
+
+    @web.middleware
+    async def _inject(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        self.requests += 1
+        config = self.config
+        delay = config.latency + self._random.random() * config.jitter
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if "Api-Key" not in request.headers:
+            return web.json_response({"msg": "Unauthorized"}, status=401)
+
+        chance = self._random.random()
+        if chance < config.throttle_rate:
+            self.injected_errors += 1
+            return web.json_response(
+                {"msg": "Too many requests"}, status=429, headers={"Retry-After": "1"}
+            )
+        if chance < config.throttle_rate + config.error_rate:
+            self.injected_errors += 1
+            return web.json_response({"msg": "Internal error"}, status=500)
+        return await handler(request)  # type: ignore[no-any-return]
+
+    async def create_payment(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        now = _now()
+        payment = {
+            "amount_crypto": None,
+            "amount_fiat": data["amount_fiat"],
+            "callback_url": data.get("callback_url"),
+            "client_order_id": data["client_order_id"],
+            "confirmed_manually": False,
+            "created_at": now,
+            "crypto_currency_id": None,
+            "fail_url": data.get("fail_url"),
+            "fee": None,
+            "fee_toggle": FeeToggle.PAYER,
+            "fiat_currency_id": data["fiat_currency_id"],
+            "from_address": None,
+            "id": str(uuid.uuid4()),
+            "payer_amount_crypto": None,
+            "status": PaymentStatus.DETAILING,
+            "success_url": data.get("success_url"),
+            "to_address": None,
+            "ttl": self.config.ttl,
+            "tx_hash": None,
+            "type": PaymentType.FORM,
+            "updated_at": now,
+        }
+        self.payments[payment["id"]] = payment
+        self._schedule(payment, self.config.ttl, PaymentStatus.UNDETAILED)
+        return web.json_response(payment)
+
+    async def get_payment(self, request: web.Request) -> web.Response:
+        payment = self.payments.get(request.match_info["payment_id"])
+        if payment is None:
+            return web.json_response({"msg": "Payment not found"}, status=404)
+        return web.json_response(
+            {"available_crypto_currency_ids": list(RATES), "payment": payment}
+        )
+
+    async def calculate(self, request: web.Request) -> web.Response:
+        payment = self.payments.get(request.match_info["payment_id"])
+        if payment is None:
+            return web.json_response({"msg": "Payment not found"}, status=404)
+        crypto_currency_id = int(request.query.get("to_crypto_currency_id", 0))
+        if crypto_currency_id not in RATES:
+            return web.json_response({"msg": "Unsupported currency"}, status=400)
+        return web.json_response(self._quote(payment, crypto_currency_id))
+
+    async def detail_payment(self, request: web.Request) -> web.Response:
+        payment = self.payments.get(request.match_info["payment_id"])
+        if payment is None:
+            return web.json_response({"msg": "Payment not found"}, status=404)
+        if payment["status"] != PaymentStatus.DETAILING:
+            return web.json_response(
+                {"msg": "Payment is not in detailing status"}, status=400
+            )
+
+        crypto_currency_id = (await request.json())["crypto_currency_id"]
+        if crypto_currency_id not in RATES:
+            return web.json_response({"msg": "Unsupported currency"}, status=400)
+
+        quote = self._quote(payment, crypto_currency_id)
+        payment.update(
+            amount_crypto=quote["amount_crypto"],
+            crypto_currency_id=crypto_currency_id,
+            fee=quote["fee"],
+            payer_amount_crypto=quote["payer_amount_crypto"],
+            to_address="T" + uuid.uuid4().hex[:33],
+        )
+        self._change_status(payment, PaymentStatus.PENDING)
+
+        if self._random.random() < self.config.abandon_rate:
+            self._schedule(payment, self._time_left(payment), PaymentStatus.UNDETECTED)
+        else:
+            self._schedule(payment, self.config.detect_after, PaymentStatus.DETECTED)
+        return web.json_response(
+            {"available_crypto_currency_ids": list(RATES), "payment": payment}
+        )
+
+    def _quote(
+        self, payment: Dict[str, Any], crypto_currency_id: int
+    ) -> Dict[str, Any]:
+        amount = round(payment["amount_fiat"] * RATES[crypto_currency_id], 8)
+        fee = round(amount * FEE_RATE, 8)
+        return {
+            "amount_crypto": amount,
+            "crypto_currency_id": crypto_currency_id,
+            "fee": fee,
+            "fee_toggle": payment["fee_toggle"],
+            "payer_amount_crypto": round(amount + fee, 8),
+        }
+
+    def _advance(self, payment_id: str, status: PaymentStatus) -> None:
+        self._timers.pop(payment_id, None)
+        payment = self.payments[payment_id]
+        if status == PaymentStatus.DETECTED:
+            payment.update(
+                from_address="T" + uuid.uuid4().hex[:33], tx_hash=uuid.uuid4().hex
+            )
+        self._change_status(payment, status)
+
+        if status == PaymentStatus.DETECTED:
+            final = PaymentStatus.CONFIRMED
+            if self._random.random() < self.config.unconfirm_rate:
+                final = PaymentStatus.UNCONFIRMED
+            self._schedule(payment, self.config.confirm_after, final)
+
+    def _change_status(self, payment: Dict[str, Any], status: PaymentStatus) -> None:
+        payment["status"] = status
+        payment["updated_at"] = _now()
+        url = self.config.callback_url or payment["callback_url"]
+        if url:
+            delivery = asyncio.ensure_future(self._send_callback(url, payment))
+            self._deliveries.add(delivery)
+            delivery.add_done_callback(self._deliveries.discard)
+
+    def _schedule(
+        self, payment: Dict[str, Any], delay: float, status: PaymentStatus
+    ) -> None:
+        timer = self._timers.pop(payment["id"], None)
+        if timer is not None:
+            timer.cancel()
+        if payment["status"] in TERMINAL_STATUSES:
+            return
+        self._timers[payment["id"]] = asyncio.get_running_loop().call_later(
+            max(0.0, delay), self._advance, payment["id"], status
+        )
+
+    def _time_left(self, payment: Dict[str, Any]) -> float:
+        created_at = datetime.fromisoformat(payment["created_at"])
+        expires_at = created_at + timedelta(seconds=payment["ttl"])
+        return (expires_at - datetime.now(timezone.utc)).total_seconds()
+
+    async def _send_callback(self, url: str, payment: Dict[str, Any]) -> None:
+        assert self._session is not None
+        body = json.dumps(_callback_body(payment)).encode()
+        headers = {"Content-Type": "application/json"}
+        if self._signer is not None:
+            headers[self._signer.header] = self._signer.sign(body)
+        for attempt in range(self.config.callback_attempts):
+            if attempt:
+                await asyncio.sleep(2**attempt * 0.1)
+            try:
+                async with self._session.post(
+                    url, data=body, headers={**headers, "X-Sent-At": repr(time.time())}
+                ) as response:
+                    await response.read()
+                if response.status == 200:
+                    self.callbacks_sent += 1
+                    return
+            except (ClientError, asyncio.TimeoutError) as exc:
+                logger.debug("Callback to %s failed: %r", url, exc)
+        self.callbacks_failed += 1
+
+
+def _callback_body(payment: Dict[str, Any]) -> Dict[str, Any]:
+    created_at = datetime.fromisoformat(payment["created_at"])
+    expires_at = created_at + timedelta(seconds=payment["ttl"])
+    amount_crypto = payment["amount_crypto"]
+    fee = payment["fee"]
+    fee_fiat = None
+    if fee is not None and amount_crypto:
+        fee_fiat = round(payment["amount_fiat"] * fee / amount_crypto, 2)
+    return {
+        "amount_crypto": amount_crypto,
+        "amount_fiat": payment["amount_fiat"],
+        "client_order_id": payment["client_order_id"],
+        "crypto_currency_id": payment["crypto_currency_id"],
+        "fee_crypto": fee,
+        "fee_fiat": fee_fiat,
+        "fee_side": payment["fee_toggle"],
+        "fiat_currency_id": payment["fiat_currency_id"],
+        "from_address": payment["from_address"],
+        "payer_amount_crypto": payment["payer_amount_crypto"],
+        "payment_created_at": payment["created_at"],
+        "payment_status": payment["status"],
+        "payment_status_updated_at": payment["updated_at"],
+        "planned_expiration_at": expires_at.isoformat(),
+        "to_address": payment["to_address"],
+        "tx_hash": payment["tx_hash"],
+    }
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
@@ -0,0 +1,267 @@
+import copy
+import time
+from bisect import bisect_left
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from aiohttp import BaseConnector, ClientSession, TraceConfig
+
+Labels = Tuple[Tuple[str, str], ...]
+MetricSink = Callable[[str, Dict[str, str], float], None]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+DESCRIPTIONS: Dict[str, str] = {
+    "aioquiqy_request_duration_seconds": "Quiqy API request attempt latency",
+    "aioquiqy_requests_in_flight": "Quiqy API requests in flight",
+    "aioquiqy_request_retries_total": "Quiqy API request retries",
+    "aioquiqy_request_hedges_total": "Hedged requests of slow Quiqy API reads",
+    "aioquiqy_dns_duration_seconds": "DNS resolution time",
+    "aioquiqy_connect_duration_seconds": "New connection time, TCP and TLS",
+    "aioquiqy_connection_queued_seconds": "Time waiting for a free pool slot",
+    "aioquiqy_pool_connections": "Connections of the pool by state",
+    "aioquiqy_pool_limit": "Connection pool limit",
+    "aioquiqy_callbacks_total": "Received callbacks by status and result",
+    "aioquiqy_callbacks_invalid_total": "Rejected callbacks by reason",
+    "aioquiqy_callback_handler_duration_seconds": "Callback handler run time",
+}
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # the last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Bucket upper bounds with cumulative counts, Prometheus style."""
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((_format_value(bound), total))
+        result.append(("+Inf", self.count))
+        return result
+
+
+class Metrics:
+    """
+    In-process metrics of the client.
+        Counters, gauges and histograms are keyed by name and labels.
+        `render_prometheus` exports them in Prometheus text format,
+        sinks receive every recorded value for custom exporters.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        :param buckets: histogram bucket upper bounds in seconds
+        """
+        self.buckets = tuple(buckets)
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.gauges: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._sinks: List[MetricSink] = []
+        self._collectors: Dict[str, Callable[["Metrics"], None]] = {}
+        # added to the labels of every recorded value, see `with_labels`
+        self.const_labels: Dict[str, str] = {}
+
+    def with_labels(self, **labels: str) -> "Metrics":
+        """
+        View recording into the same series, sinks and collectors
+            with constant labels added, e.g. `with_labels(tenant="shop-1")`.
+        """
+        view = copy.copy(self)
+        view.const_labels = {**self.const_labels, **labels}
+        return view
+
+    def add_sink(self, sink: MetricSink) -> None:
+        """Call `sink(name, labels, value)` for every recorded value."""
+        self._sinks.append(sink)
+
+    def add_collector(self, name: str, collector: Callable[["Metrics"], None]) -> None:
+        """
+        Call `collector(metrics)` before every export to refresh gauges.
+            A collector added under the same name replaces the previous one.
+        """
+        self._collectors[name] = collector
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        if self.const_labels:
+            labels = {**self.const_labels, **labels}
+        key = _labels(labels)
+        series = self.counters.setdefault(name, {})
+        series[key] = series.get(key, 0.0) + value
+        self._emit(name, labels, value)
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        if self.const_labels:
+            labels = {**self.const_labels, **labels}
+        self.gauges.setdefault(name, {})[_labels(labels)] = value
+        self._emit(name, labels, value)
+
+    def add_gauge(self, name: str, value: float, **labels: str) -> None:
+        if self.const_labels:
+            labels = {**self.const_labels, **labels}
+        key = _labels(labels)
+        series = self.gauges.setdefault(name, {})
+        series[key] = series.get(key, 0.0) + value
+        self._emit(name, labels, series[key])
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        if self.const_labels:
+            labels = {**self.const_labels, **labels}
+        key = _labels(labels)
+        series = self.histograms.setdefault(name, {})
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(self.buckets)
+        histogram.observe(value)
+        self._emit(name, labels, value)
+
+    def collect(self) -> None:
+        for collector in list(self._collectors.values()):
+            collector(self)
+
+    def render_prometheus(self) -> str:
+        """Export all metrics in Prometheus text format (version 0.0.4)."""
+        self.collect()
+        lines: List[str] = []
+
+        for kind, metrics in (("counter", self.counters), ("gauge", self.gauges)):
+            for name, series in sorted(metrics.items()):
+                _header(lines, name, kind)
+                for key, value in sorted(series.items()):
+                    rendered = _render_labels(key)
+                    lines.append(f"{name}{rendered} {_format_value(value)}")
+
+        for name, histograms in sorted(self.histograms.items()):
+            _header(lines, name, "histogram")
+            for key, histogram in sorted(histograms.items()):
+                for bound, count in histogram.cumulative():
+                    bucket_labels = _render_labels(key + (("le", bound),))
+                    lines.append(f"{name}_bucket{bucket_labels} {count}")
+                rendered = _render_labels(key)
+                lines.append(f"{name}_sum{rendered} {_format_value(histogram.sum)}")
+                lines.append(f"{name}_count{rendered} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def trace_config(self) -> TraceConfig:
+        """
+        aiohttp tracing of DNS, connection (TCP and TLS) and pool queue timings.
+            aiohttp doesn't separate the TLS handshake from the TCP connect,
+            both are in `aioquiqy_connect_duration_seconds`.
+        """
+        trace = TraceConfig()
+
+        def timer(started: str, metric: str) -> Tuple[Any, Any]:
+            async def on_start(
+                session: ClientSession, ctx: SimpleNamespace, params: Any
+            ) -> None:
+                setattr(ctx, started, time.perf_counter())
+
+            async def on_end(
+                session: ClientSession, ctx: SimpleNamespace, params: Any
+            ) -> None:
+                start = getattr(ctx, started, None)
+                if start is not None:
+                    self.observe(metric, time.perf_counter() - start)
+
+            return on_start, on_end
+
+        dns_start, dns_end = timer("dns_started", "aioquiqy_dns_duration_seconds")
+        trace.on_dns_resolvehost_start.append(dns_start)
+        trace.on_dns_resolvehost_end.append(dns_end)
+
+        conn_start, conn_end = timer(
+            "connect_started", "aioquiqy_connect_duration_seconds"
+        )
+        trace.on_connection_create_start.append(conn_start)
+        trace.on_connection_create_end.append(conn_end)
+
+        queue_start, queue_end = timer(
+            "queued_started", "aioquiqy_connection_queued_seconds"
+        )
+        trace.on_connection_queued_start.append(queue_start)
+        trace.on_connection_queued_end.append(queue_end)
+        return trace
+
+    def watch_connector(self, connector: BaseConnector, pool: str = "default") -> None:
+        """
+        Export connection pool usage of the connector on every collect.
+            Pool counters are read from aiohttp connector internals.
+        """
+
+        def collect(metrics: "Metrics") -> None:
+            if connector.closed:
+                return
+            acquired = len(getattr(connector, "_acquired", ()))
+            conns = getattr(connector, "_conns", {})
+            idle = sum(len(pool_conns) for pool_conns in conns.values())
+            metrics.set_gauge(
+                "aioquiqy_pool_connections", acquired, pool=pool, state="acquired"
+            )
+            metrics.set_gauge(
+                "aioquiqy_pool_connections", idle, pool=pool, state="idle"
+            )
+            metrics.set_gauge("aioquiqy_pool_limit", connector.limit, pool=pool)
+
+        self.add_collector(f"pool:{pool}", collect)
+
+    def _emit(self, name: str, labels: Dict[str, str], value: float) -> None:
+        for sink in self._sinks:
+            sink(name, labels, value)
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _render_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    rendered = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return f"{{{rendered}}}" if rendered else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def _header(lines: List[str], name: str, kind: str) -> None:
+    description = DESCRIPTIONS.get(name)
+    if description:
+        lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def handler_name(handler: Callable[..., Any]) -> str:
+    """Label of a callback handler."""
+    module = getattr(handler, "__module__", None) or ""
+    name = getattr(handler, "__qualname__", None) or repr(handler)
+    return f"{module}.{name}" if module else name
+
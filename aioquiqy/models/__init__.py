@@ -1,15 +1,33 @@
-from .payment import (
-    CreatePaymentRequest,
-    CreatePaymentResponse,
-    GetPaymentResponse,
-    DetailPaymentRequest,
-    DetailPaymentResponse,
-    PreCalculatePaymentResponse,
-    PaymentResponse,
-    CallbackRequest,
-    CallbackResponse,
-)
-from .error import HTTPError
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from .payment import (
+        CreatePaymentRequest,
+        CreatePaymentResponse,
+        GetPaymentResponse,
+        DetailPaymentRequest,
+        DetailPaymentResponse,
+        PreCalculatePaymentResponse,
+        PaymentResponse,
+        CallbackRequest,
+        CallbackResponse,
+    )
+    from .error import HTTPError
+
+# Model name -> module, imported on first attribute access
+_LAZY: Dict[str, str] = {
+    "CreatePaymentRequest": ".payment",
+    "CreatePaymentResponse": ".payment",
+    "GetPaymentResponse": ".payment",
+    "DetailPaymentRequest": ".payment",
+    "DetailPaymentResponse": ".payment",
+    "PreCalculatePaymentResponse": ".payment",
+    "PaymentResponse": ".payment",
+    "CallbackRequest": ".payment",
+    "CallbackResponse": ".payment",
+    "HTTPError": ".error",
+}
 
 __all__ = [
     "CreatePaymentRequest",
@@ -23,3 +41,13 @@ __all__ = [
     "CallbackResponse",
     "HTTPError",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,9 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
 
 class HTTPError(BaseModel):
     """HTTP error response model"""
-    
+
+    model_config = ConfigDict(defer_build=True)
+
     hint: Optional[str] = Field(None, description="Optional hint for error handling")
     msg: str = Field(..., description="Error message")
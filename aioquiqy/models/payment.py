@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from ..const import (
     FiatCurrencies,
@@ -9,6 +9,10 @@ from ..const import (
     CryptoCurrencies,
 )
 
+# Models of webhooks and rarely used endpoints build their validators on first use,
+# outbound-only processes never pay for them
+DEFERRED = ConfigDict(defer_build=True)
+
 
 class CreatePaymentRequest(BaseModel):
     """Request model for creating a payment"""
@@ -104,6 +108,8 @@ class GetPaymentResponse(BaseModel):
 class DetailPaymentRequest(BaseModel):
     """Request model for detailing a payment"""
 
+    model_config = DEFERRED
+
     crypto_currency_id: int = Field(
         ..., description="Crypto currency ID to use for payment"
     )
@@ -121,6 +127,8 @@ class DetailPaymentRequest(BaseModel):
 class DetailPaymentResponse(BaseModel):
     """Response model for detailing a payment"""
 
+    model_config = DEFERRED
+
     available_crypto_currency_ids: List[int] = Field(
         ..., description="Available crypto currency IDs"
     )
@@ -130,6 +138,8 @@ class DetailPaymentResponse(BaseModel):
 class PreCalculatePaymentResponse(BaseModel):
     """Response model for payment pre-calculation"""
 
+    model_config = DEFERRED
+
     amount_crypto: float = Field(..., description="Amount in crypto currency")
     crypto_currency_id: int = Field(..., description="Crypto currency ID")
     fee: float = Field(..., description="Fee amount")
@@ -149,6 +159,8 @@ class PreCalculatePaymentResponse(BaseModel):
 class CallbackRequest(BaseModel):
     """Callback request model - matches SendCallbacksRequestBody from API spec"""
 
+    model_config = DEFERRED
+
     amount_crypto: Optional[float] = Field(
         None, description="Amount in crypto currency"
     )
@@ -192,9 +204,31 @@ class CallbackRequest(BaseModel):
             raise ValueError(f"crypto_currency_id must be one of: {supported}")
         return v
 
+    @classmethod
+    def from_payment(cls, payment: PaymentResponse) -> "CallbackRequest":
+        """Build callback from polled payment, as Quiqy would send it"""
+        return cls(
+            amount_crypto=payment.amount_crypto,
+            amount_fiat=payment.amount_fiat,
+            client_order_id=payment.client_order_id,
+            crypto_currency_id=payment.crypto_currency_id,
+            fee_crypto=payment.fee,
+            fee_side=payment.fee_toggle,
+            fiat_currency_id=payment.fiat_currency_id,
+            from_address=payment.from_address,
+            payer_amount_crypto=payment.payer_amount_crypto,
+            payment_created_at=payment.created_at,
+            payment_status=payment.status,
+            payment_status_updated_at=payment.updated_at,
+            planned_expiration_at=payment.created_at + timedelta(seconds=payment.ttl),
+            to_address=payment.to_address,
+            tx_hash=payment.tx_hash,
+        )
+
 
 class CallbackResponse(BaseModel):
     """Callback response model - can contain any JSON fields"""
 
     class Config:
         extra = "allow"
+        defer_build = True
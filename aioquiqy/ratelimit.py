@@ -0,0 +1,208 @@
+import asyncio
+import heapq
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Awaitable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .const import Endpoints
+
+
+class Priority(IntEnum):
+    """Request priority, lower value is served first"""
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
+_priority: ContextVar[Priority] = ContextVar(
+    "aioquiqy_priority", default=Priority.INTERACTIVE
+)
+
+
+def get_priority() -> Priority:
+    """Priority of requests made in the current context."""
+    return _priority.get()
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """
+    Make requests inside the block with the given priority.
+        with request_priority(Priority.BULK):
+            await client.get_payment(payment_id)
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+async def with_priority(priority: Priority, awaitable: Awaitable[Any]) -> Any:
+    """Await with the given request priority."""
+    with request_priority(priority):
+        return await awaitable
+
+
+class TokenBucket:
+    """
+    Token bucket with prioritized waiters.
+        Tokens are added at `rate` per second up to `capacity`.
+        Waiting requests are served by priority, then in arrival order.
+        429 answers halve the rate (down to `min_rate`) and pause the bucket,
+        every later success restores a part of the configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        min_rate: Optional[float] = None,
+    ) -> None:
+        """
+        :param rate: tokens per second
+        :param capacity: burst size (default: one second of tokens, at least 1)
+        :param min_rate: lowest rate after 429 slowdowns (default: rate / 10)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.min_rate = min_rate or rate / 10
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._seq = 0
+        self._waiters: List[Tuple[int, int, "asyncio.Future[None]"]] = []
+        self._pump: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for *_, waiter in self._waiters if not waiter.done())
+
+    async def acquire(self, priority: Optional[Priority] = None) -> None:
+        """Take one token, wait for it if needed."""
+        if priority is None:
+            priority = get_priority()
+
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        heapq.heappush(self._waiters, (priority, self._seq, waiter))
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.ensure_future(self._serve())
+        await waiter
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        """Slow down after 429, pause for `retry_after` seconds if known."""
+        self._refill()
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = min(self._tokens, 0.0)
+        if retry_after:
+            self._paused_until = max(
+                self._paused_until, time.monotonic() + retry_after
+            )
+
+    def on_success(self) -> None:
+        """Restore the rate step by step after slowdowns."""
+        if self.rate < self.base_rate:
+            self._refill()
+            self.rate = min(self.base_rate, self.rate + self.base_rate / 20)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if now < self._paused_until:
+            self._updated_at = now
+            return
+
+        start = max(self._updated_at, self._paused_until)
+        self._tokens = min(self.capacity, self._tokens + (now - start) * self.rate)
+        self._updated_at = now
+
+    async def _serve(self) -> None:
+        while self._waiters:
+            self._refill()
+            while self._waiters and self._tokens >= 1:
+                *_, waiter = heapq.heappop(self._waiters)
+                if waiter.done():  # cancelled
+                    continue
+                self._tokens -= 1
+                waiter.set_result(None)
+
+            if not self._waiters:
+                return
+
+            delay = (1 - self._tokens) / self.rate
+            delay += max(0.0, self._paused_until - time.monotonic())
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """
+    Per-endpoint token buckets.
+        Share one instance between several clients
+        to keep all of them within one quota.
+    """
+
+    def __init__(
+        self,
+        rates: Mapping[str, float],
+        burst: Optional[Mapping[str, float]] = None,
+        default_rate: Optional[float] = None,
+    ) -> None:
+        """
+        :param rates: requests per second per endpoint (see const.Endpoints)
+        :param burst: bucket capacity per endpoint (default: one second of rate)
+        :param default_rate: rate for endpoints missing in `rates` (None - unlimited)
+        """
+        self.rates = dict(rates)
+        self.burst = dict(burst or {})
+        self.default_rate = default_rate
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+
+    @classmethod
+    def uniform(cls, rate: float) -> "RateLimiter":
+        """Same rate for every endpoint."""
+        return cls({endpoint: rate for endpoint in Endpoints})
+
+    def copy(self) -> "RateLimiter":
+        """Limiter with the same rates and fresh buckets, e.g. for another key."""
+        return type(self)(self.rates, self.burst, self.default_rate)
+
+    def get_bucket(self, endpoint: str) -> Optional[TokenBucket]:
+        """Get bucket of the endpoint (None if unlimited)."""
+        if endpoint in self._buckets:
+            return self._buckets[endpoint]
+
+        rate = self.rates.get(endpoint, self.default_rate)
+        bucket = None if rate is None else TokenBucket(rate, self.burst.get(endpoint))
+        self._buckets[endpoint] = bucket
+        return bucket
+
+    async def acquire(self, endpoint: str, priority: Optional[Priority] = None) -> None:
+        bucket = self.get_bucket(endpoint)
+        if bucket is not None:
+            await bucket.acquire(priority)
+
+    def on_throttled(self, endpoint: str, retry_after: Optional[float] = None) -> None:
+        bucket = self.get_bucket(endpoint)
+        if bucket is not None:
+            bucket.on_throttled(retry_after)
+
+    def on_success(self, endpoint: str) -> None:
+        bucket = self.get_bucket(endpoint)
+        if bucket is not None:
+            bucket.on_success()
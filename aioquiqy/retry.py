@@ -0,0 +1,147 @@
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+from strenum import StrEnum
+
+from .exceptions import CircuitOpenError
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry settings of the client.
+        Safe (GET) requests are retried by default,
+        POST requests only with `retry_unsafe=True`,
+        because a repeated POST may create a second payment.
+        :param max_attempts: attempts per call including the first one
+        :param backoff_base: delay before the first retry in seconds
+        :param backoff_max: upper bound of a single delay in seconds
+        :param jitter: randomize delays ("full jitter") to spread retries
+        :param retry_statuses: HTTP statuses worth retrying
+        :param retry_unsafe: retry non-idempotent requests too
+        :param respect_retry_after: wait as long as `Retry-After` header says
+        :param max_retry_after: upper bound of `Retry-After` delay in seconds
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.2
+    backoff_max: float = 10.0
+    jitter: bool = True
+    retry_statuses: FrozenSet[int] = frozenset({429, 502, 503, 504})
+    retry_unsafe: bool = False
+    respect_retry_after: bool = True
+    max_retry_after: float = 60.0
+
+    def can_retry(self, attempt: int, idempotent: bool) -> bool:
+        """Whether another attempt is allowed after `attempt` attempts."""
+        if attempt >= self.max_attempts:
+            return False
+        return idempotent or self.retry_unsafe
+
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Get delay before the next attempt.
+            :param attempt: number of attempts already made
+            :param retry_after: raw `Retry-After` header value (if any)
+        """
+        if self.respect_retry_after and retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return min(delay, self.max_retry_after)
+
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Parse `Retry-After` header, either delay-seconds or HTTP-date."""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass(frozen=True)
+class CircuitBreakerPolicy:
+    """
+    Circuit breaker settings, applied to every endpoint separately.
+        :param failure_threshold: consecutive failures to open the circuit
+        :param recovery_timeout: seconds to fail fast before a trial call
+    """
+
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+
+
+class CircuitState(StrEnum):
+    """Circuit breaker state"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one endpoint.
+        Closed - calls pass through, failures are counted.
+        Open - calls fail fast with CircuitOpenError.
+        Half open - a single trial call decides whether to close or reopen.
+    """
+
+    def __init__(self, endpoint: str, policy: CircuitBreakerPolicy) -> None:
+        self.endpoint = endpoint
+        self.policy = policy
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the call must fail fast."""
+        if self.state == CircuitState.CLOSED:
+            return
+
+        remaining = self._opened_at + self.policy.recovery_timeout - time.monotonic()
+        if self.state == CircuitState.OPEN and remaining <= 0:
+            self.state = CircuitState.HALF_OPEN
+
+        if self.state == CircuitState.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+
+        raise CircuitOpenError(self.endpoint, max(0.0, remaining))
+
+    def release(self) -> None:
+        """Forget the trial call without an outcome (e.g. it was cancelled)."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self._failures >= self.policy.failure_threshold
+        ):
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
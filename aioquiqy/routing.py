@@ -0,0 +1,95 @@
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .const import PaymentStatus
+from .dispatch import CallbackHandler
+from .models.payment import CallbackRequest
+
+CallbackPredicate = Callable[[CallbackRequest], bool]
+
+
+class Route(NamedTuple):
+    """Handler with its callback filters (None - any)"""
+
+    handler: CallbackHandler
+    statuses: Optional[FrozenSet[str]] = None
+    crypto_currencies: Optional[FrozenSet[Optional[int]]] = None
+    predicate: Optional[CallbackPredicate] = None
+
+    def accepts(self, status: str, crypto_currency_id: Optional[int]) -> bool:
+        if self.statuses is not None and status not in self.statuses:
+            return False
+        if (
+            self.crypto_currencies is not None
+            and crypto_currency_id not in self.crypto_currencies
+        ):
+            return False
+        return True
+
+
+class HandlerRouter:
+    """
+    Routes callbacks to handlers registered for their status and currency.
+        Routes are indexed by (payment_status, crypto_currency_id),
+        so a callback only touches handlers that may match it.
+        Predicates are checked per callback. Registration order is kept.
+    """
+
+    def __init__(self) -> None:
+        self._routes: List[Route] = []
+        self._index: Dict[Tuple[str, Optional[int]], Tuple[Route, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    @property
+    def handlers(self) -> List[CallbackHandler]:
+        return [route.handler for route in self._routes]
+
+    def add(
+        self,
+        handler: CallbackHandler,
+        statuses: Optional[Iterable[Union[str, PaymentStatus]]] = None,
+        crypto_currencies: Optional[Iterable[Optional[int]]] = None,
+        predicate: Optional[CallbackPredicate] = None,
+    ) -> None:
+        """
+        Register handler.
+            :param handler: coroutine function receiving callback and app
+            :param statuses: payment statuses to handle (None - any)
+            :param crypto_currencies: crypto currency IDs to handle (None - any)
+            :param predicate: extra filter called with the callback
+        """
+        route = Route(
+            handler,
+            statuses=None if statuses is None else frozenset(statuses),
+            crypto_currencies=(
+                None if crypto_currencies is None else frozenset(crypto_currencies)
+            ),
+            predicate=predicate,
+        )
+        self._routes.append(route)
+        self._index.clear()
+
+    def match(self, callback: CallbackRequest) -> List[CallbackHandler]:
+        """Get handlers for the callback in registration order."""
+        key = (callback.payment_status, callback.crypto_currency_id)
+        routes = self._index.get(key)
+        if routes is None:
+            routes = tuple(route for route in self._routes if route.accepts(*key))
+            self._index[key] = routes
+
+        return [
+            route.handler
+            for route in routes
+            if route.predicate is None or route.predicate(callback)
+        ]
@@ -0,0 +1,40 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls.
+        While a call for a key is in flight, other callers with the same key
+        wait for its result instead of starting their own call.
+        All of them get the same result object (or the same exception).
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `func()` or join the call already in flight for `key`.
+            Cancelling one caller doesn't cancel the shared call.
+            Calls are only shared within one event loop.
+        """
+        call = self._calls.get(key)
+        if call is not None and call.get_loop() is not asyncio.get_running_loop():
+            # In flight on another loop (thread), its future can't be awaited here
+            return await func()
+        if call is None:
+            call = asyncio.ensure_future(func())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(call)
+
+    def _forget(self, key: Hashable, call: "asyncio.Future[Any]") -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Nobody may be awaiting anymore, don't let asyncio log the error
+        if not call.cancelled():
+            call.exception()
@@ -0,0 +1,264 @@
+import asyncio
+import atexit
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Coroutine, Iterable, List, Optional, TypeVar, Union
+
+from .api import AioQuiqy
+from .bulk import BulkResult
+from .const import Networks
+from .models.payment import (
+    CreatePaymentRequest,
+    CreatePaymentResponse,
+    DetailPaymentRequest,
+    DetailPaymentResponse,
+    GetPaymentResponse,
+    PreCalculatePaymentResponse,
+)
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """
+    Event loop running forever in a daemon thread.
+        Started on first use and stopped at interpreter exit.
+        Coroutines submitted from any thread run on this one loop,
+        so sessions and connection pools are shared between callers.
+    """
+
+    def __init__(self, name: str = "aioquiqy-loop") -> None:
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._clients: "weakref.WeakSet[AioQuiqy]" = weakref.WeakSet()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Running loop, started on first access."""
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            return loop
+
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                started = threading.Event()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._loop, started), name=self.name
+                )
+                self._thread.daemon = True
+                self._thread.start()
+                started.wait()
+                atexit.register(self.stop)
+            return self._loop
+
+    def track(self, client: AioQuiqy) -> None:
+        """Close the client on `stop`, unless it is garbage collected earlier."""
+        self._clients.add(client)
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        """Schedule coroutine on the loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Run coroutine on the loop and block until it is done.
+            :param timeout: seconds to wait, the coroutine is cancelled after it
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("BackgroundLoop.run() called from its own loop")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # TimeoutError or KeyboardInterrupt in the caller thread
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Close tracked clients, cancel pending tasks, stop the loop."""
+        clients = list(self._clients)
+        self._clients.clear()
+        if clients and self._loop is not None and self._loop.is_running():
+
+            async def close_clients() -> None:
+                await asyncio.gather(
+                    *(client.close() for client in clients), return_exceptions=True
+                )
+
+            try:
+                self.run(close_clients(), timeout)
+            except Exception:
+                pass
+
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None or loop.is_closed():
+            return
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        atexit.unregister(self.stop)
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+
+_shared_loop = BackgroundLoop()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Process-wide loop used by SyncQuiqy by default."""
+    return _shared_loop
+
+
+class SyncQuiqy:
+    """
+    Blocking Quiqy API client for synchronous code (WSGI apps, Celery tasks).
+        Requests run on a shared background event loop,
+        so every thread reuses one session and its pooled connections.
+        Safe to use from many threads at once.
+    """
+
+    # Seconds a caller blocks past the deadline of a call,
+    # so the deadline error comes from the client, not from the blocking wait
+    DEADLINE_GRACE = 1.0
+
+    def __init__(
+        self,
+        api_key: str,
+        network: Union[str, Networks] = Networks.MAIN_NET,
+        timeout: Optional[float] = None,
+        background: Optional[BackgroundLoop] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param api_key: Your API key from Quiqy settings
+        :param network: Network address (default: main net)
+        :param timeout: deadline of every call in seconds, retries included,
+            passed to AioQuiqy as its `timeout` (None - transport timeouts only)
+        :param background: loop running the requests (default: process-wide one)
+        :param kwargs: other AioQuiqy options (transport, retry, payment_cache...)
+        """
+        self.timeout = timeout
+        self._background = background or get_background_loop()
+        self.client = AioQuiqy(api_key, network, timeout=timeout, **kwargs)
+        self._background.track(self.client)
+
+    def _run(
+        self,
+        coro: Coroutine[Any, Any, T],
+        timeout: Optional[float] = None,
+        per_call: bool = True,
+    ) -> T:
+        """
+        Block until the coroutine is done.
+            :param timeout: deadline of the call (default: client timeout),
+                the coroutine is cancelled `DEADLINE_GRACE` seconds after it
+            :param per_call: False for bulk runs and `close`, they block
+                with no timeout, every call in them has its own deadline
+        """
+        if not per_call:
+            return self._background.run(coro)
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is not None:
+            timeout += self.DEADLINE_GRACE
+        return self._background.run(coro, timeout)
+
+    def create_payment(
+        self, payment_data: CreatePaymentRequest, timeout: Optional[float] = None
+    ) -> CreatePaymentResponse:
+        """Create payment in detailing state."""
+        return self._run(self.client.create_payment(payment_data, timeout), timeout)
+
+    def get_payment(
+        self,
+        payment_id: str,
+        use_cache: bool = True,
+        timeout: Optional[float] = None,
+    ) -> GetPaymentResponse:
+        """Get full information about a certain payment."""
+        return self._run(
+            self.client.get_payment(payment_id, use_cache, timeout), timeout
+        )
+
+    def get_payments(
+        self, payment_ids: Iterable[str], concurrency: int = 10
+    ) -> List[BulkResult]:
+        """Get many payments concurrently, results keep the order of `payment_ids`."""
+
+        async def collect() -> List[BulkResult]:
+            return [
+                item
+                async for item in self.client.get_payments(
+                    payment_ids, concurrency=concurrency, ordered=True
+                )
+            ]
+
+        return self._run(collect(), per_call=False)
+
+    def create_payments(
+        self, payments: Iterable[CreatePaymentRequest], concurrency: int = 10
+    ) -> List[BulkResult]:
+        """Create many payments concurrently, deduplicated by `client_order_id`."""
+
+        async def collect() -> List[BulkResult]:
+            return [
+                item
+                async for item in self.client.create_payments(
+                    payments, concurrency=concurrency
+                )
+            ]
+
+        return self._run(collect(), per_call=False)
+
+    def pre_calculate_payment(
+        self,
+        payment_id: str,
+        crypto_currency_id: int,
+        timeout: Optional[float] = None,
+    ) -> PreCalculatePaymentResponse:
+        """Calculate payer amount in the selected crypto currency."""
+        return self._run(
+            self.client.pre_calculate_payment(payment_id, crypto_currency_id, timeout),
+            timeout,
+        )
+
+    def detail_payment(
+        self,
+        payment_id: str,
+        detail_data: DetailPaymentRequest,
+        timeout: Optional[float] = None,
+    ) -> DetailPaymentResponse:
+        """Change payment status to pending by selecting crypto currency."""
+        return self._run(
+            self.client.detail_payment(payment_id, detail_data, timeout), timeout
+        )
+
+    def close(self) -> None:
+        """Close the client session, the background loop keeps running."""
+        self._run(self.client.close(), per_call=False)
+
+    def __enter__(self) -> "SyncQuiqy":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
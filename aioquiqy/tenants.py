@@ -0,0 +1,136 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Set, Tuple, Union
+
+from .api import AioQuiqy
+from .base import SessionManager
+from .const import Networks
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+from .transport import TransportConfig
+
+
+class ClientPool:
+    """
+    Quiqy clients of many merchants sharing one session and connection pool.
+        Every merchant gets its own API key, rate limiter and labeled metrics,
+        so one noisy merchant can't exhaust the quota of the others.
+        Tenants are plain AioQuiqy clients created on `add`
+        and dropped on `evict` or when the pool grows over `maxsize`.
+    """
+
+    def __init__(
+        self,
+        network: Union[str, Networks] = Networks.MAIN_NET,
+        transport: Optional[TransportConfig] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
+        maxsize: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        :param network: Network address (default: main net)
+        :param transport: Connection pool shared by all merchants
+        :param rate_limiter: Template copied for every merchant (None - unlimited)
+        :param metrics: Shared metrics, tenant values labeled `tenant=<merchant>`
+        :param maxsize: Least recently used merchants over it are evicted
+            (None - unbounded)
+        :param kwargs: other AioQuiqy options shared by all merchants
+            (retry, json_codec, dispatch...), caches and dedup stores
+            hold merchant data, pass them to `add` instead
+        """
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.network = network
+        self.metrics = metrics
+        self.maxsize = maxsize
+        self.sessions = SessionManager(transport, metrics)
+        self._rate_limiter = rate_limiter
+        self._client_kwargs = kwargs
+        # merchant id -> API key and client, least recently used first
+        self._clients: "OrderedDict[str, Tuple[str, AioQuiqy]]" = OrderedDict()
+        self._closing: Set["asyncio.Future[None]"] = set()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __contains__(self, merchant_id: object) -> bool:
+        return merchant_id in self._clients
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._clients))
+
+    def add(self, merchant_id: str, api_key: str, **kwargs: Any) -> AioQuiqy:
+        """
+        Create client of the merchant, replacing the previous one.
+            :param merchant_id: Your id of the merchant, used as metrics label
+            :param api_key: API key of the merchant
+            :param kwargs: AioQuiqy options of this merchant only
+        """
+        options: Dict[str, Any] = {**self._client_kwargs, **kwargs}
+        if self._rate_limiter is not None:
+            options.setdefault("rate_limiter", self._rate_limiter.copy())
+        if self.metrics is not None:
+            options.setdefault("metrics", self.metrics.with_labels(tenant=merchant_id))
+
+        client = AioQuiqy(api_key, self.network, sessions=self.sessions, **options)
+        previous = self._clients.pop(merchant_id, None)
+        if previous is not None:
+            self._retire(previous[1])
+
+        self._clients[merchant_id] = (api_key, client)
+        if self.maxsize is not None:
+            while len(self._clients) > self.maxsize:
+                _, (_, evicted) = self._clients.popitem(last=False)
+                self._retire(evicted)
+        return client
+
+    def get(self, merchant_id: str, api_key: Optional[str] = None) -> AioQuiqy:
+        """
+        Get client of the merchant.
+            :param api_key: create the client if missing or if the key changed
+            :raises KeyError: unknown merchant and no `api_key`
+        """
+        entry = self._clients.get(merchant_id)
+        if entry is None or (api_key is not None and entry[0] != api_key):
+            if api_key is None:
+                raise KeyError(merchant_id)
+            return self.add(merchant_id, api_key)
+
+        self._clients.move_to_end(merchant_id)
+        return entry[1]
+
+    def __getitem__(self, merchant_id: str) -> AioQuiqy:
+        return self.get(merchant_id)
+
+    async def evict(self, merchant_id: str) -> None:
+        """Drop client of the merchant and drain its accepted callbacks."""
+        entry = self._clients.pop(merchant_id, None)
+        if entry is not None:
+            await entry[1].close()
+
+    def _retire(self, client: AioQuiqy) -> None:
+        """Drain callbacks of a dropped client in background, if a loop runs."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        future = asyncio.ensure_future(client.close())
+        self._closing.add(future)
+        future.add_done_callback(self._closing.discard)
+
+    async def close(self) -> None:
+        """Close all clients, then the shared sessions."""
+        clients = [client for _, client in self._clients.values()]
+        self._clients.clear()
+        await asyncio.gather(*(client.close() for client in clients))
+        await asyncio.gather(*self._closing, return_exceptions=True)
+        await self.sessions.close()
+
+    async def __aenter__(self) -> "ClientPool":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        await self.close()
@@ -0,0 +1,84 @@
+import ssl
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from aiohttp import BaseConnector, ClientTimeout, TCPConnector
+
+
+@lru_cache(maxsize=None)
+def get_ssl_context(cafile: Optional[str] = None) -> ssl.SSLContext:
+    """
+    Get process-wide SSL context.
+        The CA bundle is parsed once per `cafile`,
+        every connector created afterwards reuses the same context.
+        :param cafile: path to CA bundle (default: certifi bundle)
+    """
+    if cafile is None:
+        import certifi  # loads importlib.resources, only needed for TLS
+
+        cafile = certifi.where()
+    return ssl.create_default_context(cafile=cafile)
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """
+    HTTP transport settings of the client.
+        :param limit: total number of simultaneous connections (0 - unlimited)
+        :param limit_per_host: simultaneous connections to one host (0 - unlimited)
+        :param keepalive_timeout: seconds to keep an idle connection open
+        :param ttl_dns_cache: seconds to cache resolved hosts (None - forever)
+        :param total_timeout: whole request timeout in seconds
+        :param connect_timeout: timeout for acquiring a connection in seconds
+        :param sock_read_timeout: timeout between two socket reads in seconds
+        :param cafile: custom CA bundle path (default: certifi bundle)
+        :param connector: externally owned connector.
+            Several clients may share one connection pool this way,
+            the client never closes a connector it doesn't own.
+    """
+
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 15.0
+    ttl_dns_cache: Optional[int] = 10
+    total_timeout: Optional[float] = 300.0
+    connect_timeout: Optional[float] = None
+    sock_read_timeout: Optional[float] = None
+    cafile: Optional[str] = None
+    connector: Optional[BaseConnector] = None
+
+    @property
+    def connector_owner(self) -> bool:
+        """Whether the client owns (and closes) its connector."""
+        return self.connector is None
+
+    def build_connector(self) -> TCPConnector:
+        """
+        Create a new pooled connector from this config.
+            Must be called inside a running event loop.
+            Use it to create one connector and share it between clients:
+            `TransportConfig(connector=TransportConfig().build_connector())`
+        """
+        return TCPConnector(
+            ssl=get_ssl_context(self.cafile),
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=self.ttl_dns_cache != 0,
+        )
+
+    def get_connector(self) -> BaseConnector:
+        """Get the shared connector if set, a new one otherwise."""
+        if self.connector is not None:
+            return self.connector
+        return self.build_connector()
+
+    def build_timeout(self) -> ClientTimeout:
+        """Create aiohttp timeout from this config."""
+        return ClientTimeout(
+            total=self.total_timeout,
+            connect=self.connect_timeout,
+            sock_read=self.sock_read_timeout,
+        )
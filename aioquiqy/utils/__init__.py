@@ -1,3 +1,39 @@
-from .exchange import calculate_crypto_amount, get_payment_url
+from .exchange import (
+    CURRENCIES,
+    CurrencyFormatter,
+    CurrencySpec,
+    calculate_crypto_amount,
+    calculate_fiat_amount,
+    convert_amounts,
+    convert_minor_units,
+    format_amounts,
+    format_currency_amount,
+    format_minor_units,
+    from_minor_units,
+    get_currency,
+    get_formatter,
+    get_payment_url,
+    quantize_amounts,
+    to_decimal,
+    to_minor_units,
+)
 
-__all__ = ["calculate_crypto_amount", "get_payment_url"]
+__all__ = [
+    "calculate_crypto_amount",
+    "get_payment_url",
+    "calculate_fiat_amount",
+    "format_currency_amount",
+    "CURRENCIES",
+    "CurrencySpec",
+    "CurrencyFormatter",
+    "get_currency",
+    "get_formatter",
+    "to_decimal",
+    "quantize_amounts",
+    "convert_amounts",
+    "to_minor_units",
+    "from_minor_units",
+    "convert_minor_units",
+    "format_amounts",
+    "format_minor_units",
+]
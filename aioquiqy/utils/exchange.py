@@ -1,4 +1,20 @@
-from typing import Union
+import sys
+from dataclasses import dataclass
+from decimal import (
+    ROUND_CEILING,
+    ROUND_DOWN,
+    ROUND_FLOOR,
+    ROUND_HALF_DOWN,
+    ROUND_HALF_EVEN,
+    ROUND_HALF_UP,
+    ROUND_UP,
+    Context,
+    Decimal,
+)
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Union
+
+Amount = Union[int, float, str, Decimal]
 
 
 def calculate_crypto_amount(fiat_amount: float, rate: float) -> float:
@@ -60,3 +76,404 @@ def format_currency_amount(amount: Union[int, float], currency: str) -> str:
     else:
         return f"{amount:.6f} {currency}"
 
+
+# Enough digits for 18-place amounts multiplied or divided by rates
+_CONTEXT = Context(prec=60)
+
+# Rounding modes supported by integer (minor unit) arithmetic
+INTEGER_ROUNDINGS: FrozenSet[str] = frozenset(
+    {
+        ROUND_CEILING,
+        ROUND_DOWN,
+        ROUND_FLOOR,
+        ROUND_HALF_DOWN,
+        ROUND_HALF_EVEN,
+        ROUND_HALF_UP,
+        ROUND_UP,
+    }
+)
+
+DEFAULT_PLACES = 6
+
+
+@dataclass(frozen=True)
+class CurrencySpec:
+    """
+    Precision and rounding rules of a currency.
+        :param code: currency code shown in formatted amounts
+        :param places: decimal places of the minor unit, e.g. 8 for satoshi
+        :param rounding: `decimal` rounding mode of conversions and formatting
+        :param display_places: decimal places when formatting (default: places)
+    """
+
+    code: str
+    places: int
+    rounding: str = ROUND_HALF_EVEN
+    display_places: Optional[int] = None
+
+    @property
+    def quantum(self) -> Decimal:
+        """Value of one minor unit, e.g. Decimal("0.01")."""
+        return _quantum(self.places)
+
+
+CURRENCIES: Dict[str, CurrencySpec] = {
+    spec.code: spec
+    for spec in (
+        CurrencySpec("USD", 2, ROUND_HALF_UP),
+        CurrencySpec("EUR", 2, ROUND_HALF_UP),
+        CurrencySpec("RUB", 2, ROUND_HALF_UP),
+        CurrencySpec("BTC", 8),
+        CurrencySpec("ETH", 18, display_places=8),
+        CurrencySpec("TRX", 6),
+        CurrencySpec("TON", 9, display_places=6),
+        CurrencySpec("USDT", 6, display_places=2),
+        CurrencySpec("USDC", 6, display_places=2),
+    )
+}
+
+
+@lru_cache(maxsize=None)
+def _quantum(places: int) -> Decimal:
+    return Decimal(1).scaleb(-places)
+
+
+def get_currency(currency: Union[str, CurrencySpec]) -> CurrencySpec:
+    """
+    Get precision and rounding rules of a currency.
+
+    Args:
+        currency: Currency code or spec, unknown codes get 6 places
+
+    Returns:
+        CurrencySpec: Rules of the currency
+    """
+    if isinstance(currency, CurrencySpec):
+        return currency
+    spec = CURRENCIES.get(currency.upper())
+    return spec if spec is not None else CurrencySpec(currency, DEFAULT_PLACES)
+
+
+def to_decimal(amount: Amount) -> Decimal:
+    """
+    Convert amount to Decimal exactly as written.
+
+    Floats go through their shortest repr, so 0.1 becomes Decimal("0.1")
+    instead of its binary approximation.
+    """
+    if isinstance(amount, Decimal):
+        return amount
+    if isinstance(amount, float):
+        return Decimal(str(amount))
+    return Decimal(amount)
+
+
+def quantize_amounts(
+    amounts: Iterable[Amount], currency: Union[str, CurrencySpec]
+) -> List[Decimal]:
+    """
+    Round amounts to the precision of the currency.
+
+    Args:
+        amounts: Amounts, a sequence or a NumPy array
+        currency: Currency code or spec
+
+    Returns:
+        List[Decimal]: Rounded amounts
+    """
+    spec = get_currency(currency)
+    quantum, rounding = spec.quantum, spec.rounding
+    return [
+        to_decimal(amount).quantize(quantum, rounding, _CONTEXT)
+        for amount in _values(amounts)
+    ]
+
+
+def convert_amounts(
+    amounts: Iterable[Amount],
+    rate: Amount,
+    currency: Union[str, CurrencySpec],
+    inverse: bool = False,
+) -> List[Decimal]:
+    """
+    Convert amounts with one exchange rate, e.g. every line item of a cart.
+
+    Args:
+        amounts: Amounts in the source currency, a sequence or a NumPy array
+        rate: Exchange rate (target per source unit)
+        currency: Target currency code or spec, results are rounded to it
+        inverse: Divide by the rate (source per target unit) instead
+
+    Returns:
+        List[Decimal]: Amounts in the target currency
+    """
+    spec = get_currency(currency)
+    quantum, rounding = spec.quantum, spec.rounding
+    operation = _CONTEXT.divide if inverse else _CONTEXT.multiply
+    rate = to_decimal(rate)
+    return [
+        operation(to_decimal(amount), rate).quantize(quantum, rounding, _CONTEXT)
+        for amount in _values(amounts)
+    ]
+
+
+def to_minor_units(
+    amounts: Iterable[Amount], currency: Union[str, CurrencySpec]
+) -> Any:
+    """
+    Convert amounts to integer minor units, e.g. BTC to satoshi.
+
+    Args:
+        amounts: Amounts, a sequence or a NumPy array
+        currency: Currency code or spec
+
+    Returns:
+        List[int], or int64 array for NumPy input
+    """
+    spec = get_currency(currency)
+    places, rounding = spec.places, spec.rounding
+    one = _quantum(0)
+    units = [
+        int(
+            to_decimal(amount)
+            .scaleb(places, _CONTEXT)
+            .quantize(one, rounding, _CONTEXT)
+        )
+        for amount in _values(amounts)
+    ]
+    np = _numpy_of(amounts)
+    return units if np is None else _int_array(np, units)
+
+
+def from_minor_units(
+    units: Iterable[int], currency: Union[str, CurrencySpec]
+) -> List[Decimal]:
+    """
+    Convert integer minor units to exact amounts, e.g. satoshi to BTC.
+
+    Args:
+        units: Minor units, a sequence or a NumPy array
+        currency: Currency code or spec
+
+    Returns:
+        List[Decimal]: Amounts with the precision of the currency
+    """
+    places = -get_currency(currency).places
+    return [Decimal(unit).scaleb(places, _CONTEXT) for unit in _values(units)]
+
+
+def convert_minor_units(
+    units: Iterable[int],
+    rate: Amount,
+    source: Union[str, CurrencySpec],
+    target: Union[str, CurrencySpec],
+) -> Any:
+    """
+    Convert minor units of one currency to another with integer arithmetic only.
+
+    The rate is turned into an exact fraction once, every amount is then
+    one multiplication and one rounded division. NumPy arrays are converted
+    in one vectorized pass while the products fit into int64.
+
+    Args:
+        units: Minor units of the source currency, a sequence or a NumPy array
+        rate: Exchange rate (target per source unit)
+        source: Source currency code or spec
+        target: Target currency code or spec, its rounding is used
+
+    Returns:
+        List[int], or int64 array for NumPy input
+    """
+    source_spec, target_spec = get_currency(source), get_currency(target)
+    rounding = target_spec.rounding
+    if rounding not in INTEGER_ROUNDINGS:
+        raise ValueError(f"Unsupported rounding for minor units: {rounding}")
+
+    numerator, denominator = to_decimal(rate).as_integer_ratio()
+    shift = target_spec.places - source_spec.places
+    if shift >= 0:
+        numerator *= 10**shift
+    else:
+        denominator *= 10**-shift
+
+    np = _numpy_of(units)
+    if np is not None:
+        return _convert_array(np, units, numerator, denominator, rounding)
+    return [_div_round(int(unit) * numerator, denominator, rounding) for unit in units]
+
+
+class CurrencyFormatter:
+    """
+    Formats amounts of one currency, rounding and layout are prepared once.
+        Use `get_formatter` to get the cached formatter of a currency.
+    """
+
+    __slots__ = (
+        "spec",
+        "places",
+        "_quantum",
+        "_suffix",
+        "_template",
+        "_divisor",
+        "_scale",
+        "_unit",
+    )
+
+    def __init__(self, currency: Union[str, CurrencySpec]) -> None:
+        spec = get_currency(currency)
+        places = spec.places if spec.display_places is None else spec.display_places
+        self.spec = spec
+        self.places = places
+        self._quantum = _quantum(places)
+        self._suffix = f" {spec.code}"
+        # sign, whole part and fraction of minor units, %-format is the fastest
+        fraction = f".%0{places}d" if places else ""
+        self._template = f"%s%d{fraction} {spec.code}"
+        # minor units per shown digit, or zeros to append if more digits are shown
+        self._divisor = 10 ** max(spec.places - places, 0)
+        self._scale = 10 ** max(places - spec.places, 0)
+        self._unit = 10**places
+
+    def format(self, amount: Amount) -> str:
+        rounded = to_decimal(amount).quantize(
+            self._quantum, self.spec.rounding, _CONTEXT
+        )
+        return f"{rounded:f}{self._suffix}"
+
+    def format_minor(self, units: int) -> str:
+        if self._divisor != 1:
+            units = _div_round(int(units), self._divisor, self.spec.rounding)
+        shown = units * self._scale
+        sign = ""
+        if shown < 0:
+            sign, shown = "-", -shown
+        if not self.places:
+            return self._template % (sign, shown)
+        return self._template % (sign, shown // self._unit, shown % self._unit)
+
+    def format_many(self, amounts: Iterable[Amount]) -> List[str]:
+        return [self.format(amount) for amount in _values(amounts)]
+
+    def format_many_minor(self, units: Iterable[int]) -> List[str]:
+        return [self.format_minor(unit) for unit in _values(units)]
+
+
+@lru_cache(maxsize=None)
+def get_formatter(currency: Union[str, CurrencySpec]) -> CurrencyFormatter:
+    """Get cached formatter of the currency."""
+    return CurrencyFormatter(currency)
+
+
+def format_amounts(
+    amounts: Iterable[Amount], currency: Union[str, CurrencySpec]
+) -> List[str]:
+    """
+    Format amounts with the display precision and rounding of the currency.
+
+    Args:
+        amounts: Amounts, a sequence or a NumPy array
+        currency: Currency code or spec
+
+    Returns:
+        List[str]: Formatted amounts, e.g. "0.00012345 BTC"
+    """
+    return get_formatter(currency).format_many(amounts)
+
+
+def format_minor_units(
+    units: Iterable[int], currency: Union[str, CurrencySpec]
+) -> List[str]:
+    """
+    Format integer minor units without going through Decimal.
+
+    Args:
+        units: Minor units, a sequence or a NumPy array
+        currency: Currency code or spec
+
+    Returns:
+        List[str]: Formatted amounts, e.g. "0.00012345 BTC"
+    """
+    return get_formatter(currency).format_many_minor(units)
+
+
+def _div_round(numerator: int, denominator: int, rounding: str) -> int:
+    """Divide integers, rounding like `decimal` does (denominator > 0)."""
+    quotient, remainder = divmod(numerator, denominator)
+    if not remainder or rounding == ROUND_FLOOR:
+        return quotient
+    if rounding == ROUND_CEILING:
+        return quotient + 1
+    if rounding == ROUND_DOWN:
+        return quotient + (numerator < 0)
+    if rounding == ROUND_UP:
+        return quotient + (numerator > 0)
+
+    twice = 2 * remainder
+    if twice != denominator:
+        return quotient + (twice > denominator)
+    if rounding == ROUND_HALF_UP:
+        return quotient + (numerator > 0)
+    if rounding == ROUND_HALF_DOWN:
+        return quotient + (numerator < 0)
+    return quotient + (quotient & 1)
+
+
+def _numpy_of(values: Any) -> Any:
+    """NumPy module if `values` is an array, NumPy itself is never imported here."""
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(values, np.ndarray):
+        return np
+    return None
+
+
+def _values(values: Iterable[Any]) -> Iterable[Any]:
+    """Python scalars of a NumPy array, other iterables as is."""
+    return values.tolist() if _numpy_of(values) is not None else values  # type: ignore
+
+
+def _int_array(np: Any, values: List[int]) -> Any:
+    try:
+        return np.array(values, dtype=np.int64)
+    except OverflowError:
+        return np.array(values, dtype=object)
+
+
+def _convert_array(
+    np: Any, units: Any, numerator: int, denominator: int, rounding: str
+) -> Any:
+    """Vectorized `_div_round(units * numerator, denominator)`."""
+    limit = 2**62
+    peak = int(np.abs(units).max()) if units.size else 0
+    if (
+        units.dtype.kind not in "iu"
+        or peak * abs(numerator) >= limit
+        or denominator >= limit
+    ):
+        values = [
+            _div_round(int(unit) * numerator, denominator, rounding)
+            for unit in units.tolist()
+        ]
+        return _int_array(np, values)
+
+    products = units.astype(np.int64) * np.int64(numerator)
+    quotient, remainder = np.divmod(products, np.int64(denominator))
+    if rounding == ROUND_FLOOR:
+        return quotient
+    inexact = remainder != 0
+    if rounding == ROUND_CEILING:
+        return quotient + inexact
+    if rounding == ROUND_DOWN:
+        return quotient + (inexact & (products < 0))
+    if rounding == ROUND_UP:
+        return quotient + (inexact & (products > 0))
+
+    twice = 2 * remainder
+    up = twice > denominator
+    tie = twice == denominator
+    if rounding == ROUND_HALF_UP:
+        up |= tie & (products > 0)
+    elif rounding == ROUND_HALF_DOWN:
+        up |= tie & (products < 0)
+    else:
+        up |= tie & (quotient % 2 == 1)
+    return quotient + up
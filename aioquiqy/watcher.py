@@ -0,0 +1,217 @@
+import asyncio
+import heapq
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from .api import AioQuiqy
+from .const import TERMINAL_STATUSES, PaymentStatus
+from .models.payment import CallbackRequest, PaymentResponse
+from .ratelimit import Priority, TokenBucket, request_priority
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WatchPolicy:
+    """
+    Polling settings of PaymentWatcher.
+        :param intervals: seconds between polls per payment status
+        :param default_interval: seconds between polls for other statuses
+        :param min_interval: lower bound of a poll interval
+        :param max_interval: upper bound of a poll interval
+        :param expiry_margin: seconds after planned expiration to poll again,
+            the status changes then
+        :param error_interval: seconds before the next poll after an error
+        :param concurrency: max requests in flight
+        :param rate: max requests per second (None - unlimited),
+            polls also have bulk priority in the client rate limiter
+    """
+
+    intervals: Mapping[str, float] = field(
+        default_factory=lambda: {
+            PaymentStatus.DETAILING: 30.0,
+            PaymentStatus.PENDING: 10.0,
+            PaymentStatus.DETECTED: 5.0,
+        }
+    )
+    default_interval: float = 15.0
+    min_interval: float = 1.0
+    max_interval: float = 300.0
+    expiry_margin: float = 2.0
+    error_interval: float = 30.0
+    concurrency: int = 20
+    rate: Optional[float] = 10.0
+
+
+class PaymentWatcher:
+    """
+    Polls open payments with `get_payment` until they reach a terminal status.
+        Payments are kept in a heap ordered by the next poll time,
+        so the watcher sleeps until the earliest one is due
+        and never scans the whole set.
+        Status changes go through `AioQuiqy.dispatch_callback`,
+        the same pipeline as webhook callbacks.
+    """
+
+    def __init__(
+        self,
+        client: AioQuiqy,
+        policy: Optional[WatchPolicy] = None,
+        app: Any = None,
+    ) -> None:
+        """
+        :param client: Quiqy API client
+        :param policy: polling settings
+        :param app: application passed to callback handlers
+        """
+        self.client = client
+        self.policy = policy or WatchPolicy()
+        self.app = app
+        # payment ID -> (last known status, schedule generation)
+        self._watched: Dict[str, Tuple[Optional[str], int]] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._generation = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._polls: Set["asyncio.Task[None]"] = set()
+        self._runner: Optional["asyncio.Task[None]"] = None
+        self._bucket = (
+            TokenBucket(self.policy.rate, capacity=1) if self.policy.rate else None
+        )
+
+    def __len__(self) -> int:
+        return len(self._watched)
+
+    def __contains__(self, payment_id: str) -> bool:
+        return payment_id in self._watched
+
+    def watch(
+        self, payment_id: str, status: Optional[str] = None, delay: float = 0.0
+    ) -> None:
+        """
+        Start watching payment.
+            :param payment_id: payment ID in Quiqy service
+            :param status: last known status, the first poll reports changes from it
+            :param delay: seconds before the first poll
+        """
+        if status in TERMINAL_STATUSES:
+            return
+        self._schedule(payment_id, status, delay)
+
+    def unwatch(self, payment_id: str) -> None:
+        """Stop watching payment, its queued poll is skipped."""
+        self._watched.pop(payment_id, None)
+
+    def start(self) -> None:
+        """Run the watcher in background."""
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        """Stop the watcher and wait for polls in flight."""
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        await asyncio.gather(*self._polls, return_exceptions=True)
+
+    async def run(self) -> None:
+        """Poll due payments forever."""
+        self._semaphore = asyncio.Semaphore(self.policy.concurrency)
+        wakeup = self._get_wakeup()
+
+        while True:
+            wakeup.clear()
+            if not self._heap:
+                await wakeup.wait()
+                continue
+
+            due_at, generation, payment_id = self._heap[0]
+            delay = due_at - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            entry = self._watched.get(payment_id)
+            if entry is None or entry[1] != generation:
+                continue  # unwatched or rescheduled
+
+            await self._semaphore.acquire()
+            if self._bucket is not None:
+                await self._bucket.acquire()
+            poll = asyncio.ensure_future(self._poll(payment_id, entry[0]))
+            self._polls.add(poll)
+            poll.add_done_callback(self._polls.discard)
+
+    async def _poll(self, payment_id: str, last_status: Optional[str]) -> None:
+        assert self._semaphore is not None
+        try:
+            with request_priority(Priority.BULK):
+                response = await self.client.get_payment(payment_id, use_cache=False)
+        except Exception:
+            logger.exception("Failed to poll payment %s", payment_id)
+            self._reschedule(payment_id, last_status, self.policy.error_interval)
+            return
+        finally:
+            self._semaphore.release()
+
+        payment = response.payment
+        status: Optional[str] = payment.status
+        if status != last_status:
+            try:
+                callback = CallbackRequest.from_payment(payment)
+                dispatched = await self.client.dispatch_callback(callback, self.app)
+            except Exception:
+                # Report the change again, like a webhook redelivered after a 500
+                logger.exception("Failed to dispatch payment %s", payment_id)
+                self._reschedule(payment_id, last_status, self.policy.error_interval)
+                return
+            if not dispatched:
+                # Fast-ack queue is full, report the change on the next poll
+                status = last_status
+
+        if payment.status in TERMINAL_STATUSES and status == payment.status:
+            self._watched.pop(payment_id, None)
+            return
+        self._reschedule(payment_id, status, self._get_interval(payment))
+
+    def _get_interval(self, payment: PaymentResponse) -> float:
+        policy = self.policy
+        interval = policy.intervals.get(payment.status, policy.default_interval)
+
+        # Poll right after planned expiration, the status changes then
+        created_at = payment.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        age = (datetime.now(timezone.utc) - created_at).total_seconds()
+        until_expiry = payment.ttl - age + policy.expiry_margin
+        if 0 < until_expiry < interval:
+            interval = until_expiry
+
+        return min(policy.max_interval, max(policy.min_interval, interval))
+
+    def _reschedule(self, payment_id: str, status: Optional[str], delay: float) -> None:
+        # Unwatched while the poll was in flight
+        if payment_id in self._watched:
+            self._schedule(payment_id, status, delay)
+
+    def _schedule(self, payment_id: str, status: Optional[str], delay: float) -> None:
+        self._generation += 1
+        self._watched[payment_id] = (status, self._generation)
+
+        due_at = time.monotonic() + delay
+        if not self._heap or due_at < self._heap[0][0]:
+            self._get_wakeup().set()
+        heapq.heappush(self._heap, (due_at, self._generation, payment_id))
+
+    def _get_wakeup(self) -> asyncio.Event:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        return self._wakeup
@@ -0,0 +1,118 @@
+"""
+Import time of the package and the modules each import path must not load.
+
+    python benchmarks/bench_import.py [--runs N] [--output results.json]
+    python benchmarks/bench_import.py --compare baseline.json [--threshold 0.2]
+
+Every case runs in a fresh interpreter, the best of `--runs` is reported.
+Exits with status 1 if an import path loads a module it must not
+(e.g. aiohttp.web for outbound-only users) or, with `--compare`,
+if an import got slower than the baseline by more than `--threshold`.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class ImportCase(NamedTuple):
+    """Statement to time and modules it must not load"""
+
+    statement: str
+    forbidden: Tuple[str, ...] = ()
+
+
+CASES: Dict[str, ImportCase] = {
+    "import/package": ImportCase(
+        "import aioquiqy", ("aiohttp", "pydantic", "aioquiqy.api")
+    ),
+    "import/client": ImportCase(
+        "from aioquiqy import AioQuiqy",
+        ("aiohttp.web", "sqlite3", "aioquiqy.models.error", "aioquiqy.watcher"),
+    ),
+    "import/webhook": ImportCase(
+        "from aioquiqy import AioQuiqy; import aiohttp.web", ("sqlite3",)
+    ),
+    "import/watcher": ImportCase("from aioquiqy import PaymentWatcher"),
+}
+
+CHILD = """
+import sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(elapsed)
+print(" ".join(name for name in {forbidden!r} if name in sys.modules))
+"""
+
+
+def run_once(case: ImportCase) -> Tuple[float, List[str]]:
+    code = CHILD.format(statement=case.statement, forbidden=case.forbidden)
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.splitlines()
+    return float(output[0]), output[1].split() if len(output) > 1 else []
+
+
+def run(runs: int) -> Tuple[Dict[str, Any], List[str]]:
+    results = {}
+    violations = []
+    for name, case in CASES.items():
+        times = []
+        loaded: List[str] = []
+        for _ in range(runs):
+            elapsed, loaded = run_once(case)
+            times.append(elapsed * 1e6)
+
+        results[name] = {
+            "min_us": min(times),
+            "median_us": statistics.median(times),
+            "stdev_us": statistics.stdev(times) if len(times) > 1 else 0.0,
+            "number": 1,
+            "repeat": runs,
+            "ops": 1,
+        }
+        note = f"  loads {', '.join(loaded)}!" if loaded else ""
+        print(f"{name:<36} {min(times) / 1000:10.1f} ms{note}")
+        violations.extend(f"{case.statement!r} loads {module}" for module in loaded)
+
+    return {"schema": 1, "python": sys.version.split()[0], "results": results}, violations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    current, violations = run(args.runs)
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2) + "\n")
+
+    failed = bool(violations)
+    if violations:
+        print("\nUnexpected imports:\n  " + "\n  ".join(violations))
+
+    if args.compare:
+        from suite import compare
+
+        baseline = json.loads(args.compare.read_text())
+        failed = bool(compare(baseline, current, args.threshold)) or failed
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
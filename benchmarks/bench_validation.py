@@ -0,0 +1,114 @@
+"""
+Per-response validation cost of the API response models.
+
+    python benchmarks/bench_validation.py [--number N]
+
+"before" is the old `Model(**json.loads(body))` path,
+"after" is `Model.model_validate_json(body)` used by the client now.
+"construct" is the `model_construct` path kept for reference:
+it has to convert datetimes and enums in Python and is slower than
+pydantic-core validation, so the client doesn't offer it as a fast path.
+The cases also run as `validation/*` in benchmarks/suite.py.
+"""
+import argparse
+import json
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from aioquiqy.const import PaymentStatus, PaymentType  # noqa: E402
+from aioquiqy.models.payment import (  # noqa: E402
+    CallbackRequest,
+    GetPaymentResponse,
+    PaymentResponse,
+)
+
+PAYMENT: Dict[str, Any] = {
+    "amount_crypto": 10.512,
+    "amount_fiat": 100.0,
+    "callback_url": "https://example.com/callback",
+    "client_order_id": "order-000001",
+    "confirmed_manually": False,
+    "created_at": "2024-01-01T00:00:00+00:00",
+    "crypto_currency_id": 1,
+    "fail_url": "https://example.com/fail",
+    "fee": 0.5,
+    "fee_toggle": "payer",
+    "fiat_currency_id": 1,
+    "from_address": None,
+    "id": "9f8c2a6e-3c1f-4c7b-9a43-5d2b1e7f0a11",
+    "payer_amount_crypto": 11.012,
+    "status": "pending",
+    "success_url": "https://example.com/success",
+    "to_address": "TQ5ZzTzQ8rUuR1xHc8WgG7t1b6S1kQ9qUu",
+    "ttl": 900,
+    "tx_hash": None,
+    "type": "form",
+    "updated_at": "2024-01-01T00:01:00+00:00",
+}
+
+GET_PAYMENT = json.dumps(
+    {"available_crypto_currency_ids": [1, 2, 3, 4, 5], "payment": PAYMENT}
+).encode()
+
+CALLBACK = json.dumps(
+    {
+        "amount_crypto": 10.512,
+        "amount_fiat": 100.0,
+        "client_order_id": "order-000001",
+        "crypto_currency_id": 1,
+        "fee_crypto": 0.5,
+        "fee_fiat": 4.75,
+        "fee_side": "payer",
+        "fiat_currency_id": 1,
+        "from_address": "TQ5ZzTzQ8rUuR1xHc8WgG7t1b6S1kQ9qUu",
+        "payer_amount_crypto": 11.012,
+        "payment_created_at": "2024-01-01T00:00:00+00:00",
+        "payment_status": "confirmed",
+        "payment_status_updated_at": "2024-01-01T00:05:00+00:00",
+        "planned_expiration_at": "2024-01-01T00:15:00+00:00",
+        "to_address": "TQ5ZzTzQ8rUuR1xHc8WgG7t1b6S1kQ9qUu",
+        "tx_hash": "4f0e1c8a9b7d",
+    }
+).encode()
+
+
+def construct_get_payment(body: bytes) -> GetPaymentResponse:
+    data = json.loads(body)
+    payment = data["payment"]
+    payment["created_at"] = datetime.fromisoformat(payment["created_at"])
+    payment["updated_at"] = datetime.fromisoformat(payment["updated_at"])
+    payment["status"] = PaymentStatus(payment["status"])
+    payment["type"] = PaymentType(payment["type"])
+    return GetPaymentResponse.model_construct(
+        available_crypto_currency_ids=data["available_crypto_currency_ids"],
+        payment=PaymentResponse.model_construct(**payment),
+    )
+
+
+CASES: Dict[str, Callable[[], Any]] = {
+    "get_payment/before": lambda: GetPaymentResponse(**json.loads(GET_PAYMENT)),
+    "get_payment/after": lambda: GetPaymentResponse.model_validate_json(GET_PAYMENT),
+    "get_payment/construct": lambda: construct_get_payment(GET_PAYMENT),
+    "callback/before": lambda: CallbackRequest(**json.loads(CALLBACK)),
+    "callback/after": lambda: CallbackRequest.model_validate_json(CALLBACK),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, case in CASES.items():
+        best = min(timeit.repeat(case, number=args.number, repeat=args.repeat))
+        print(f"{name:<24} {best / args.number * 1e6:8.2f} us/response")
+
+
+if __name__ == "__main__":
+    main()
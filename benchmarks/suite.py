@@ -0,0 +1,248 @@
+"""
+Microbenchmarks of the client hot paths, no network involved.
+
+    python benchmarks/suite.py [--filter NAME] [--output results.json]
+    python benchmarks/suite.py --compare baseline.json [--threshold 0.1]
+
+Every case is timed with `timeit`, the number of loops is picked
+automatically (at least 0.2 s per repeat) unless `--number` is given.
+Results are printed as a table and written as JSON with `--output`.
+`--compare` times the cases again and exits with status 1
+if any median got slower than the baseline by more than `--threshold`.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pydantic  # noqa: E402
+
+from aioquiqy import AioQuiqy  # noqa: E402
+from aioquiqy.exceptions import QuiqyAPIError  # noqa: E402
+from aioquiqy.models.payment import CreatePaymentRequest  # noqa: E402
+from aioquiqy.utils.exchange import (  # noqa: E402
+    calculate_crypto_amount,
+    calculate_fiat_amount,
+    convert_amounts,
+    convert_minor_units,
+    format_amounts,
+    format_currency_amount,
+    format_minor_units,
+    get_payment_url,
+)
+from bench_validation import CALLBACK  # noqa: E402
+from bench_validation import CASES as VALIDATION_CASES  # noqa: E402
+
+SCHEMA_VERSION = 1
+
+
+class Case(NamedTuple):
+    """Benchmark case, `func` runs `ops` operations per call"""
+
+    func: Callable[[], Any]
+    ops: int = 1
+
+
+def create_payment_cases() -> Dict[str, Case]:
+    data = {
+        "amount_fiat": 100.0,
+        "callback_url": "https://example.com/callback",
+        "client_order_id": "order-000001",
+        "fail_url": "https://example.com/fail",
+        "fiat_currency_id": 1,
+        "success_url": "https://example.com/success",
+    }
+    request = CreatePaymentRequest(**data)
+    return {
+        "create_payment/build": Case(lambda: CreatePaymentRequest(**data)),
+        "create_payment/model_dump": Case(request.model_dump),
+        "create_payment/model_dump_json": Case(request.model_dump_json),
+        "create_payment/dumps": Case(lambda: json.dumps(request.model_dump())),
+    }
+
+
+def error_cases() -> Dict[str, Case]:
+    QuiqyAPIError.exception_to_handle(404)
+    return {
+        "errors/lookup": Case(lambda: QuiqyAPIError.exception_to_handle(404)),
+        "errors/class_call": Case(lambda: QuiqyAPIError(404)),
+        "errors/create": Case(
+            lambda: QuiqyAPIError.exception_to_raise(404, "Not found", "")
+        ),
+    }
+
+
+class _Request:
+    """The part of aiohttp Request used by `handle_callback`"""
+
+    def __init__(self, body: bytes) -> None:
+        self.app: Dict[str, Any] = {}
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+def callback_cases(batch: int = 100) -> Dict[str, Case]:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    request = _Request(CALLBACK)
+    cases = {}
+
+    async def handler(callback: Any, app: Any) -> None:
+        pass
+
+    for handlers in (0, 1, 10):
+        client = AioQuiqy("key", retry=None, circuit_breaker=None)
+        for _ in range(handlers):
+            client.register_callback_handler(handler)
+
+        async def run(client: AioQuiqy = client) -> None:
+            for _ in range(batch):
+                await client.handle_callback(request)  # type: ignore[arg-type]
+
+        cases[f"handle_callback/{handlers}_handlers"] = Case(
+            lambda run=run: loop.run_until_complete(run()), ops=batch
+        )
+    return cases
+
+
+def exchange_cases() -> Dict[str, Case]:
+    return {
+        "exchange/crypto_amount": Case(lambda: calculate_crypto_amount(100.0, 0.98)),
+        "exchange/fiat_amount": Case(lambda: calculate_fiat_amount(10.512, 1.02)),
+        "exchange/format_amount": Case(
+            lambda: format_currency_amount(10.512, "USDT")
+        ),
+        "exchange/payment_url": Case(lambda: get_payment_url("payment-id")),
+    }
+
+
+def exchange_batch_cases(size: int = 1000) -> Dict[str, Case]:
+    amounts = [round(1 + i * 0.37, 2) for i in range(size)]
+    units = [100 + i * 37 for i in range(size)]
+    return {
+        "exchange_batch/convert_amounts": Case(
+            lambda: convert_amounts(amounts, "0.00001537", "BTC"), size
+        ),
+        "exchange_batch/convert_minor_units": Case(
+            lambda: convert_minor_units(units, "0.00001537", "USD", "BTC"), size
+        ),
+        "exchange_batch/format_amounts": Case(
+            lambda: format_amounts(amounts, "USDT"), size
+        ),
+        "exchange_batch/format_minor_units": Case(
+            lambda: format_minor_units(units, "USD"), size
+        ),
+    }
+
+
+def get_cases() -> Dict[str, Case]:
+    cases = create_payment_cases()
+    cases.update(
+        (f"validation/{name}", Case(func)) for name, func in VALIDATION_CASES.items()
+    )
+    cases.update(error_cases())
+    cases.update(callback_cases())
+    cases.update(exchange_cases())
+    cases.update(exchange_batch_cases())
+    return cases
+
+
+def measure(case: Case, number: Optional[int], repeat: int) -> Dict[str, Any]:
+    timer = timeit.Timer(case.func)
+    if number is None:
+        number, _ = timer.autorange()
+    times = [t / number / case.ops * 1e6 for t in timer.repeat(repeat, number)]
+    return {
+        "min_us": min(times),
+        "median_us": statistics.median(times),
+        "stdev_us": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+        "ops": case.ops,
+    }
+
+
+def run(
+    name_filter: Optional[str], number: Optional[int], repeat: int
+) -> Dict[str, Any]:
+    results = {}
+    for name, case in get_cases().items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = result = measure(case, number, repeat)
+        print(
+            f"{name:<36} {result['median_us']:10.3f} us/op"
+            f"  (min {result['min_us']:.3f})"
+        )
+    return {
+        "schema": SCHEMA_VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "pydantic": pydantic.VERSION,
+        "results": results,
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Print current medians against the baseline, return regressed cases."""
+    regressions = []
+    print(f"\n{'case':<36} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<36} {'-':>10} {result['median_us']:10.3f}      new")
+            continue
+
+        change = result["median_us"] / base["median_us"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(
+            f"{name:<36} {base['median_us']:10.3f} {result['median_us']:10.3f}"
+            f" {change:+8.1%}{flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filter", help="run cases containing this substring")
+    parser.add_argument("--number", type=int, help="loops per repeat (default: auto)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed median slowdown in --compare mode (default: 0.1 = 10%%)",
+    )
+    args = parser.parse_args()
+
+    current = run(args.filter, args.number, args.repeat)
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2) + "\n")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,19 @@
 from .api import AioQuiqy
 from .const import FiatCurrencies, CryptoCurrencies, PaymentStatus
+from .cache import PaymentCache, QuoteCache
+from .deadline import request_deadline
+from .dispatch import DispatchConfig
+from .hedge import HedgePolicy
+from .journal import CallbackJournal
+from .ledger import PaymentLedger
+from .metrics import Metrics
+from .ratelimit import Priority, RateLimiter, request_priority
+from .retry import RetryPolicy, CircuitBreakerPolicy
+from .signature import SignatureConfig
+from .sync import SyncQuiqy
+from .tenants import ClientPool
+from .transport import TransportConfig
+from .watcher import PaymentWatcher, WatchPolicy
 
 __version__: str
 
@@ -1,5 +1,20 @@
-from .base import BaseClient
-from .const import HTTPMethods, Networks
+from .base import BaseClient, SessionManager
+from .bulk import BulkResult
+from .cache import PaymentCache, QuoteCache, TTLCache
+from .codec import JSONCodec
+from .dedup import DedupStore
+from .dispatch import CallbackQueue, DispatchConfig
+from .hedge import HedgePolicy
+from .ledger import PaymentLedger
+from .journal import CallbackJournal
+from .metrics import Metrics
+from .const import Endpoints, HTTPMethods, Networks, PaymentStatus
+from .ratelimit import Priority, RateLimiter
+from .retry import CircuitBreakerPolicy, RetryPolicy
+from .routing import CallbackPredicate, HandlerRouter
+from .signature import SignatureConfig, SignatureVerifier
+from .singleflight import SingleFlight
+from .transport import TransportConfig
 from .models.payment import (
     CreatePaymentRequest,
     CreatePaymentResponse,
@@ -9,45 +24,146 @@ from .models.payment import (
     PreCalculatePaymentResponse,
     CallbackRequest,
 )
-from typing import Union, List, Callable, Any, Coroutine
+from typing import (
+    Union,
+    Callable,
+    Any,
+    Coroutine,
+    Optional,
+    Iterable,
+    AsyncIterable,
+    AsyncIterator,
+)
 from aiohttp.web import Response
 from aiohttp.web_request import Request
 
 class AioQuiqy(BaseClient):
     API_DOCS: str
+    CREATED_PAYMENTS_SIZE: int
+    CREATED_PAYMENTS_TTL: float
     network: Union[str, Networks]
-    _handlers: List[Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]]]
+    payment_cache: Optional[PaymentCache]
+    quote_cache: Optional[QuoteCache]
+    created_payments: TTLCache
+    _create_calls: SingleFlight
+    dedup_store: Optional[DedupStore]
+    _router: HandlerRouter
+    _dispatch: DispatchConfig
+    _callback_queue: CallbackQueue
+    _verifier: Optional[SignatureVerifier]
+    journal: Optional[CallbackJournal]
+    ledger: Optional[PaymentLedger]
     
     def __init__(
-        self, api_key: str, network: Union[str, Networks] = Networks.MAIN_NET
+        self,
+        api_key: str,
+        network: Union[str, Networks] = Networks.MAIN_NET,
+        transport: Optional[TransportConfig] = None,
+        retry: Optional[RetryPolicy] = ...,
+        circuit_breaker: Optional[CircuitBreakerPolicy] = ...,
+        payment_cache: Optional[PaymentCache] = None,
+        quote_cache: Optional[QuoteCache] = None,
+        json_codec: Optional[JSONCodec] = None,
+        dispatch: Optional[DispatchConfig] = None,
+        dedup_store: Optional[DedupStore] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
+        sessions: Optional[SessionManager] = None,
+        signature: Optional[SignatureConfig] = None,
+        journal: Optional[CallbackJournal] = None,
+        timeout: Optional[float] = None,
+        hedge: Optional[HedgePolicy] = None,
+        ledger: Optional[PaymentLedger] = None,
     ) -> None: ...
     
     async def create_payment(
+        self, payment_data: CreatePaymentRequest, timeout: Optional[float] = None
+    ) -> CreatePaymentResponse: ...
+    
+    def create_payments(
+        self,
+        payments: Union[
+            Iterable[CreatePaymentRequest], AsyncIterable[CreatePaymentRequest]
+        ],
+        concurrency: int = 10,
+        priority: Optional[Callable[[CreatePaymentRequest], Priority]] = None,
+        lookahead: int = 100,
+    ) -> AsyncIterator[BulkResult]: ...
+    
+    async def _create_payment_once(
         self, payment_data: CreatePaymentRequest
     ) -> CreatePaymentResponse: ...
     
-    async def get_payment(self, payment_id: str) -> GetPaymentResponse: ...
+    async def get_payment(
+        self,
+        payment_id: str,
+        use_cache: bool = True,
+        timeout: Optional[float] = None,
+    ) -> GetPaymentResponse: ...
+    
+    def get_payments(
+        self,
+        payment_ids: Union[Iterable[str], AsyncIterable[str]],
+        concurrency: int = 10,
+        ordered: bool = False,
+    ) -> AsyncIterator[BulkResult]: ...
     
     async def pre_calculate_payment(
-        self, payment_id: str, crypto_currency_id: int
+        self,
+        payment_id: str,
+        crypto_currency_id: int,
+        timeout: Optional[float] = None,
     ) -> PreCalculatePaymentResponse: ...
     
     async def detail_payment(
-        self, payment_id: str, detail_data: DetailPaymentRequest
+        self,
+        payment_id: str,
+        detail_data: DetailPaymentRequest,
+        timeout: Optional[float] = None,
     ) -> DetailPaymentResponse: ...
     
-    def check_callback_signature(self, body_text: str, signature: str) -> bool: ...
+    def check_callback_signature(
+        self, body: Union[bytes, str], signature: Optional[str]
+    ) -> bool: ...
     
     async def handle_callback(self, request: Request) -> Response: ...
     
+    async def dispatch_callback(
+        self, callback: CallbackRequest, app: Any = None
+    ) -> bool: ...
+    
+    def _count_callback(self, callback: CallbackRequest, result: str) -> None: ...
+    
+    def _count_invalid_callback(self, reason: str) -> None: ...
+    
+    async def _process_callback(self, callback: CallbackRequest, app: Any) -> None: ...
+    
+    async def run_callback_handlers(
+        self, callback: CallbackRequest, app: Any = None
+    ) -> None: ...
+    
+    async def drain_callbacks(self) -> None: ...
+    
     def register_callback_handler(
-        self, func: Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]]
+        self,
+        func: Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]],
+        statuses: Optional[Iterable[Union[str, PaymentStatus]]] = None,
+        crypto_currencies: Optional[Iterable[Optional[int]]] = None,
+        predicate: Optional[CallbackPredicate] = None,
     ) -> None: ...
     
     def callback_handler(
         self,
-        func: Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]],
-    ) -> Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]]: ...
+        func: Optional[
+            Callable[[CallbackRequest, Any], Coroutine[Any, Any, Any]]
+        ] = None,
+        *,
+        statuses: Optional[Iterable[Union[str, PaymentStatus]]] = None,
+        crypto_currencies: Optional[Iterable[Optional[int]]] = None,
+        predicate: Optional[CallbackPredicate] = None,
+    ) -> Any: ...
+    
+    async def close(self) -> None: ...
     
     async def __aenter__(self) -> "AioQuiqy": ...
     
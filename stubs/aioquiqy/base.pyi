@@ -1,21 +1,138 @@
 import asyncio
-import ssl
-from typing import Optional, Any, Dict
-from aiohttp import ClientSession, TCPConnector
+import threading
+from typing import (
+    Optional,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from aiohttp import ClientSession
 from aiohttp.typedefs import StrOrURL
+from pydantic import BaseModel
+from .codec import JSONCodec
+from .hedge import HedgePolicy, HedgeTracker
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+from .retry import CircuitBreaker, CircuitBreakerPolicy, RetryPolicy
+from .transport import TransportConfig
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+class SessionManager:
+    transport: TransportConfig
+    metrics: Optional[Metrics]
+    _sessions: Dict[asyncio.AbstractEventLoop, ClientSession]
+    _lock: threading.Lock
+    
+    def __init__(
+        self,
+        transport: Optional[TransportConfig] = None,
+        metrics: Optional[Metrics] = None,
+    ) -> None: ...
+    
+    def __len__(self) -> int: ...
+    
+    def get_session(self, **kwargs: Any) -> ClientSession: ...
+    
+    async def close(self) -> None: ...
+    
+    def _release_closed(self) -> None: ...
 
 class BaseClient:
-    _loop: asyncio.AbstractEventLoop
-    _session: Optional[ClientSession]
+    _owns_sessions: bool
+    _sessions: SessionManager
+    _transport: TransportConfig
+    _retry: RetryPolicy
+    _breaker_policy: Optional[CircuitBreakerPolicy]
+    _breakers: Dict[str, CircuitBreaker]
+    _json: JSONCodec
+    _rate_limiter: Optional[RateLimiter]
+    metrics: Optional[Metrics]
+    timeout: Optional[float]
+    _hedge: Optional[HedgeTracker]
     
-    def __init__(self) -> None: ...
+    def __init__(
+        self,
+        transport: Optional[TransportConfig] = None,
+        retry: Optional[RetryPolicy] = ...,
+        circuit_breaker: Optional[CircuitBreakerPolicy] = ...,
+        json_codec: Optional[JSONCodec] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
+        sessions: Optional[SessionManager] = None,
+        timeout: Optional[float] = None,
+        hedge: Optional[HedgePolicy] = None,
+    ) -> None: ...
     
     def get_session(self, **kwargs: Any) -> ClientSession: ...
     
+    def get_breaker(self, endpoint: str) -> Optional[CircuitBreaker]: ...
+    
     async def _make_request(
-        self, method: str, url: StrOrURL, **kwargs: Any
+        self,
+        method: str,
+        url: StrOrURL,
+        endpoint: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
     ) -> Dict[str, Any]: ...
     
+    async def _request_model(
+        self,
+        model: Type[ModelT],
+        method: str,
+        url: StrOrURL,
+        endpoint: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> ModelT: ...
+    
+    async def _request_raw(
+        self,
+        method: str,
+        url: StrOrURL,
+        endpoint: Optional[str] = None,
+        idempotent: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        hedged: bool = False,
+        **kwargs: Any,
+    ) -> bytes: ...
+    
+    async def _request_attempts(
+        self,
+        method: str,
+        url: StrOrURL,
+        endpoint: str,
+        idempotent: bool,
+        deadline: Optional[float],
+        **kwargs: Any,
+    ) -> bytes: ...
+    
+    def _get_retry_delay(
+        self,
+        attempt: int,
+        deadline: Optional[float],
+        retry_after: Optional[str] = None,
+    ) -> Optional[float]: ...
+    
+    async def _hedged(
+        self, endpoint: str, call: Callable[[], Awaitable[bytes]]
+    ) -> bytes: ...
+    
+    async def _send(
+        self, method: str, url: StrOrURL, endpoint: str, **kwargs: Any
+    ) -> Tuple[int, Optional[str], bytes]: ...
+    
+    def _count_retry(self, endpoint: str) -> None: ...
+    
+    def _count_hedge(self, endpoint: str) -> None: ...
+    
+    def _decode_error(self, body: bytes) -> Dict[str, Any]: ...
+    
     @staticmethod
     def _handle_error(status_code: int, error_data: Dict[str, Any]) -> None: ...
     
@@ -0,0 +1,32 @@
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+class BulkResult(NamedTuple):
+    key: Any
+    result: Any = ...
+    error: Optional[Exception] = ...
+    
+    @property
+    def ok(self) -> bool: ...
+
+def aiter_items(
+    items: Union[Iterable[Any], AsyncIterable[Any]]
+) -> AsyncIterator[Any]: ...
+
+def bounded_map(
+    func: Callable[[Any], Awaitable[Any]],
+    items: Union[Iterable[Any], AsyncIterable[Any]],
+    concurrency: int = 10,
+    ordered: bool = False,
+    priority: Optional[Callable[[Any], Any]] = None,
+    lookahead: int = 100,
+) -> AsyncIterator[BulkResult]: ...
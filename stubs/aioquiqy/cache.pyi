@@ -0,0 +1,97 @@
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional
+from .models.payment import (
+    CallbackRequest,
+    GetPaymentResponse,
+    PreCalculatePaymentResponse,
+)
+
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    
+    def __init__(
+        self,
+        hits: int = 0,
+        misses: int = 0,
+        evictions: int = 0,
+        expirations: int = 0,
+        invalidations: int = 0,
+    ) -> None: ...
+
+class TTLCache:
+    maxsize: int
+    stats: CacheStats
+    
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        on_remove: Optional[Callable[[Hashable, Any], None]] = None,
+    ) -> None: ...
+    
+    def __len__(self) -> int: ...
+    
+    def __contains__(self, key: Hashable) -> bool: ...
+    
+    def get(self, key: Hashable) -> Optional[Any]: ...
+    
+    def set(self, key: Hashable, value: Any, ttl: float) -> None: ...
+    
+    def pop(self, key: Hashable) -> Optional[Any]: ...
+    
+    def clear(self) -> None: ...
+
+class PaymentCache:
+    DEFAULT_TTLS: Mapping[str, float]
+    ttls: Dict[str, float]
+    version: int
+    
+    def __init__(
+        self, maxsize: int = 10000, ttls: Optional[Mapping[str, float]] = None
+    ) -> None: ...
+    
+    @property
+    def stats(self) -> CacheStats: ...
+    
+    def __len__(self) -> int: ...
+    
+    def get(self, payment_id: str) -> Optional[GetPaymentResponse]: ...
+    
+    def put(
+        self, response: GetPaymentResponse, version: Optional[int] = None
+    ) -> None: ...
+    
+    def invalidate(self, payment_id: str) -> None: ...
+    
+    def apply_callback(self, callback: CallbackRequest) -> None: ...
+    
+    def _invalidated_since(self, client_order_id: str, version: int) -> bool: ...
+    
+    def clear(self) -> None: ...
+
+class QuoteCache:
+    ttl: float
+    
+    def __init__(self, ttl: float = 2.0, maxsize: int = 10000) -> None: ...
+    
+    @property
+    def stats(self) -> CacheStats: ...
+    
+    def __len__(self) -> int: ...
+    
+    def get(
+        self, payment_id: str, crypto_currency_id: int
+    ) -> Optional[PreCalculatePaymentResponse]: ...
+    
+    def put(
+        self,
+        payment_id: str,
+        crypto_currency_id: int,
+        quote: PreCalculatePaymentResponse,
+    ) -> None: ...
+    
+    def invalidate(self, payment_id: str, crypto_currency_id: int) -> None: ...
+    
+    def clear(self) -> None: ...
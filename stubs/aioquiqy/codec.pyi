@@ -0,0 +1,21 @@
+from typing import Any, Callable, Union
+
+class JSONCodec:
+    loads: Callable[[Union[bytes, str]], Any]
+    dumps: Callable[[Any], bytes]
+    name: str
+    
+    def __init__(
+        self,
+        loads: Callable[[Union[bytes, str]], Any],
+        dumps: Callable[[Any], bytes],
+        name: str = "json",
+    ) -> None: ...
+
+STDLIB_CODEC: JSONCodec
+
+def orjson_codec() -> JSONCodec: ...
+
+def ujson_codec() -> JSONCodec: ...
+
+def fastest_codec() -> JSONCodec: ...
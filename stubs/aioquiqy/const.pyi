@@ -1,10 +1,16 @@
 from strenum import StrEnum
-from typing import List
+from typing import FrozenSet, List
 
 class HTTPMethods(StrEnum):
     POST: str
     GET: str
 
+class Endpoints(StrEnum):
+    CREATE: str
+    GET: str
+    CALCULATION: str
+    DETAIL: str
+
 class Networks(StrEnum):
     MAIN_NET: str
 
@@ -42,6 +48,8 @@ class PaymentStatus(StrEnum):
     UNDETECTED: str
     UNCONFIRMED: str
 
+TERMINAL_STATUSES: FrozenSet[str]
+
 class PaymentType(StrEnum):
     FORM: str
 
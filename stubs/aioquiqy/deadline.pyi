@@ -0,0 +1,14 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Iterator, Optional
+
+_deadline: ContextVar[Optional[float]]
+
+def get_deadline() -> Optional[float]: ...
+
+def resolve_deadline(timeout: Optional[float]) -> Optional[float]: ...
+
+@contextmanager
+def request_deadline(timeout: Optional[float]) -> Iterator[None]: ...
+
+async def with_deadline(timeout: Optional[float], awaitable: Awaitable[Any]) -> Any: ...
@@ -0,0 +1,26 @@
+from typing import Optional
+from .models.payment import CallbackRequest
+
+def callback_key(callback: CallbackRequest) -> str: ...
+
+class DedupStore:
+    async def seen(self, key: str) -> bool: ...
+    
+    async def forget(self, key: str) -> None: ...
+    
+    async def close(self) -> None: ...
+
+class MemoryDedupStore(DedupStore):
+    maxsize: int
+    ttl: Optional[float]
+    
+    def __init__(self, maxsize: int = 100000, ttl: Optional[float] = None) -> None: ...
+    
+    def __len__(self) -> int: ...
+
+class SQLiteDedupStore(DedupStore):
+    PURGE_EVERY: int
+    path: str
+    ttl: float
+    
+    def __init__(self, path: str, ttl: float = ...) -> None: ...
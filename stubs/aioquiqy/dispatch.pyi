@@ -0,0 +1,46 @@
+import logging
+from typing import Any, Awaitable, Callable, Optional, Sequence
+from .metrics import Metrics
+from .models.payment import CallbackRequest
+
+logger: logging.Logger
+
+CallbackHandler = Callable[[CallbackRequest, Any], Awaitable[Any]]
+
+class DispatchConfig:
+    concurrent: bool
+    fast_ack: bool
+    workers: int
+    queue_size: int
+    drain_timeout: Optional[float]
+    
+    def __init__(
+        self,
+        concurrent: bool = False,
+        fast_ack: bool = False,
+        workers: int = 4,
+        queue_size: int = 1000,
+        drain_timeout: Optional[float] = 30.0,
+    ) -> None: ...
+
+async def run_handlers(
+    handlers: Sequence[CallbackHandler],
+    callback: CallbackRequest,
+    app: Any,
+    concurrent: bool = False,
+    metrics: Optional[Metrics] = None,
+) -> None: ...
+
+class CallbackQueue:
+    def __init__(
+        self,
+        process: Callable[[CallbackRequest, Any], Awaitable[Any]],
+        workers: int = 4,
+        maxsize: int = 1000,
+    ) -> None: ...
+    
+    def __len__(self) -> int: ...
+    
+    def submit(self, callback: CallbackRequest, app: Any) -> bool: ...
+    
+    async def drain(self, timeout: Optional[float] = None) -> None: ...
@@ -1,3 +1,4 @@
 from .factory import QuiqyAPIError
+from .client import QuiqyClientError, CircuitOpenError, DeadlineExceededError
 
 __all__: list[str]
@@ -0,0 +1,19 @@
+import asyncio
+
+class QuiqyClientError(Exception): ...
+
+class CircuitOpenError(QuiqyClientError):
+    endpoint: str
+    retry_after: float
+    
+    def __init__(self, endpoint: str, retry_after: float) -> None: ...
+    
+    def __str__(self) -> str: ...
+
+class DeadlineExceededError(QuiqyClientError, asyncio.TimeoutError):
+    endpoint: str
+    timeout: float
+    
+    def __init__(self, endpoint: str, timeout: float) -> None: ...
+    
+    def __str__(self) -> str: ...
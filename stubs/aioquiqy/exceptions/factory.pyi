@@ -1,7 +1,15 @@
-import gc
-from typing import Optional, Type, Union
+from typing import Any, Dict, Optional, Tuple, Type
 
-class QuiqyAPIError(Exception):
+class QuiqyAPIErrorMeta(type):
+    def __call__(  # type: ignore[override]
+        cls,
+        code: Optional[int] = None,
+        name: Optional[str] = None,
+        hint: Optional[str] = None,
+    ) -> Any: ...
+
+class QuiqyAPIError(Exception, metaclass=QuiqyAPIErrorMeta):
+    status_code: Optional[int]
     code: Optional[int]
     name: Optional[str]
     hint: Optional[str]
@@ -13,14 +21,6 @@ class QuiqyAPIError(Exception):
         hint: Optional[str] = None,
     ) -> None: ...
     
-    @classmethod
-    def __call__(
-        cls,
-        code: Optional[int] = None,
-        name: Optional[str] = None,
-        hint: Optional[str] = None,
-    ) -> Union["QuiqyAPIError", Type["QuiqyAPIError"]]: ...
-    
     @classmethod
     def exception_to_handle(cls, code: Optional[int] = None) -> Type["QuiqyAPIError"]: ...
     
@@ -32,4 +32,6 @@ class QuiqyAPIError(Exception):
     @classmethod
     def generate_exc_classname(cls, code: Optional[int]) -> str: ...
     
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]: ...
+    
     def __str__(self) -> str: ...
@@ -0,0 +1,45 @@
+from typing import Deque, Dict, Optional
+
+class HedgePolicy:
+    delay: Optional[float]
+    percentile: float
+    window: int
+    min_samples: int
+    min_delay: float
+    max_delay: float
+    
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        percentile: float = 0.95,
+        window: int = 256,
+        min_samples: int = 20,
+        min_delay: float = 0.005,
+        max_delay: float = 1.0,
+    ) -> None: ...
+    
+    def __post_init__(self) -> None: ...
+
+class LatencyWindow:
+    samples: Deque[float]
+    _refresh_every: int
+    _pending: int
+    _cached: Dict[float, float]
+    
+    def __init__(self, size: int) -> None: ...
+    
+    def __len__(self) -> int: ...
+    
+    def observe(self, latency: float) -> None: ...
+    
+    def percentile(self, q: float) -> float: ...
+
+class HedgeTracker:
+    policy: HedgePolicy
+    _windows: Dict[str, LatencyWindow]
+    
+    def __init__(self, policy: HedgePolicy) -> None: ...
+    
+    def observe(self, endpoint: str, latency: float) -> None: ...
+    
+    def get_delay(self, endpoint: str) -> float: ...
@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+import logging
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Collection,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from .api import AioQuiqy
+from .models.payment import CallbackRequest
+
+logger: logging.Logger
+
+SEGMENT_MAGIC: bytes
+SEGMENT_SUFFIX: str
+RECORD_HEADER: struct.Struct
+
+class JournalRecord(NamedTuple):
+    received_at: float
+    payment_status: str
+    client_order_id: str
+    body: bytes
+    
+    def parse(self) -> CallbackRequest: ...
+
+class ReplayResult(NamedTuple):
+    replayed: int
+    failed: int
+
+def encode_record(
+    body: bytes, payment_status: str, client_order_id: str, received_at: float
+) -> bytes: ...
+
+class CallbackJournal:
+    path: Path
+    segment_size: int
+    fsync: bool
+    durable_ack: bool
+    written: int
+    _pending: List[Tuple[float, bytes]]
+    _pending_done: Optional[asyncio.Future[None]]
+    _inflight_done: Optional[asyncio.Future[None]]
+    _flushing: bool
+    _flusher: Optional[asyncio.Task[None]]
+    _executor: ThreadPoolExecutor
+    _file: Optional[BinaryIO]
+    _size: int
+    _closed: bool
+    
+    def __init__(
+        self,
+        path: Union[str, Path],
+        segment_size: int = ...,
+        fsync: bool = True,
+        durable_ack: bool = False,
+    ) -> None: ...
+    
+    def append(
+        self,
+        body: bytes,
+        callback: CallbackRequest,
+        received_at: Optional[float] = None,
+    ) -> None: ...
+    
+    async def commit(self) -> None: ...
+    
+    async def close(self) -> None: ...
+    
+    async def _flush(self) -> None: ...
+    
+    def _finish_batch(self, error: Optional[BaseException]) -> None: ...
+    
+    def _write(self, batch: List[Tuple[float, bytes]]) -> None: ...
+    
+    def _open_segment(self, started_at: float) -> None: ...
+    
+    def _close_segment(self) -> None: ...
+
+def _fsync_directory(path: Path) -> None: ...
+
+def segment_paths(path: Union[str, Path]) -> List[Path]: ...
+
+def read_segment(
+    data: bytes,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    statuses: Optional[Collection[str]] = None,
+    client_order_ids: Optional[Collection[str]] = None,
+    name: str = "segment",
+) -> Iterator[JournalRecord]: ...
+
+def _segment_starts(paths: List[Path]) -> List[float]: ...
+
+def _select_segments(
+    path: Union[str, Path], since: Optional[float], until: Optional[float]
+) -> List[Path]: ...
+
+def read_journal(
+    path: Union[str, Path],
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    statuses: Optional[Collection[str]] = None,
+    client_order_ids: Optional[Collection[str]] = None,
+) -> Iterator[JournalRecord]: ...
+
+async def replay(
+    client: AioQuiqy,
+    path: Union[str, Path],
+    app: Any = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    statuses: Optional[Collection[str]] = None,
+    client_order_ids: Optional[Collection[str]] = None,
+    concurrency: int = 1,
+) -> ReplayResult: ...
+
+def parse_time(value: str) -> float: ...
+
+def load_client(spec: str) -> AioQuiqy: ...
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace: ...
+
+async def run_replay(args: argparse.Namespace) -> ReplayResult: ...
+
+def main(argv: Optional[List[str]] = None) -> None: ...
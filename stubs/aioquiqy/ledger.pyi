@@ -0,0 +1,124 @@
+from datetime import datetime
+from typing import Collection, Dict, Iterator, List, Optional, Set, Union
+from .cache import TTLCache
+from .const import PaymentStatus
+from .models.payment import CallbackRequest, CreatePaymentResponse, PaymentResponse
+
+_STATUSES: Dict[str, PaymentStatus]
+
+def intern_status(status: str) -> PaymentStatus: ...
+
+def utc_timestamp(moment: datetime) -> float: ...
+
+class PaymentRecord:
+    id: Optional[str]
+    client_order_id: str
+    status: PaymentStatus
+    amount_fiat: float
+    fiat_currency_id: int
+    amount_crypto: Optional[float]
+    crypto_currency_id: Optional[int]
+    expires_at: float
+    updated_at: float
+    
+    def __init__(
+        self,
+        id: Optional[str],
+        client_order_id: str,
+        status: PaymentStatus,
+        amount_fiat: float,
+        fiat_currency_id: int,
+        amount_crypto: Optional[float],
+        crypto_currency_id: Optional[int],
+        expires_at: float,
+        updated_at: float,
+    ) -> None: ...
+    
+    def __repr__(self) -> str: ...
+    
+    def expires_in(self, now: Optional[float] = None) -> float: ...
+
+class PaymentLedger:
+    resolution: float
+    closed_ttl: float
+    _by_id: Dict[str, PaymentRecord]
+    _by_order: Dict[str, PaymentRecord]
+    _by_status: Dict[PaymentStatus, Set[PaymentRecord]]
+    _expiry: Dict[int, Set[PaymentRecord]]
+    _expiry_slots: List[int]
+    _closed: TTLCache
+    
+    def __init__(
+        self,
+        resolution: float = 1.0,
+        closed_size: int = 100000,
+        closed_ttl: float = 3600.0,
+    ) -> None: ...
+    
+    def __len__(self) -> int: ...
+    
+    def __contains__(self, client_order_id: object) -> bool: ...
+    
+    def __iter__(self) -> Iterator[PaymentRecord]: ...
+    
+    def get(self, payment_id: str) -> Optional[PaymentRecord]: ...
+    
+    def get_by_order(self, client_order_id: str) -> Optional[PaymentRecord]: ...
+    
+    def count(self, status: str) -> int: ...
+    
+    def with_status(self, *statuses: str) -> List[PaymentRecord]: ...
+    
+    def expiring(
+        self,
+        within: float,
+        statuses: Optional[Collection[str]] = None,
+        now: Optional[float] = None,
+    ) -> List[PaymentRecord]: ...
+    
+    def expired(
+        self,
+        statuses: Optional[Collection[str]] = None,
+        now: Optional[float] = None,
+    ) -> List[PaymentRecord]: ...
+    
+    def apply_payment(
+        self, payment: Union[PaymentResponse, CreatePaymentResponse]
+    ) -> Optional[PaymentRecord]: ...
+    
+    def apply_callback(self, callback: CallbackRequest) -> Optional[PaymentRecord]: ...
+    
+    def remove(self, client_order_id: str) -> Optional[PaymentRecord]: ...
+    
+    def clear(self) -> None: ...
+    
+    def _apply(
+        self,
+        record: Optional[PaymentRecord],
+        payment_id: Optional[str],
+        client_order_id: str,
+        status: str,
+        amount_fiat: float,
+        fiat_currency_id: int,
+        amount_crypto: Optional[float],
+        crypto_currency_id: Optional[int],
+        expires_at: float,
+        updated_at: float,
+    ) -> Optional[PaymentRecord]: ...
+    
+    def _unindex(self, record: PaymentRecord) -> None: ...
+    
+    def _discard_status(self, record: PaymentRecord) -> None: ...
+    
+    def _slot(self, expires_at: float) -> int: ...
+    
+    def _index_expiry(self, record: PaymentRecord) -> None: ...
+    
+    def _unindex_expiry(self, record: PaymentRecord) -> None: ...
+    
+    def _between(
+        self,
+        start: float,
+        end: float,
+        statuses: Optional[Collection[str]],
+    ) -> List[PaymentRecord]: ...
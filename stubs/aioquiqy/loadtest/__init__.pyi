@@ -0,0 +1,4 @@
+from .runner import LatencyRecorder, LoadConfig, run_load, start_webhook
+from .server import FakeQuiqyServer, FakeServerConfig
+
+__all__: list[str]
@@ -0,0 +1,59 @@
+import random
+from collections import Counter
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
+from aiohttp import web
+from ..api import AioQuiqy
+
+T = TypeVar("T")
+
+FLOWS: Tuple[str, ...]
+
+class LoadConfig:
+    rate: float
+    duration: float
+    flow: str
+    poisson: bool
+    max_in_flight: int
+    drain_timeout: float
+    seed: Optional[int]
+    
+    def __init__(
+        self,
+        rate: float = 50.0,
+        duration: float = 30.0,
+        flow: str = "checkout",
+        poisson: bool = True,
+        max_in_flight: int = 10000,
+        drain_timeout: float = 60.0,
+        seed: Optional[int] = None,
+    ) -> None: ...
+
+class LatencyRecorder:
+    started: float
+    samples: Dict[str, List[float]]
+    errors: Dict[str, Counter]
+    
+    def __init__(self) -> None: ...
+    
+    def record(self, name: str, seconds: float) -> None: ...
+    
+    def error(self, name: str, exc: BaseException) -> None: ...
+    
+    async def timed(self, name: str, awaitable: Awaitable[T]) -> T: ...
+    
+    def summary(self) -> Dict[str, Dict[str, Any]]: ...
+
+def percentile(samples: List[float], q: float) -> float: ...
+
+async def start_webhook(
+    client: AioQuiqy, recorder: LatencyRecorder, host: str = "127.0.0.1", port: int = 0
+) -> web.AppRunner: ...
+
+async def run_load(
+    client: AioQuiqy,
+    config: LoadConfig,
+    callback_url: str,
+    recorder: LatencyRecorder,
+) -> Dict[str, Any]: ...
+
+def count_callbacks(client: AioQuiqy, counter: Counter, delay: float = 0.0) -> None: ...
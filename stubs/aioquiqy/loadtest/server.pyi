@@ -0,0 +1,74 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+from aiohttp import web
+from ..signature import SignatureConfig
+
+logger: logging.Logger
+
+RATES: Dict[int, float]
+FEE_RATE: float
+
+class FakeServerConfig:
+    latency: float
+    jitter: float
+    error_rate: float
+    throttle_rate: float
+    ttl: int
+    detect_after: float
+    confirm_after: float
+    abandon_rate: float
+    unconfirm_rate: float
+    callback_url: Optional[str]
+    callback_attempts: int
+    callback_timeout: float
+    callback_signature: Optional[SignatureConfig]
+    seed: Optional[int]
+    
+    def __init__(
+        self,
+        latency: float = 0.02,
+        jitter: float = 0.01,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        ttl: int = 900,
+        detect_after: float = 1.0,
+        confirm_after: float = 1.0,
+        abandon_rate: float = 0.1,
+        unconfirm_rate: float = 0.01,
+        callback_url: Optional[str] = None,
+        callback_attempts: int = 3,
+        callback_timeout: float = 10.0,
+        callback_signature: Optional[SignatureConfig] = None,
+        seed: Optional[int] = None,
+    ) -> None: ...
+
+class FakeQuiqyServer:
+    config: FakeServerConfig
+    payments: Dict[str, Dict[str, Any]]
+    requests: int
+    injected_errors: int
+    callbacks_sent: int
+    callbacks_failed: int
+    url: str
+    
+    def __init__(self, config: Optional[FakeServerConfig] = None) -> None: ...
+    
+    def build_app(self) -> web.Application: ...
+    
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str: ...
+    
+    async def stop(self) -> None: ...
+    
+    async def wait_callbacks(self) -> None: ...
+    
+    @property
+    def open_payments(self) -> int: ...
+    
+    async def create_payment(self, request: web.Request) -> web.Response: ...
+    
+    async def get_payment(self, request: web.Request) -> web.Response: ...
+    
+    async def calculate(self, request: web.Request) -> web.Response: ...
+    
+    async def detail_payment(self, request: web.Request) -> web.Response: ...
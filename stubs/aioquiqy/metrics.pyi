@@ -0,0 +1,53 @@
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from aiohttp import BaseConnector, TraceConfig
+
+Labels = Tuple[Tuple[str, str], ...]
+MetricSink = Callable[[str, Dict[str, str], float], None]
+
+DEFAULT_BUCKETS: Tuple[float, ...]
+DESCRIPTIONS: Dict[str, str]
+
+class Histogram:
+    buckets: Tuple[float, ...]
+    counts: List[int]
+    sum: float
+    count: int
+    
+    def __init__(self, buckets: Sequence[float] = ...) -> None: ...
+    
+    def observe(self, value: float) -> None: ...
+    
+    def cumulative(self) -> List[Tuple[str, int]]: ...
+
+class Metrics:
+    buckets: Tuple[float, ...]
+    counters: Dict[str, Dict[Labels, float]]
+    gauges: Dict[str, Dict[Labels, float]]
+    histograms: Dict[str, Dict[Labels, Histogram]]
+    const_labels: Dict[str, str]
+    
+    def __init__(self, buckets: Sequence[float] = ...) -> None: ...
+    
+    def with_labels(self, **labels: str) -> Metrics: ...
+    
+    def add_sink(self, sink: MetricSink) -> None: ...
+    
+    def add_collector(self, name: str, collector: Callable[[Metrics], None]) -> None: ...
+    
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None: ...
+    
+    def set_gauge(self, name: str, value: float, **labels: str) -> None: ...
+    
+    def add_gauge(self, name: str, value: float, **labels: str) -> None: ...
+    
+    def observe(self, name: str, value: float, **labels: str) -> None: ...
+    
+    def collect(self) -> None: ...
+    
+    def render_prometheus(self) -> str: ...
+    
+    def trace_config(self) -> TraceConfig: ...
+    
+    def watch_connector(self, connector: BaseConnector, pool: str = "default") -> None: ...
+
+def handler_name(handler: Callable[..., Any]) -> str: ...
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 from ..const import (
@@ -8,6 +8,8 @@ from ..const import (
     CryptoCurrencies,
 )
 
+DEFERRED: ConfigDict
+
 class CreatePaymentRequest(BaseModel):
     amount_fiat: float
     callback_url: str
@@ -117,6 +119,9 @@ class CallbackRequest(BaseModel):
     @field_validator("crypto_currency_id")
     @classmethod
     def validate_crypto_currency_id(cls, v: Optional[int]) -> Optional[int]: ...
+    
+    @classmethod
+    def from_payment(cls, payment: PaymentResponse) -> "CallbackRequest": ...
 
 class CallbackResponse(BaseModel):
     class Config:
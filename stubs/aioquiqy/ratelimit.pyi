@@ -0,0 +1,64 @@
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Awaitable, Dict, Iterator, Mapping, Optional
+
+class Priority(IntEnum):
+    INTERACTIVE: int
+    BULK: int
+
+def get_priority() -> Priority: ...
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]: ...
+
+async def with_priority(priority: Priority, awaitable: Awaitable[Any]) -> Any: ...
+
+class TokenBucket:
+    base_rate: float
+    rate: float
+    capacity: float
+    min_rate: float
+    
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        min_rate: Optional[float] = None,
+    ) -> None: ...
+    
+    @property
+    def tokens(self) -> float: ...
+    
+    @property
+    def waiting(self) -> int: ...
+    
+    async def acquire(self, priority: Optional[Priority] = None) -> None: ...
+    
+    def on_throttled(self, retry_after: Optional[float] = None) -> None: ...
+    
+    def on_success(self) -> None: ...
+
+class RateLimiter:
+    rates: Dict[str, float]
+    burst: Dict[str, float]
+    default_rate: Optional[float]
+    
+    def __init__(
+        self,
+        rates: Mapping[str, float],
+        burst: Optional[Mapping[str, float]] = None,
+        default_rate: Optional[float] = None,
+    ) -> None: ...
+    
+    @classmethod
+    def uniform(cls, rate: float) -> "RateLimiter": ...
+    
+    def copy(self) -> "RateLimiter": ...
+    
+    def get_bucket(self, endpoint: str) -> Optional[TokenBucket]: ...
+    
+    async def acquire(self, endpoint: str, priority: Optional[Priority] = None) -> None: ...
+    
+    def on_throttled(self, endpoint: str, retry_after: Optional[float] = None) -> None: ...
+    
+    def on_success(self, endpoint: str) -> None: ...
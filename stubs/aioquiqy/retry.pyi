@@ -0,0 +1,59 @@
+from typing import FrozenSet, Optional
+from strenum import StrEnum
+from .exceptions import CircuitOpenError
+
+class RetryPolicy:
+    max_attempts: int
+    backoff_base: float
+    backoff_max: float
+    jitter: bool
+    retry_statuses: FrozenSet[int]
+    retry_unsafe: bool
+    respect_retry_after: bool
+    max_retry_after: float
+    
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.2,
+        backoff_max: float = 10.0,
+        jitter: bool = True,
+        retry_statuses: FrozenSet[int] = ...,
+        retry_unsafe: bool = False,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 60.0,
+    ) -> None: ...
+    
+    def can_retry(self, attempt: int, idempotent: bool) -> bool: ...
+    
+    def get_delay(self, attempt: int, retry_after: Optional[str] = None) -> float: ...
+
+def parse_retry_after(value: str) -> Optional[float]: ...
+
+class CircuitBreakerPolicy:
+    failure_threshold: int
+    recovery_timeout: float
+    
+    def __init__(
+        self, failure_threshold: int = 5, recovery_timeout: float = 30.0
+    ) -> None: ...
+
+class CircuitState(StrEnum):
+    CLOSED: str
+    OPEN: str
+    HALF_OPEN: str
+
+class CircuitBreaker:
+    endpoint: str
+    policy: CircuitBreakerPolicy
+    state: CircuitState
+    
+    def __init__(self, endpoint: str, policy: CircuitBreakerPolicy) -> None: ...
+    
+    def before_call(self) -> None: ...
+    
+    def release(self) -> None: ...
+    
+    def record_success(self) -> None: ...
+    
+    def record_failure(self) -> None: ...
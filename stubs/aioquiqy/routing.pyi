@@ -0,0 +1,42 @@
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from .const import PaymentStatus
+from .dispatch import CallbackHandler
+from .models.payment import CallbackRequest
+
+CallbackPredicate = Callable[[CallbackRequest], bool]
+
+class Route(NamedTuple):
+    handler: CallbackHandler
+    statuses: Optional[FrozenSet[str]] = ...
+    crypto_currencies: Optional[FrozenSet[Optional[int]]] = ...
+    predicate: Optional[CallbackPredicate] = ...
+    
+    def accepts(self, status: str, crypto_currency_id: Optional[int]) -> bool: ...
+
+class HandlerRouter:
+    def __init__(self) -> None: ...
+    
+    def __len__(self) -> int: ...
+    
+    @property
+    def handlers(self) -> List[CallbackHandler]: ...
+    
+    def add(
+        self,
+        handler: CallbackHandler,
+        statuses: Optional[Iterable[Union[str, PaymentStatus]]] = None,
+        crypto_currencies: Optional[Iterable[Optional[int]]] = None,
+        predicate: Optional[CallbackPredicate] = None,
+    ) -> None: ...
+    
+    def match(self, callback: CallbackRequest) -> List[CallbackHandler]: ...
@@ -0,0 +1,36 @@
+import hmac
+from typing import Optional, Union
+
+class SignatureConfig:
+    secret: Union[str, bytes]
+    header: str
+    digest: str
+    encoding: str
+    prefix: str
+    max_body_size: int
+    
+    def __init__(
+        self,
+        secret: Union[str, bytes],
+        header: str = "X-Quiqy-Signature",
+        digest: str = "sha256",
+        encoding: str = "hex",
+        prefix: str = "",
+        max_body_size: int = ...,
+    ) -> None: ...
+
+class SignatureVerifier:
+    config: SignatureConfig
+    header: str
+    max_body_size: int
+    _mac: hmac.HMAC
+    _prefix: str
+    _hex: bool
+    
+    def __init__(self, config: SignatureConfig) -> None: ...
+    
+    def digest(self, body: bytes) -> bytes: ...
+    
+    def sign(self, body: bytes) -> str: ...
+    
+    def verify(self, body: bytes, signature: Optional[str]) -> bool: ...
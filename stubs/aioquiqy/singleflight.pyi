@@ -0,0 +1,8 @@
+from typing import Any, Awaitable, Callable, Hashable
+
+class SingleFlight:
+    def __init__(self) -> None: ...
+    
+    def __len__(self) -> int: ...
+    
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any: ...
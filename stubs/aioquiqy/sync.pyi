@@ -0,0 +1,94 @@
+import asyncio
+from concurrent.futures import Future
+from typing import Any, Coroutine, Iterable, List, Optional, TypeVar, Union
+from .api import AioQuiqy
+from .bulk import BulkResult
+from .const import Networks
+from .models.payment import (
+    CreatePaymentRequest,
+    CreatePaymentResponse,
+    DetailPaymentRequest,
+    DetailPaymentResponse,
+    GetPaymentResponse,
+    PreCalculatePaymentResponse,
+)
+
+T = TypeVar("T")
+
+class BackgroundLoop:
+    name: str
+    
+    def __init__(self, name: str = "aioquiqy-loop") -> None: ...
+    
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop: ...
+    
+    def track(self, client: AioQuiqy) -> None: ...
+    
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]: ...
+    
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T: ...
+    
+    def stop(self, timeout: float = 5.0) -> None: ...
+
+def get_background_loop() -> BackgroundLoop: ...
+
+class SyncQuiqy:
+    DEADLINE_GRACE: float
+    timeout: Optional[float]
+    client: AioQuiqy
+    
+    def __init__(
+        self,
+        api_key: str,
+        network: Union[str, Networks] = Networks.MAIN_NET,
+        timeout: Optional[float] = None,
+        background: Optional[BackgroundLoop] = None,
+        **kwargs: Any,
+    ) -> None: ...
+    
+    def _run(
+        self,
+        coro: Coroutine[Any, Any, T],
+        timeout: Optional[float] = None,
+        per_call: bool = True,
+    ) -> T: ...
+    
+    def create_payment(
+        self, payment_data: CreatePaymentRequest, timeout: Optional[float] = None
+    ) -> CreatePaymentResponse: ...
+    
+    def get_payment(
+        self,
+        payment_id: str,
+        use_cache: bool = True,
+        timeout: Optional[float] = None,
+    ) -> GetPaymentResponse: ...
+    
+    def get_payments(
+        self, payment_ids: Iterable[str], concurrency: int = 10
+    ) -> List[BulkResult]: ...
+    
+    def create_payments(
+        self, payments: Iterable[CreatePaymentRequest], concurrency: int = 10
+    ) -> List[BulkResult]: ...
+    
+    def pre_calculate_payment(
+        self,
+        payment_id: str,
+        crypto_currency_id: int,
+        timeout: Optional[float] = None,
+    ) -> PreCalculatePaymentResponse: ...
+    
+    def detail_payment(
+        self,
+        payment_id: str,
+        detail_data: DetailPaymentRequest,
+        timeout: Optional[float] = None,
+    ) -> DetailPaymentResponse: ...
+    
+    def close(self) -> None: ...
+    
+    def __enter__(self) -> SyncQuiqy: ...
+    
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None: ...
@@ -0,0 +1,51 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional, Set, Tuple, Union
+from .api import AioQuiqy
+from .base import SessionManager
+from .const import Networks
+from .metrics import Metrics
+from .ratelimit import RateLimiter
+from .transport import TransportConfig
+
+class ClientPool:
+    network: Union[str, Networks]
+    metrics: Optional[Metrics]
+    maxsize: Optional[int]
+    sessions: SessionManager
+    _rate_limiter: Optional[RateLimiter]
+    _client_kwargs: Dict[str, Any]
+    _clients: OrderedDict[str, Tuple[str, AioQuiqy]]
+    _closing: Set[asyncio.Future[None]]
+    
+    def __init__(
+        self,
+        network: Union[str, Networks] = ...,
+        transport: Optional[TransportConfig] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        metrics: Optional[Metrics] = None,
+        maxsize: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None: ...
+    
+    def __len__(self) -> int: ...
+    
+    def __contains__(self, merchant_id: object) -> bool: ...
+    
+    def __iter__(self) -> Iterator[str]: ...
+    
+    def add(self, merchant_id: str, api_key: str, **kwargs: Any) -> AioQuiqy: ...
+    
+    def get(self, merchant_id: str, api_key: Optional[str] = None) -> AioQuiqy: ...
+    
+    def __getitem__(self, merchant_id: str) -> AioQuiqy: ...
+    
+    async def evict(self, merchant_id: str) -> None: ...
+    
+    def _retire(self, client: AioQuiqy) -> None: ...
+    
+    async def close(self) -> None: ...
+    
+    async def __aenter__(self) -> ClientPool: ...
+    
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None: ...
@@ -0,0 +1,38 @@
+import ssl
+from typing import Optional
+from aiohttp import BaseConnector, ClientTimeout, TCPConnector
+
+def get_ssl_context(cafile: Optional[str] = None) -> ssl.SSLContext: ...
+
+class TransportConfig:
+    limit: int
+    limit_per_host: int
+    keepalive_timeout: float
+    ttl_dns_cache: Optional[int]
+    total_timeout: Optional[float]
+    connect_timeout: Optional[float]
+    sock_read_timeout: Optional[float]
+    cafile: Optional[str]
+    connector: Optional[BaseConnector]
+    
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        ttl_dns_cache: Optional[int] = 10,
+        total_timeout: Optional[float] = 300.0,
+        connect_timeout: Optional[float] = None,
+        sock_read_timeout: Optional[float] = None,
+        cafile: Optional[str] = None,
+        connector: Optional[BaseConnector] = None,
+    ) -> None: ...
+    
+    @property
+    def connector_owner(self) -> bool: ...
+    
+    def build_connector(self) -> TCPConnector: ...
+    
+    def get_connector(self) -> BaseConnector: ...
+    
+    def build_timeout(self) -> ClientTimeout: ...
@@ -1,4 +1,11 @@
-from typing import Union
+from decimal import Context, Decimal
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Union
+
+Amount = Union[int, float, str, Decimal]
+
+_CONTEXT: Context
+INTEGER_ROUNDINGS: FrozenSet[str]
+DEFAULT_PLACES: int
 
 def calculate_crypto_amount(fiat_amount: float, rate: float) -> float: ...
 
@@ -7,3 +14,96 @@ def calculate_fiat_amount(crypto_amount: float, rate: float) -> float: ...
 def get_payment_url(payment_id: str) -> str: ...
 
 def format_currency_amount(amount: Union[int, float], currency: str) -> str: ...
+
+class CurrencySpec:
+    code: str
+    places: int
+    rounding: str
+    display_places: Optional[int]
+    
+    def __init__(
+        self,
+        code: str,
+        places: int,
+        rounding: str = ...,
+        display_places: Optional[int] = None,
+    ) -> None: ...
+    
+    @property
+    def quantum(self) -> Decimal: ...
+
+CURRENCIES: Dict[str, CurrencySpec]
+
+def _quantum(places: int) -> Decimal: ...
+
+def get_currency(currency: Union[str, CurrencySpec]) -> CurrencySpec: ...
+
+def to_decimal(amount: Amount) -> Decimal: ...
+
+def quantize_amounts(
+    amounts: Iterable[Amount], currency: Union[str, CurrencySpec]
+) -> List[Decimal]: ...
+
+def convert_amounts(
+    amounts: Iterable[Amount],
+    rate: Amount,
+    currency: Union[str, CurrencySpec],
+    inverse: bool = False,
+) -> List[Decimal]: ...
+
+def to_minor_units(
+    amounts: Iterable[Amount], currency: Union[str, CurrencySpec]
+) -> Any: ...
+
+def from_minor_units(
+    units: Iterable[int], currency: Union[str, CurrencySpec]
+) -> List[Decimal]: ...
+
+def convert_minor_units(
+    units: Iterable[int],
+    rate: Amount,
+    source: Union[str, CurrencySpec],
+    target: Union[str, CurrencySpec],
+) -> Any: ...
+
+class CurrencyFormatter:
+    spec: CurrencySpec
+    places: int
+    _quantum: Decimal
+    _suffix: str
+    _template: str
+    _divisor: int
+    _scale: int
+    _unit: int
+    
+    def __init__(self, currency: Union[str, CurrencySpec]) -> None: ...
+    
+    def format(self, amount: Amount) -> str: ...
+    
+    def format_minor(self, units: int) -> str: ...
+    
+    def format_many(self, amounts: Iterable[Amount]) -> List[str]: ...
+    
+    def format_many_minor(self, units: Iterable[int]) -> List[str]: ...
+
+def get_formatter(currency: Union[str, CurrencySpec]) -> CurrencyFormatter: ...
+
+def format_amounts(
+    amounts: Iterable[Amount], currency: Union[str, CurrencySpec]
+) -> List[str]: ...
+
+def format_minor_units(
+    units: Iterable[int], currency: Union[str, CurrencySpec]
+) -> List[str]: ...
+
+def _div_round(numerator: int, denominator: int, rounding: str) -> int: ...
+
+def _numpy_of(values: Any) -> Any: ...
+
+def _values(values: Iterable[Any]) -> Iterable[Any]: ...
+
+def _int_array(np: Any, values: List[int]) -> Any: ...
+
+def _convert_array(
+    np: Any, units: Any, numerator: int, denominator: int, rounding: str
+) -> Any: ...
@@ -0,0 +1,55 @@
+import logging
+from typing import Any, Mapping, Optional
+from .api import AioQuiqy
+
+logger: logging.Logger
+
+class WatchPolicy:
+    intervals: Mapping[str, float]
+    default_interval: float
+    min_interval: float
+    max_interval: float
+    expiry_margin: float
+    error_interval: float
+    concurrency: int
+    rate: Optional[float]
+    
+    def __init__(
+        self,
+        intervals: Mapping[str, float] = ...,
+        default_interval: float = 15.0,
+        min_interval: float = 1.0,
+        max_interval: float = 300.0,
+        expiry_margin: float = 2.0,
+        error_interval: float = 30.0,
+        concurrency: int = 20,
+        rate: Optional[float] = 10.0,
+    ) -> None: ...
+
+class PaymentWatcher:
+    client: AioQuiqy
+    policy: WatchPolicy
+    app: Any
+    
+    def __init__(
+        self,
+        client: AioQuiqy,
+        policy: Optional[WatchPolicy] = None,
+        app: Any = None,
+    ) -> None: ...
+    
+    def __len__(self) -> int: ...
+    
+    def __contains__(self, payment_id: str) -> bool: ...
+    
+    def watch(
+        self, payment_id: str, status: Optional[str] = None, delay: float = 0.0
+    ) -> None: ...
+    
+    def unwatch(self, payment_id: str) -> None: ...
+    
+    def start(self) -> None: ...
+    
+    async def stop(self) -> None: ...
+    
+    async def run(self) -> None: ...
@@ -0,0 +1,49 @@
+from typing import AsyncIterator, Awaitable, Callable, List
+
+import pytest
+import pytest_asyncio
+
+from aioquiqy import AioQuiqy
+from aioquiqy.loadtest.server import FakeQuiqyServer, FakeServerConfig
+from aioquiqy.models.payment import CreatePaymentRequest
+
+ClientFactory = Callable[..., AioQuiqy]
+
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[FakeQuiqyServer]:
+    server = FakeQuiqyServer(FakeServerConfig(latency=0.0, jitter=0.0, seed=1))
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest_asyncio.fixture
+async def make_client(server: FakeQuiqyServer) -> AsyncIterator[ClientFactory]:
+    """Clients of the fake server, closed after the test."""
+    clients: List[AioQuiqy] = []
+
+    def make(**kwargs: object) -> AioQuiqy:
+        client = AioQuiqy("test-key", network=server.url, **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        await client.close()
+
+
+@pytest.fixture
+def create_payment() -> Callable[[AioQuiqy], Awaitable[str]]:
+    async def create(client: AioQuiqy) -> str:
+        payment = await client.create_payment(
+            CreatePaymentRequest(
+                amount_fiat=10.0,
+                callback_url="http://127.0.0.1:1/callback",
+                client_order_id="order-1",
+                fiat_currency_id=1,
+            )
+        )
+        return payment.id
+
+    return create
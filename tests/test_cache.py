@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from aioquiqy import PaymentCache
+from aioquiqy.const import PaymentStatus
+from aioquiqy.models.payment import CallbackRequest
+
+
+def pause_responses(client):
+    """Hold the next response received until `release` is set."""
+    received = asyncio.Event()
+    release = asyncio.Event()
+    request_model = client._request_model
+
+    async def paused(*args, **kwargs):
+        client._request_model = request_model
+        response = await request_model(*args, **kwargs)
+        received.set()
+        await release.wait()
+        return response
+
+    client._request_model = paused
+    return received, release
+
+
+@pytest.mark.asyncio
+async def test_response_older_than_callback_is_not_cached(
+    server, make_client, create_payment
+):
+    client = make_client(payment_cache=PaymentCache())
+    payment_id = await create_payment(client)
+    received, release = pause_responses(client)
+
+    fetch = asyncio.ensure_future(client.get_payment(payment_id))
+    await received.wait()
+    stale = server.payments[payment_id]["status"]
+    server.payments[payment_id]["status"] = PaymentStatus.PENDING
+    payment = (await client.get_payment(payment_id, use_cache=False)).payment
+    await client.dispatch_callback(CallbackRequest.from_payment(payment))
+    release.set()
+
+    assert (await fetch).payment.status == stale == PaymentStatus.DETAILING
+    assert client.payment_cache.get(payment_id) is None
+    cached = await client.get_payment(payment_id)
+    assert cached.payment.status == PaymentStatus.PENDING
+    assert client.payment_cache.get(payment_id) is cached
@@ -0,0 +1,112 @@
+import asyncio
+import dataclasses
+import time
+
+import pytest
+
+from aioquiqy import HedgePolicy, RetryPolicy, request_deadline
+from aioquiqy.exceptions import DeadlineExceededError, QuiqyAPIError
+
+
+def set_config(server, **changes):
+    server.config = dataclasses.replace(server.config, **changes)
+
+
+def track_attempts(client):
+    """Record tasks running request attempts of the client."""
+    tasks = []
+    request_attempts = client._request_attempts
+
+    async def attempts(*args, **kwargs):
+        tasks.append(asyncio.current_task())
+        return await request_attempts(*args, **kwargs)
+
+    client._request_attempts = attempts
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_deadline_covers_retries(server, make_client):
+    retry = RetryPolicy(
+        max_attempts=100, backoff_base=0.001, jitter=False, respect_retry_after=False
+    )
+    client = make_client(retry=retry, circuit_breaker=None)
+    set_config(server, latency=0.04, throttle_rate=1.0)
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError) as error:
+        await client.get_payment("missing", timeout=0.1)
+    assert time.monotonic() - started < 0.5
+    assert server.requests > 1
+    assert isinstance(error.value, asyncio.TimeoutError)
+
+
+@pytest.mark.asyncio
+async def test_retry_past_deadline_raises_last_error(server, make_client):
+    retry = RetryPolicy(
+        max_attempts=10, backoff_base=1.0, jitter=False, respect_retry_after=False
+    )
+    client = make_client(retry=retry, circuit_breaker=None)
+    set_config(server, throttle_rate=1.0)
+
+    with pytest.raises(QuiqyAPIError(429)):
+        await client.get_payment("missing", timeout=0.5)
+    assert server.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_context_deadline_wins_over_longer_timeout(server, make_client):
+    client = make_client(timeout=10)
+    set_config(server, latency=1.0)
+
+    started = time.monotonic()
+    with request_deadline(0.05), pytest.raises(DeadlineExceededError):
+        await client.get_payment("missing", timeout=5)
+    assert time.monotonic() - started < 0.5
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_and_slow_request_is_cancelled(
+    server, make_client, create_payment
+):
+    client = make_client(hedge=HedgePolicy(delay=0.05))
+    payment_id = await create_payment(client)
+    tasks = track_attempts(client)
+
+    set_config(server, latency=1.0)
+    call = asyncio.ensure_future(client.get_payment(payment_id))
+    while server.requests < 2:  # the slow first request arrived
+        await asyncio.sleep(0.001)
+    set_config(server, latency=0.0)
+
+    started = time.monotonic()
+    payment = await call
+    assert payment.payment.id == payment_id
+    assert time.monotonic() - started < 0.5
+    assert server.requests == 3
+    await asyncio.sleep(0)
+    assert len(tasks) == 2
+    assert tasks[0].cancelled() and not tasks[1].cancelled()
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_both_hedged_requests(server, make_client):
+    client = make_client(hedge=HedgePolicy(delay=0.02))
+    tasks = track_attempts(client)
+    set_config(server, latency=1.0)
+
+    with pytest.raises(DeadlineExceededError):
+        await client.get_payment("missing", timeout=0.1)
+    await asyncio.sleep(0)
+    assert server.requests == 2
+    assert len(tasks) == 2 and all(task.cancelled() for task in tasks)
+
+
+@pytest.mark.asyncio
+async def test_fast_failure_is_not_hedged(server, make_client):
+    client = make_client(hedge=HedgePolicy(delay=0.05))
+
+    with pytest.raises(QuiqyAPIError(404)):
+        await client.get_payment("missing")
+    await asyncio.sleep(0.1)
+    assert server.requests == 1
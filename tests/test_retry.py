@@ -0,0 +1,89 @@
+import asyncio
+import dataclasses
+
+import pytest
+
+from aioquiqy import CircuitBreakerPolicy, RetryPolicy
+from aioquiqy.exceptions import CircuitOpenError, QuiqyAPIError
+from aioquiqy.retry import CircuitBreaker, CircuitState
+
+FAST_RETRY = RetryPolicy(
+    max_attempts=3, backoff_base=0.001, jitter=False, respect_retry_after=False
+)
+
+
+def set_config(server, **changes):
+    server.config = dataclasses.replace(server.config, **changes)
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_at_max_attempts(server, make_client):
+    client = make_client(retry=FAST_RETRY, circuit_breaker=None)
+    set_config(server, throttle_rate=1.0)
+
+    with pytest.raises(QuiqyAPIError(429)):
+        await client.get_payment("missing")
+    assert server.requests == FAST_RETRY.max_attempts
+
+
+@pytest.mark.asyncio
+async def test_unsafe_requests_are_not_retried(server, make_client, create_payment):
+    client = make_client(retry=FAST_RETRY, circuit_breaker=None)
+    set_config(server, throttle_rate=1.0)
+
+    with pytest.raises(QuiqyAPIError(429)):
+        await create_payment(client)
+    assert server.requests == 1
+
+
+def test_retry_delay_is_capped():
+    policy = RetryPolicy(backoff_base=1.0, backoff_max=3.0, jitter=False)
+    assert [policy.get_delay(attempt) for attempt in (1, 2, 3, 4)] == [
+        1.0,
+        2.0,
+        3.0,
+        3.0,
+    ]
+    assert policy.get_delay(1, "7") == 7.0
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_and_half_opens(server, make_client, create_payment):
+    policy = CircuitBreakerPolicy(failure_threshold=2, recovery_timeout=0.05)
+    client = make_client(retry=None, circuit_breaker=policy)
+    payment_id = await create_payment(client)
+    set_config(server, error_rate=1.0)
+
+    for _ in range(policy.failure_threshold):
+        with pytest.raises(QuiqyAPIError(500)):
+            await client.get_payment(payment_id)
+    breaker = client.get_breaker("get")
+    assert breaker.state == CircuitState.OPEN
+
+    requests = server.requests
+    with pytest.raises(CircuitOpenError):
+        await client.get_payment(payment_id)
+    assert server.requests == requests  # failed fast
+
+    # The trial call after recovery_timeout fails, the circuit opens again
+    await asyncio.sleep(policy.recovery_timeout)
+    with pytest.raises(QuiqyAPIError(500)):
+        await client.get_payment(payment_id)
+    assert breaker.state == CircuitState.OPEN
+
+    # A successful trial call closes it
+    await asyncio.sleep(policy.recovery_timeout)
+    set_config(server, error_rate=0.0)
+    await client.get_payment(payment_id)
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_allows_single_trial():
+    breaker = CircuitBreaker("get", CircuitBreakerPolicy(1, recovery_timeout=0.0))
+    breaker.record_failure()
+    breaker.before_call()  # the trial
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.release()
+    breaker.before_call()
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from aioquiqy import AioQuiqy
+from aioquiqy.base import SessionManager
+
+
+def test_sessions_of_closed_loops_are_released():
+    manager = SessionManager()
+
+    async def use() -> object:
+        return manager.get_session()
+
+    sessions = [asyncio.run(use()) for _ in range(3)]
+    assert len(manager) == 1
+    assert all(session.closed for session in sessions[:-1])
+
+    async def close() -> None:
+        await manager.close()
+
+    asyncio.run(close())
+    assert len(manager) == 0
+    assert sessions[-1].closed
+
+
+@pytest.mark.asyncio
+async def test_session_is_reused_within_loop():
+    client = AioQuiqy("test-key")
+    try:
+        assert client.get_session() is client.get_session()
+    finally:
+        await client.close()
+    assert len(client._sessions) == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_sessions_are_closed_by_owner():
+    manager = SessionManager()
+    first = AioQuiqy("key-1", sessions=manager)
+    second = AioQuiqy("key-2", sessions=manager)
+    assert first.get_session() is second.get_session()
+
+    await first.close()
+    assert not second.get_session().closed
+    await manager.close()
+    assert len(manager) == 0
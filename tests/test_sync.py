@@ -0,0 +1,62 @@
+import dataclasses
+import time
+
+import pytest
+
+from aioquiqy import SyncQuiqy
+from aioquiqy.exceptions import DeadlineExceededError
+from aioquiqy.loadtest.server import FakeQuiqyServer, FakeServerConfig
+from aioquiqy.models.payment import CreatePaymentRequest
+from aioquiqy.sync import BackgroundLoop
+
+
+@pytest.fixture
+def background():
+    background = BackgroundLoop(name="aioquiqy-test-loop")
+    yield background
+    background.stop()
+
+
+@pytest.fixture
+def sync_server(background):
+    server = FakeQuiqyServer(FakeServerConfig(latency=0.0, jitter=0.0, seed=1))
+    background.run(server.start())
+    yield server
+    background.run(server.stop())
+
+
+def test_bulk_runs_longer_than_call_timeout(background, sync_server):
+    client = SyncQuiqy(
+        "test-key", network=sync_server.url, timeout=0.3, background=background
+    )
+    client.DEADLINE_GRACE = 0.0
+    sync_server.config = dataclasses.replace(sync_server.config, latency=0.1)
+    payments = [
+        CreatePaymentRequest(
+            amount_fiat=10.0,
+            callback_url="http://127.0.0.1:1/callback",
+            client_order_id=f"order-{index}",
+            fiat_currency_id=1,
+        )
+        for index in range(8)
+    ]
+
+    with client:
+        started = time.monotonic()
+        created = client.create_payments(payments, concurrency=2)
+        assert all(item.ok for item in created)
+        payment_ids = [item.result.id for item in created]
+        fetched = client.get_payments(payment_ids, concurrency=2)
+
+    assert time.monotonic() - started > 0.6  # both runs are over the 0.3s timeout
+    assert [item.result.payment.id for item in fetched] == payment_ids
+
+
+def test_call_timeout_still_applies(background, sync_server):
+    client = SyncQuiqy(
+        "test-key", network=sync_server.url, timeout=0.1, background=background
+    )
+    sync_server.config = dataclasses.replace(sync_server.config, latency=0.5)
+
+    with client, pytest.raises(DeadlineExceededError):
+        client.get_payment("missing")
@@ -0,0 +1,126 @@
+import asyncio
+import dataclasses
+
+import pytest
+
+from aioquiqy import PaymentWatcher, WatchPolicy
+from aioquiqy.const import PaymentStatus
+
+FAST_POLLS = WatchPolicy(
+    intervals={},
+    default_interval=0.02,
+    min_interval=0.01,
+    error_interval=0.02,
+    rate=None,
+)
+
+
+def set_status(server, payment_id, status):
+    server.payments[payment_id]["status"] = status
+
+
+async def wait_until(predicate, timeout=2.0):
+    async def wait():
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+    await asyncio.wait_for(wait(), timeout)
+
+
+def record_statuses(client):
+    statuses = []
+
+    async def handler(callback, app):
+        statuses.append(callback.payment_status)
+
+    client.register_callback_handler(handler)
+    return statuses
+
+
+@pytest.mark.asyncio
+async def test_status_change_dispatched_once(server, make_client, create_payment):
+    client = make_client()
+    statuses = record_statuses(client)
+    payment_id = await create_payment(client)
+    watcher = PaymentWatcher(client, FAST_POLLS)
+
+    watcher.watch(payment_id)
+    watcher.start()
+    try:
+        await wait_until(lambda: statuses)
+        polled = server.requests
+        await wait_until(lambda: server.requests >= polled + 3)
+        assert statuses == [PaymentStatus.DETAILING]
+
+        set_status(server, payment_id, PaymentStatus.PENDING)
+        await wait_until(lambda: len(statuses) == 2)
+        polled = server.requests
+        await wait_until(lambda: server.requests >= polled + 3)
+        assert statuses == [PaymentStatus.DETAILING, PaymentStatus.PENDING]
+    finally:
+        await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_terminal_status_stops_watching(server, make_client, create_payment):
+    client = make_client()
+    statuses = record_statuses(client)
+    payment_id = await create_payment(client)
+    watcher = PaymentWatcher(client, FAST_POLLS)
+
+    watcher.watch(payment_id, status=PaymentStatus.DETAILING)
+    watcher.start()
+    try:
+        set_status(server, payment_id, PaymentStatus.UNDETAILED)
+        await wait_until(lambda: payment_id not in watcher)
+        polled = server.requests
+        await asyncio.sleep(0.1)
+        assert server.requests == polled
+        assert statuses == [PaymentStatus.UNDETAILED]
+    finally:
+        await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_poll_recovers_from_request_errors(server, make_client, create_payment):
+    client = make_client(retry=None, circuit_breaker=None)
+    statuses = record_statuses(client)
+    payment_id = await create_payment(client)
+    watcher = PaymentWatcher(client, FAST_POLLS)
+
+    server.config = dataclasses.replace(server.config, error_rate=1.0)
+    watcher.watch(payment_id)
+    watcher.start()
+    try:
+        await wait_until(lambda: server.injected_errors >= 2)
+        assert statuses == []
+
+        server.config = dataclasses.replace(server.config, error_rate=0.0)
+        await wait_until(lambda: statuses)
+        assert statuses == [PaymentStatus.DETAILING]
+    finally:
+        await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_handler_gets_change_again(server, make_client, create_payment):
+    client = make_client()
+    statuses = []
+
+    @client.callback_handler
+    async def handler(callback, app):
+        statuses.append(callback.payment_status)
+        if len(statuses) == 1:
+            raise RuntimeError("handler failed")
+
+    payment_id = await create_payment(client)
+    watcher = PaymentWatcher(client, FAST_POLLS)
+
+    watcher.watch(payment_id)
+    watcher.start()
+    try:
+        await wait_until(lambda: len(statuses) == 2)
+        assert statuses == [PaymentStatus.DETAILING, PaymentStatus.DETAILING]
+        assert payment_id in watcher
+    finally:
+        await watcher.stop()